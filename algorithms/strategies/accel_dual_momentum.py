@@ -1,6 +1,7 @@
 from AlgorithmImports import *
 from datetime import timedelta
 import numpy as np
+from strategy_utils import SymbolPanel, composite_roc, high_proximity, top_n
 
 
 class AcceleratingDualMomentum(QCAlgorithm):
@@ -64,25 +65,14 @@ class AcceleratingDualMomentum(QCAlgorithm):
         self.spy = self.add_equity("SPY", Resolution.DAILY).symbol
         self.set_benchmark("SPY")
 
-        # Indicators storage
-        self.sma50 = {}
-        self.roc_21 = {}
-        self.roc_63 = {}
-        self.roc_126 = {}
-        self.max_252 = {}  # Rolling 52-week high
-
-        # Initialize indicators for each symbol
-        for ticker, symbol in self.symbols.items():
-            self.sma50[symbol] = self.sma(symbol, 50, Resolution.DAILY)
-            self.roc_21[symbol] = self.roc(symbol, 21, Resolution.DAILY)
-            self.roc_63[symbol] = self.roc(symbol, 63, Resolution.DAILY)
-            self.roc_126[symbol] = self.roc(symbol, 126, Resolution.DAILY)
-            self.max_252[symbol] = self.max(symbol, 252, Resolution.DAILY)
-
-        # SPY indicators for relative strength
-        self.spy_roc_21 = self.roc(self.spy, 21, Resolution.DAILY)
-        self.spy_roc_63 = self.roc(self.spy, 63, Resolution.DAILY)
-        self.spy_roc_126 = self.roc(self.spy, 126, Resolution.DAILY)
+        # Indicators for the whole universe (stocks + SPY), one column per symbol
+        self.stocks = list(self.symbols.values())
+        self.panel = SymbolPanel(self.stocks + [self.spy], window=253)
+        self.spy_slot = self.panel.slot(self.spy)
+        self.is_stock = np.arange(len(self.panel.symbols)) != self.spy_slot
+
+        # Accelerating momentum: average of 1m, 3m, 6m ROC
+        self.roc_weights = {21: 1 / 3, 63: 1 / 3, 126: 1 / 3}
 
         # Position sizing
         self.max_position_pct = 0.05  # 5% max per position
@@ -107,150 +97,55 @@ class AcceleratingDualMomentum(QCAlgorithm):
         security.set_slippage_model(ConstantSlippageModel(0.001))  # 0.1% slippage
         security.set_fee_model(InteractiveBrokersFeeModel())
 
-    def calculate_accel_momentum(self, symbol):
-        """
-        Calculate accelerating momentum as average of 1m, 3m, 6m ROC.
-        Returns None if indicators not ready.
-        """
-        if symbol not in self.roc_21:
-            return None
-
-        roc21 = self.roc_21[symbol]
-        roc63 = self.roc_63[symbol]
-        roc126 = self.roc_126[symbol]
-
-        if not (roc21.is_ready and roc63.is_ready and roc126.is_ready):
-            return None
-
-        # Average the three ROC values
-        return (roc21.current.value + roc63.current.value + roc126.current.value) / 3
-
-    def calculate_spy_accel_momentum(self):
-        """Calculate SPY's accelerating momentum for relative strength comparison"""
-        if not (self.spy_roc_21.is_ready and self.spy_roc_63.is_ready and self.spy_roc_126.is_ready):
-            return None
-
-        return (self.spy_roc_21.current.value + self.spy_roc_63.current.value + self.spy_roc_126.current.value) / 3
-
-    def calculate_52wh_proximity(self, symbol):
+    def screen(self):
         """
-        Calculate how close price is to 52-week high.
-        Returns ratio (0 to 1), where 1 = at high, 0.75 = within 25% of high.
-        """
-        if symbol not in self.max_252:
-            return None
-
-        max_ind = self.max_252[symbol]
-        if not max_ind.is_ready:
-            return None
-
-        current_price = self.securities[symbol].price
-        high_252 = max_ind.current.value
+        Accelerating momentum of every symbol, with entry and exit masks.
 
-        if high_252 <= 0:
-            return None
-
-        return current_price / high_252
-
-    def check_entry_conditions(self, symbol):
-        """
-        Check all entry conditions for a symbol.
-        Returns True if all conditions met.
+        Entry (ALL): momentum > 0, momentum > SPY's, price > 50 SMA,
+        within 25% of the 52-week high.
+        Exit (ANY): momentum unavailable or < 0, momentum < SPY's,
+        price < 50 SMA.
         """
-        # Get accelerating momentum
-        accel_mom = self.calculate_accel_momentum(symbol)
-        if accel_mom is None:
-            return False
-
-        # Condition 1: Accelerating momentum > 0
-        if accel_mom <= 0:
-            return False
-
-        # Condition 2: Relative strength - beat SPY
-        spy_accel_mom = self.calculate_spy_accel_momentum()
-        if spy_accel_mom is None:
-            return False
-        if accel_mom <= spy_accel_mom:
-            return False
-
-        # Condition 3: Price above 50 SMA
-        sma = self.sma50.get(symbol)
-        if sma is None or not sma.is_ready:
-            return False
-        if self.securities[symbol].price <= sma.current.value:
-            return False
-
-        # Condition 4: Within 25% of 52-week high
-        proximity = self.calculate_52wh_proximity(symbol)
-        if proximity is None:
-            return False
-        if proximity < 0.75:  # More than 25% below high
-            return False
-
-        return True
-
-    def check_exit_conditions(self, symbol):
-        """
-        Check exit conditions for a symbol.
-        Returns True if ANY exit condition is met.
-        """
-        # Get accelerating momentum
-        accel_mom = self.calculate_accel_momentum(symbol)
-        if accel_mom is None:
-            return True  # Exit if can't calculate
-
-        # Exit 1: Accelerating momentum < 0
-        if accel_mom < 0:
-            return True
-
-        # Exit 2: Relative strength - underperforming SPY
-        spy_accel_mom = self.calculate_spy_accel_momentum()
-        if spy_accel_mom is not None and accel_mom < spy_accel_mom:
-            return True
-
-        # Exit 3: Price below 50 SMA
-        sma = self.sma50.get(symbol)
-        if sma is not None and sma.is_ready:
-            if self.securities[symbol].price < sma.current.value:
-                return True
-
-        return False
+        accel_mom = composite_roc(self.panel, self.roc_weights)
+        spy_accel_mom = accel_mom[self.spy_slot]
+        prices = np.array([self.securities[symbol].price for symbol in self.panel.symbols])
+        sma50 = self.panel.sma(50)
+
+        entries = (
+            self.is_stock &
+            (accel_mom > 0) &
+            (accel_mom > spy_accel_mom) &
+            (prices > sma50) &
+            (high_proximity(self.panel) >= 0.75)
+        )
+        exits = (
+            np.isnan(accel_mom) |
+            (accel_mom < 0) |
+            (accel_mom < spy_accel_mom) |
+            (prices < sma50)
+        )
+        return accel_mom, entries, exits
 
     def rebalance(self):
         """Weekly rebalancing logic"""
         if self.is_warming_up:
             return
 
+        accel_mom, entries, exit_signals = self.screen()
+
         # Get current holdings
-        current_holdings = set()
-        for symbol in self.symbols.values():
-            if self.portfolio[symbol].invested:
-                current_holdings.add(symbol)
+        held = np.array([self.portfolio[symbol].invested for symbol in self.panel.symbols])
+        current_holdings = {self.panel.symbols[i] for i in np.flatnonzero(held)}
 
         # Check for exits
-        exits = set()
-        for symbol in current_holdings:
-            if self.check_exit_conditions(symbol):
-                exits.add(symbol)
-
-        # Check for entries
-        entry_candidates = []
-        for ticker, symbol in self.symbols.items():
-            if symbol not in current_holdings and self.check_entry_conditions(symbol):
-                # Score by accelerating momentum for ranking
-                accel_mom = self.calculate_accel_momentum(symbol)
-                if accel_mom is not None:
-                    entry_candidates.append((symbol, accel_mom))
-
-        # Sort by momentum (highest first)
-        entry_candidates.sort(key=lambda x: x[1], reverse=True)
+        exits = {self.panel.symbols[i] for i in np.flatnonzero(held & exit_signals)}
 
         # Calculate target positions
         remaining_holdings = current_holdings - exits
-        available_slots = self.max_positions - len(remaining_holdings)
+        available_slots = max(0, self.max_positions - len(remaining_holdings))
 
-        # Select top candidates up to available slots
-        new_entries = [s for s, _ in entry_candidates[:available_slots]]
+        # Select top candidates (highest momentum first) up to available slots
+        new_entries = [self.panel.symbols[i] for i in top_n(accel_mom, available_slots, entries & ~held)]
 
         # Execute exits
         for symbol in exits:
@@ -282,5 +177,5 @@ class AcceleratingDualMomentum(QCAlgorithm):
         self.last_rebalance = self.time
 
     def on_data(self, data):
-        """Required method - rebalancing happens on schedule"""
-        pass
+        """Rebalancing happens on schedule; keep the indicator panel current"""
+        self.panel.update(data)
@@ -0,0 +1,115 @@
+"""
+Streaming BX Trender
+
+Shared by the bx_*.py strategies. Push it next to the strategy's main.py:
+
+    ./scripts/qc-api.sh push <projectId> algorithms/strategies/bx_indicator.py bx_indicator.py
+
+BX = RSI(EMA(close, l1) - EMA(close, l2), l3) - 50, updated once per bar:
+the EMAs, the last l3 changes of their difference and the running gain /
+loss sums are kept between bars, so each update is O(1) however long the
+history is.
+"""
+
+from collections import deque
+
+
+class StreamingEMA:
+    """EMA seeded with the SMA of the first `period` values (same as LEAN's EMA)"""
+
+    def __init__(self, period):
+        self.period = period
+        self.multiplier = 2 / (period + 1)
+        self.samples = 0
+        self.value = 0.0
+
+    @property
+    def is_ready(self):
+        return self.samples >= self.period
+
+    def update(self, value):
+        self.samples += 1
+        if self.samples <= self.period:
+            # Running mean until the seed SMA is complete
+            self.value += (value - self.value) / self.samples
+        else:
+            self.value += (value - self.value) * self.multiplier
+        return self.value
+
+
+class BXTrender:
+    """
+    Incremental BX Trender for one symbol on one timeframe.
+
+    Usage:
+        self.bx = BXTrender(5, 20, 15)
+        ...
+        self.bx.update(bar.close)
+        if self.bx.is_ready and self.bx.value >= 0:
+            ...
+
+    The RSI uses simple averages of the last l3 changes, as the inline
+    calc_rsi helpers it replaces did.
+    """
+
+    def __init__(self, l1=5, l2=20, l3=15):
+        self.l3 = l3
+        self.ema_fast = StreamingEMA(l1)
+        self.ema_slow = StreamingEMA(l2)
+        self.changes = deque()
+        self.gain_sum = 0.0
+        self.loss_sum = 0.0
+        self.prev_diff = None
+        self.value = None
+        self.previous = None  # value before the last update
+
+    @property
+    def is_ready(self):
+        return self.value is not None
+
+    @property
+    def warm_up_period(self):
+        """Bars needed before the first value"""
+        return max(self.ema_fast.period, self.ema_slow.period) + self.l3
+
+    def update(self, close):
+        """Add one bar's close; returns the new BX value (None until ready)"""
+        self.ema_fast.update(close)
+        self.ema_slow.update(close)
+        if not (self.ema_fast.is_ready and self.ema_slow.is_ready):
+            return None
+
+        diff = self.ema_fast.value - self.ema_slow.value
+        if self.prev_diff is not None:
+            change = diff - self.prev_diff
+            self.changes.append(change)
+            self._add(change, 1)
+            if len(self.changes) > self.l3:
+                self._add(self.changes.popleft(), -1)
+        self.prev_diff = diff
+
+        if len(self.changes) < self.l3:
+            return None
+
+        self.previous = self.value
+        self.value = self.rsi() - 50
+        return self.value
+
+    def _add(self, change, sign):
+        if change > 0:
+            self.gain_sum = max(0.0, self.gain_sum + sign * change)
+        elif change < 0:
+            self.loss_sum = max(0.0, self.loss_sum - sign * change)
+
+    def rsi(self):
+        if self.loss_sum <= 0:
+            return 100
+        return 100 - (100 / (1 + self.gain_sum / self.loss_sum))
+
+    @property
+    def turned_bullish(self):
+        return self.previous is not None and self.previous < 0 and self.value >= 0
+
+    @property
+    def turned_bearish(self):
+        return self.previous is not None and self.previous >= 0 and self.value < 0
@@ -1,4 +1,6 @@
 from AlgorithmImports import *
+import numpy as np
+from strategy_utils import SymbolPanel, top_n
 
 class ConcentratedMomentumTop5(QCAlgorithm):
     """
@@ -47,19 +49,13 @@ class ConcentratedMomentumTop5(QCAlgorithm):
         self.spy = self.add_equity("SPY", Resolution.DAILY).symbol
         self.set_benchmark("SPY")
 
-        # === DATA STRUCTURES ===
-        self.price_windows = {}
-        window_size = self.lookback + 10
-
-        for ticker in self.universe_tickers:
-            self.price_windows[ticker] = RollingWindow[float](window_size)
-
-        self.spy_prices = RollingWindow[float](window_size)
-
-        # === INDICATORS ===
-        self.sma_indicators = {}
-        for ticker, symbol in self.symbols.items():
-            self.sma_indicators[ticker] = self.sma(symbol, self.sma_period, Resolution.DAILY)
+        # === PRICE PANEL (stocks + SPY, one column per symbol) ===
+        self.panel = SymbolPanel(
+            [self.symbols[t] for t in self.universe_tickers] + [self.spy],
+            window=self.lookback + 1
+        )
+        self.spy_slot = self.panel.slot(self.spy)
+        self.is_stock = np.arange(len(self.panel.symbols)) != self.spy_slot
 
         # === WARMUP ===
         self.set_warm_up(self.lookback + 20)
@@ -72,69 +68,30 @@ class ConcentratedMomentumTop5(QCAlgorithm):
         )
 
     def on_data(self, data):
-        if self.is_warming_up:
-            return
-
-        for ticker, symbol in self.symbols.items():
-            if data.bars.contains_key(symbol):
-                self.price_windows[ticker].add(data.bars[symbol].close)
-
-        if data.bars.contains_key(self.spy):
-            self.spy_prices.add(data.bars[self.spy].close)
+        self.panel.update(data)
 
-    def calculate_return(self, window):
-        if not window.is_ready or window.count < self.lookback + 1:
-            return None
-        current = window[0]
-        past = window[self.lookback]
-        if past == 0:
-            return None
-        return (current - past) / past
-
-    def get_signal_score(self, ticker):
-        window = self.price_windows.get(ticker)
-        sma = self.sma_indicators.get(ticker)
-
-        if window is None or not window.is_ready:
-            return False, 0
-
-        if sma is None or not sma.is_ready:
-            return False, 0
-
-        current_price = window[0]
-        stock_return = self.calculate_return(window)
-        spy_return = self.calculate_return(self.spy_prices)
-
-        if stock_return is None or spy_return is None:
-            return False, 0
+    def get_signal_scores(self):
+        """6-month return of every symbol, and which ones pass the signal"""
+        returns = self.panel.roc(self.lookback)
+        spy_return = returns[self.spy_slot]
 
         # Must beat SPY and be above SMA
-        if stock_return <= spy_return:
-            return False, 0
-        if current_price <= sma.current.value:
-            return False, 0
-
-        return True, stock_return
+        passes = self.is_stock & (returns > spy_return) & (self.panel.last() > self.panel.sma(self.sma_period))
+        return returns, passes
 
     def rebalance(self):
         if self.is_warming_up:
             return
 
-        # Collect signals
-        signals = []
-        for ticker in self.universe_tickers:
-            passes, score = self.get_signal_score(ticker)
-            if passes:
-                signals.append({'ticker': ticker, 'symbol': self.symbols[ticker], 'score': score})
-
-        # Sort by momentum (highest first)
-        signals.sort(key=lambda x: x['score'], reverse=True)
-
-        # Take top N
-        top_signals = signals[:self.num_positions]
+        # Collect signals, take top N by momentum (highest first)
+        returns, passes = self.get_signal_scores()
+        top_signals = [
+            {'ticker': self.universe_tickers[i], 'symbol': self.panel.symbols[i], 'score': returns[i]}
+            for i in top_n(returns, self.num_positions, passes)
+        ]
 
         self.debug(f"=== REBALANCE {self.time.strftime('%Y-%m-%d')} ===")
-        self.debug(f"Signals: {len(signals)}, Taking top {len(top_signals)}")
+        self.debug(f"Signals: {int(passes.sum())}, Taking top {len(top_signals)}")
         for s in top_signals:
             self.debug(f"  {s['ticker']}: {s['score']*100:.1f}%")
 
@@ -1,4 +1,6 @@
 from AlgorithmImports import *
+import numpy as np
+from strategy_utils import SymbolPanel, target_weights, holdings_weights, portfolio_targets
 
 class RiskParityMomentum(QCAlgorithm):
     """
@@ -64,22 +66,13 @@ class RiskParityMomentum(QCAlgorithm):
 
         # Market regime filter
         self.spy = self.add_equity("SPY", Resolution.DAILY).symbol
-        self.spy_sma200 = self.sma(self.spy, 200, Resolution.DAILY)
 
-        # Momentum indicators
-        self.momentum_ind = {}
-        for ticker, symbol in self.symbols.items():
-            self.momentum_ind[ticker] = self.momp(symbol, 126, Resolution.DAILY)
-
-        # Volatility indicators (20-day standard deviation of returns)
-        self.std_ind = {}
-        for ticker, symbol in self.symbols.items():
-            self.std_ind[ticker] = self.std(symbol, 20, Resolution.DAILY)
-
-        # Trend filter
-        self.sma50_ind = {}
-        for ticker, symbol in self.symbols.items():
-            self.sma50_ind[ticker] = self.sma(symbol, 50, Resolution.DAILY)
+        # Momentum (126d), volatility (20d standard deviation), trend (50 SMA)
+        # and SPY's 200 SMA, one column per symbol
+        self.stocks = list(self.symbols.values())
+        self.panel = SymbolPanel(self.stocks + [self.spy], window=201)
+        self.spy_slot = self.panel.slot(self.spy)
+        self.is_stock = np.arange(len(self.panel.symbols)) != self.spy_slot
 
         # 15 positions for diversification
         self.top_n = 15
@@ -98,77 +91,46 @@ class RiskParityMomentum(QCAlgorithm):
         if self.is_warming_up:
             return
 
-        if not self.spy_sma200.is_ready:
+        spy_sma200 = self.panel.sma(200)[self.spy_slot]
+        if np.isnan(spy_sma200):
             return
 
         # Regime filter
         spy_price = self.securities[self.spy].price
-        bull_market = spy_price > self.spy_sma200.current.value
+        bull_market = spy_price > spy_sma200
 
         if not bull_market:
             self.liquidate()
             self.debug(f"{self.time.date()}: BEAR MARKET - Going to cash")
             return
 
-        # Select candidates with momentum and volatility
-        candidates = []
-        for ticker, symbol in self.symbols.items():
-            if ticker not in self.momentum_ind or ticker not in self.sma50_ind:
-                continue
-            if not self.momentum_ind[ticker].is_ready or not self.sma50_ind[ticker].is_ready:
-                continue
-            if not self.std_ind[ticker].is_ready:
-                continue
-
-            price = self.securities[symbol].price
-            sma50 = self.sma50_ind[ticker].current.value
-            momentum = self.momentum_ind[ticker].current.value
-            volatility = self.std_ind[ticker].current.value
-
-            # Filter: positive momentum and uptrend
-            if momentum > 0 and price > sma50 and volatility > 0:
-                # Annualize volatility (daily std * sqrt(252))
-                annual_vol = volatility * (252 ** 0.5) / price * 100  # as percentage
-
-                candidates.append({
-                    'ticker': ticker,
-                    'symbol': symbol,
-                    'momentum': momentum,
-                    'volatility': max(annual_vol, 10)  # Floor at 10% to avoid extreme weights
-                })
-
-        if len(candidates) < 5:
-            self.liquidate()
-            return
+        prices = np.array([self.securities[symbol].price for symbol in self.panel.symbols])
+        momentum = self.panel.roc(126) * 100
+        volatility = self.panel.std(20)
 
-        # Sort by momentum, take top N
-        sorted_candidates = sorted(candidates, key=lambda x: x['momentum'], reverse=True)
-        top_stocks = sorted_candidates[:min(self.top_n, len(sorted_candidates))]
+        # Filter: positive momentum and uptrend
+        candidates = self.is_stock & (momentum > 0) & (prices > self.panel.sma(50)) & (volatility > 0)
 
-        # Calculate inverse volatility weights
-        inverse_vols = [1 / s['volatility'] for s in top_stocks]
-        total_inverse_vol = sum(inverse_vols)
+        if candidates.sum() < 5:
+            self.liquidate()
+            return
 
-        # Normalize weights
-        weights = {}
-        for i, stock in enumerate(top_stocks):
-            raw_weight = inverse_vols[i] / total_inverse_vol
-            weights[stock['ticker']] = raw_weight * 0.95  # Scale to 95% invested
+        # Annualize volatility (daily std * sqrt(252)) as a percentage,
+        # floored at 10% to avoid extreme weights
+        with np.errstate(divide="ignore", invalid="ignore"):
+            annual_vol = np.maximum(volatility * (252 ** 0.5) / prices * 100, 10)
 
-        # Liquidate positions not in top stocks
-        for ticker, symbol in self.symbols.items():
-            if ticker not in weights and self.portfolio[symbol].invested:
-                self.liquidate(symbol)
+        # Top N by momentum, inverse volatility weights scaled to 95% invested
+        weights = target_weights(momentum, self.top_n, candidates, sizing=1 / annual_vol, exposure=0.95)
 
-        # Apply risk parity weights
-        for stock in top_stocks:
-            weight = weights[stock['ticker']]
-            self.set_holdings(stock['symbol'], weight)
+        # One batch: exits of positions not in the top stocks and the new weights
+        self.set_holdings(portfolio_targets(
+            self.panel.symbols, weights, holdings_weights(self, self.panel.symbols)
+        ))
 
         # Log weight distribution
-        max_weight = max(weights.values())
-        min_weight = min(weights.values())
-        self.debug(f"{self.time.date()}: {len(top_stocks)} positions, Weights: {min_weight:.1%} to {max_weight:.1%}")
+        held = weights[weights > 0]
+        self.debug(f"{self.time.date()}: {len(held)} positions, Weights: {held.min():.1%} to {held.max():.1%}")
 
     def on_data(self, data):
-        pass
+        self.panel.update(data)
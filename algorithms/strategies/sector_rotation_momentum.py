@@ -1,4 +1,6 @@
 from AlgorithmImports import *
+import numpy as np
+from strategy_utils import top_n, target_weights, holdings_weights, portfolio_targets
 
 class SectorRotationMomentum(QCAlgorithm):
     """
@@ -53,6 +55,10 @@ class SectorRotationMomentum(QCAlgorithm):
         for ticker, symbol in self.sector_symbols.items():
             self.momentum_ind[ticker] = self.momp(symbol, 63, Resolution.DAILY)
 
+        # Slot order for weight arrays: sectors, then TLT
+        self.tickers = list(self.sector_symbols)
+        self.universe_symbols = [self.sector_symbols[t] for t in self.tickers] + [self.tlt]
+
         # Number of sectors to hold
         self.top_n = 3
 
@@ -80,54 +86,45 @@ class SectorRotationMomentum(QCAlgorithm):
         spy_price = self.securities[self.spy].price
         bull_market = spy_price > self.spy_sma200.current.value
 
+        weights = np.zeros(len(self.universe_symbols))
         if not bull_market:
-            # Bear market - rotate to bonds
-            self.liquidate_sectors()
-            if not self.portfolio[self.tlt].invested:
-                self.set_holdings(self.tlt, 0.95)
+            # Bear market - rotate to bonds (sectors exit; a held TLT
+            # position is left as it is)
+            weights[-1] = 0.95
+            rotating = not self.portfolio[self.tlt].invested
+            self.set_holdings(portfolio_targets(
+                self.universe_symbols, weights, holdings_weights(self, self.universe_symbols), tolerance=1.0
+            ))
+            if rotating:
                 self.debug(f"{self.time.date()}: Bear market - rotating to TLT")
+            self.current_sectors = []
             return
 
-        # Bull market - liquidate TLT if held
-        if self.portfolio[self.tlt].invested:
-            self.liquidate(self.tlt)
-
-        # Calculate momentum for all sectors
-        momentum_scores = {}
-        for ticker, symbol in self.sector_symbols.items():
-            if self.momentum_ind[ticker].is_ready:
-                momentum_scores[ticker] = self.momentum_ind[ticker].current.value
+        # Momentum of all sectors (NaN until ready)
+        momentum_scores = np.array([
+            self.momentum_ind[ticker].current.value if self.momentum_ind[ticker].is_ready else np.nan
+            for ticker in self.tickers
+        ] + [np.nan])
 
-        if len(momentum_scores) < self.top_n:
+        if np.count_nonzero(~np.isnan(momentum_scores)) < self.top_n:
             return
 
-        # Rank by momentum and select top N
-        sorted_sectors = sorted(momentum_scores.items(), key=lambda x: x[1], reverse=True)
-        top_sectors = [ticker for ticker, _ in sorted_sectors[:self.top_n]]
+        # Top N sectors, equal weight; TLT (and dropped sectors) go to 0
+        weights = target_weights(momentum_scores, self.top_n, exposure=0.95)
+        top = top_n(momentum_scores, self.top_n)
+        top_sectors = [self.tickers[i] for i in top]
 
         # Log selection
         self.debug(f"{self.time.date()}: Top sectors: {top_sectors}")
-        for ticker, score in sorted_sectors[:self.top_n]:
-            self.debug(f"  {ticker}: {score:.2f}%")
-
-        # Liquidate sectors no longer in top N
-        for ticker in self.current_sectors:
-            if ticker not in top_sectors:
-                self.liquidate(self.sector_symbols[ticker])
+        for i in top:
+            self.debug(f"  {self.tickers[i]}: {momentum_scores[i]:.2f}%")
 
-        # Equal weight across top sectors
-        weight = 0.95 / self.top_n
-        for ticker in top_sectors:
-            self.set_holdings(self.sector_symbols[ticker], weight)
+        # Exits, TLT and the new sector weights in one batch
+        self.set_holdings(portfolio_targets(
+            self.universe_symbols, weights, holdings_weights(self, self.universe_symbols)
+        ))
 
         self.current_sectors = top_sectors
 
-    def liquidate_sectors(self):
-        """Liquidate all sector positions"""
-        for ticker, symbol in self.sector_symbols.items():
-            if self.portfolio[symbol].invested:
-                self.liquidate(symbol)
-        self.current_sectors = []
-
     def on_data(self, data):
         pass
@@ -0,0 +1,267 @@
+"""
+Vectorized Strategy Utilities
+
+Shared by the hand-written momentum strategies. Push it next to the
+strategy's main.py:
+
+    ./scripts/qc-api.sh push <projectId> algorithms/strategies/strategy_utils.py strategy_utils.py
+
+SymbolPanel keeps the last `window` daily bars of every symbol in NumPy
+arrays, one column (slot) per symbol. Each slot advances only on its own
+bars, so lookbacks count the symbol's bars like a LEAN indicator.
+Indicators (ROC, SMA, STD, rolling max, ATR) are computed for the whole
+universe in one array operation at rebalance time, instead of one LEAN
+indicator object per symbol read through dict lookups, so a rebalance
+over hundreds of symbols is a few vector operations.
+
+Values are NaN for slots without enough history, and NaN compares False,
+so unready symbols drop out of every filter.
+
+target_weights turns the scores into portfolio weights (top-N, equal or
+inverse-volatility sizing, exposure and cap) in the same array pass, and
+portfolio_targets turns those into one List[PortfolioTarget] for a single
+set_holdings call, which LEAN nets and orders sells-first.
+"""
+
+import numpy as np
+
+
+class SymbolPanel:
+    """
+    Rolling daily close/high/low for a fixed list of symbols.
+
+    Usage:
+        self.panel = SymbolPanel(symbols, window=253)
+        ...
+        def on_data(self, data):
+            self.panel.update(data)      # also during warm-up
+        ...
+        score = self.panel.roc(21)       # one value per slot
+    """
+
+    def __init__(self, symbols, window):
+        """
+        Args:
+            symbols: Symbols, in slot order
+            window: Bars kept (longest lookback + 1)
+        """
+        self.symbols = list(symbols)
+        self.slots = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.window = window
+        shape = (window, len(self.symbols))
+        self.close = np.full(shape, np.nan)
+        self.high = np.full(shape, np.nan)
+        self.low = np.full(shape, np.nan)
+        self.counts = np.zeros(len(self.symbols), dtype=int)  # bars seen per slot
+        self.pos = np.zeros(len(self.symbols), dtype=int)  # row of the next bar, per slot
+        self._columns = np.arange(len(self.symbols))
+
+    def slot(self, symbol):
+        return self.slots[symbol]
+
+    def add(self, close, high=None, low=None):
+        """
+        Append one day of bars (arrays in slot order, NaN = no bar).
+
+        Slots without a bar are left alone, as a LEAN indicator would
+        simply not update.
+        """
+        close = np.asarray(close, dtype=float)
+        present = np.flatnonzero(~np.isnan(close))
+        rows = self.pos[present]
+        for buf, values in ((self.close, close), (self.high, high), (self.low, low)):
+            values = close if values is None else np.asarray(values, dtype=float)
+            buf[rows, present] = values[present]
+        self.counts[present] += 1
+        self.pos[present] = (rows + 1) % self.window
+
+    def update(self, data):
+        """Append the TradeBars of a Slice"""
+        bars = data.bars
+        close = np.full(len(self.symbols), np.nan)
+        high = np.full(len(self.symbols), np.nan)
+        low = np.full(len(self.symbols), np.nan)
+        for i, symbol in enumerate(self.symbols):
+            if bars.contains_key(symbol):
+                bar = bars[symbol]
+                close[i], high[i], low[i] = bar.close, bar.high, bar.low
+        if not np.isnan(close).all():
+            self.add(close, high, low)
+
+    def seed(self, history):
+        """
+        Fill from a multi-symbol history DataFrame (self.history(symbols, n,
+        Resolution.DAILY)), so the panel is ready without a warm-up.
+        """
+        if history is None or history.empty:
+            return
+        columns = {}
+        for field in ("close", "high", "low"):
+            frame = history[field].unstack(level=0)
+            columns[field] = frame.reindex(columns=self.symbols).to_numpy(dtype=float)
+        for row in range(len(columns["close"])):
+            self.add(columns["close"][row], columns["high"][row], columns["low"][row])
+
+    # -------------------------------------------------------------------------
+    # Vectorized indicators (one value per slot)
+    # -------------------------------------------------------------------------
+
+    def is_ready(self, period):
+        """Slots with at least `period` bars"""
+        return self.counts >= period
+
+    def lag(self, k, field="close"):
+        """Values k bars ago (0 = latest)"""
+        buf = getattr(self, field)
+        values = buf[(self.pos - 1 - k) % self.window, self._columns]
+        return np.where(self.counts > k, values, np.nan)
+
+    def last(self, field="close"):
+        return self.lag(0, field)
+
+    def recent(self, period, field="close"):
+        """Last `period` bars of each slot, oldest first (shape: period x slots)"""
+        rows = (self.pos - period + np.arange(period)[:, None]) % self.window
+        return getattr(self, field)[rows, self._columns]
+
+    def roc(self, period):
+        """Rate of change over `period` bars, as a fraction (LEAN ROC)"""
+        past = self.lag(period)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(past > 0, self.last() / past - 1, np.nan)
+
+    def sma(self, period):
+        values = self.recent(period).mean(axis=0)
+        return np.where(self.is_ready(period), values, np.nan)
+
+    def std(self, period):
+        """Population standard deviation of closes (LEAN STD)"""
+        values = self.recent(period).std(axis=0)
+        return np.where(self.is_ready(period), values, np.nan)
+
+    def max(self, period, field="close"):
+        values = self.recent(period, field).max(axis=0)
+        return np.where(self.is_ready(period), values, np.nan)
+
+    def atr(self, period):
+        """Average true range over `period` bars (simple average, as MovingAverageType.SIMPLE)"""
+        rows = self.recent(period + 1)
+        highs = self.recent(period + 1, "high")[1:]
+        lows = self.recent(period + 1, "low")[1:]
+        prev_close = rows[:-1]
+        true_range = np.maximum(highs - lows, np.maximum(abs(highs - prev_close), abs(lows - prev_close)))
+        return np.where(self.is_ready(period + 1), true_range.mean(axis=0), np.nan)
+
+
+# =============================================================================
+# Scores, filters and ranks over the whole universe
+# =============================================================================
+
+def composite_roc(panel, weights):
+    """
+    Weighted sum of ROCs, e.g. {21: 0.5, 63: 0.3, 126: 0.2}; NaN until the
+    longest ROC is ready.
+    """
+    score = np.zeros(len(panel.symbols))
+    for period, weight in weights.items():
+        score = score + weight * panel.roc(period)
+    return score
+
+
+def high_proximity(panel, period=252, field="high"):
+    """
+    Close / highest `field` over `period` bars (1 = at the high). Defaults
+    to bar highs, as LEAN's MAX on a TradeBar subscription.
+    """
+    high = panel.max(period, field)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(high > 0, panel.last() / high, np.nan)
+
+
+def top_n(scores, n, mask=None):
+    """
+    Slots of the n highest scores among `mask`, best first.
+
+    NaN scores are never selected.
+    """
+    eligible = ~np.isnan(scores)
+    if mask is not None:
+        eligible &= mask
+    candidates = np.flatnonzero(eligible)
+    if len(candidates) > n:
+        candidates = candidates[np.argpartition(-scores[candidates], n - 1)[:n]]
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+def target_weights(scores, n, mask=None, sizing=None, exposure=1.0, position_size=None, cap=None):
+    """
+    Weights for every slot (0 = no position): the top n scores among
+    `mask`, sized equally or in proportion to `sizing` (e.g. 1 / volatility
+    for inverse-volatility weights).
+
+    The weights sum to `exposure`, or average `position_size` when given,
+    so total exposure grows with the number of picks. Scale either by a
+    regime multiplier before calling. `cap` limits each weight afterwards.
+    """
+    weights = np.zeros(len(scores))
+    picks = top_n(scores, n, mask)
+    if len(picks) == 0:
+        return weights
+
+    relative = np.ones(len(picks)) if sizing is None else np.asarray(sizing, dtype=float)[picks]
+    relative = relative / relative.sum()
+    if position_size is not None:
+        weights[picks] = relative * position_size * len(picks)
+    else:
+        weights[picks] = relative * exposure
+    if cap is not None:
+        np.minimum(weights, cap, out=weights)
+    return weights
+
+
+def holdings_weights(algorithm, symbols):
+    """Current portfolio weight of each symbol (signed)"""
+    total = algorithm.portfolio.total_portfolio_value
+    if total <= 0:
+        return np.zeros(len(symbols))
+    return np.array([algorithm.portfolio[symbol].holdings_value for symbol in symbols]) / total
+
+
+def portfolio_targets(symbols, weights, current=None, tolerance=0.0):
+    """
+    PortfolioTargets for algorithm.set_holdings(targets).
+
+    Without `current` weights, every nonzero weight is a target. With
+    them, only changes are: entries, exits (held, weight 0) and holdings
+    more than `tolerance` away from their target, so unchanged holdings
+    place no orders.
+    """
+    from AlgorithmImports import PortfolioTarget
+
+    weights = np.asarray(weights, dtype=float)
+    if current is None:
+        changed = weights != 0
+    else:
+        current = np.asarray(current, dtype=float)
+        held = current != 0
+        changed = (
+            ((weights != 0) & ~held) |
+            ((weights == 0) & held) |
+            ((weights != 0) & held & (np.abs(weights - current) > tolerance))
+        )
+    return [PortfolioTarget(symbols[i], float(weights[i])) for i in np.flatnonzero(changed)]
+
+
+def market_regime(price, sma_fast, sma_slow, momentum, bull_momentum=0.0, bear_momentum=0.0):
+    """
+    BULLISH when price > fast SMA > slow SMA with momentum above
+    `bull_momentum`, BEARISH below the slow SMA or with momentum under
+    `bear_momentum`, otherwise (or when anything is NaN) CAUTIOUS.
+    """
+    if np.isnan([price, sma_fast, sma_slow, momentum]).any():
+        return "CAUTIOUS"
+    if price > sma_fast > sma_slow and momentum > bull_momentum:
+        return "BULLISH"
+    if price < sma_slow or momentum < bear_momentum:
+        return "BEARISH"
+    return "CAUTIOUS"
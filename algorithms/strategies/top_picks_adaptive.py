@@ -1,5 +1,10 @@
 from AlgorithmImports import *
 from datetime import timedelta
+import numpy as np
+from strategy_utils import (
+    SymbolPanel, composite_roc, high_proximity, market_regime,
+    target_weights, holdings_weights, portfolio_targets
+)
 
 
 class TopPicksAdaptive(QCAlgorithm):
@@ -40,28 +45,12 @@ class TopPicksAdaptive(QCAlgorithm):
         self.spy = self.add_equity("SPY", Resolution.DAILY).symbol
         self.set_benchmark("SPY")
 
-        # Indicators
-        self.sma50 = {}
-        self.roc_21 = {}
-        self.roc_63 = {}
-        self.roc_126 = {}
-        self.max_252 = {}
-        self.atr_14 = {}  # For volatility-adjusted sizing
-
-        for ticker, symbol in self.symbols.items():
-            self.sma50[symbol] = self.sma(symbol, 50, Resolution.DAILY)
-            self.roc_21[symbol] = self.roc(symbol, 21, Resolution.DAILY)
-            self.roc_63[symbol] = self.roc(symbol, 63, Resolution.DAILY)
-            self.roc_126[symbol] = self.roc(symbol, 126, Resolution.DAILY)
-            self.max_252[symbol] = self.max(symbol, 252, Resolution.DAILY)
-            self.atr_14[symbol] = self.atr(symbol, 14, MovingAverageType.SIMPLE, Resolution.DAILY)
-
-        # SPY indicators for regime detection
-        self.spy_sma50 = self.sma(self.spy, 50, Resolution.DAILY)
-        self.spy_sma200 = self.sma(self.spy, 200, Resolution.DAILY)
-        self.spy_roc_21 = self.roc(self.spy, 21, Resolution.DAILY)
-        self.spy_roc_63 = self.roc(self.spy, 63, Resolution.DAILY)
-        self.spy_roc_126 = self.roc(self.spy, 126, Resolution.DAILY)
+        # Indicators for the whole universe (stocks + SPY), one column per symbol
+        self.stocks = list(self.symbols.values())
+        self.panel = SymbolPanel(self.stocks + [self.spy], window=253)
+        self.spy_slot = self.panel.slot(self.spy)
+        self.is_stock = np.arange(len(self.panel.symbols)) != self.spy_slot
+        self.roc_weights = {21: 0.5, 63: 0.3, 126: 0.2}
 
         # Position management
         self.base_position_pct = 0.12  # Base 12% per position
@@ -89,36 +78,24 @@ class TopPicksAdaptive(QCAlgorithm):
         security.set_slippage_model(ConstantSlippageModel(0.001))
         security.set_fee_model(InteractiveBrokersFeeModel())
 
-    def get_market_regime(self):
+    def get_market_regime(self, scores):
         """
         Determine market regime:
         - BULLISH: SPY > SMA50 > SMA200, positive momentum
         - CAUTIOUS: Mixed signals
         - BEARISH: SPY < SMA200 or strong negative momentum
         """
-        if not (self.spy_sma50.is_ready and self.spy_sma200.is_ready):
-            return "CAUTIOUS"
-
-        spy_price = self.securities[self.spy].price
-        sma50 = self.spy_sma50.current.value
-        sma200 = self.spy_sma200.current.value
-
-        spy_momentum = self.calculate_spy_score()
-        if spy_momentum is None:
-            return "CAUTIOUS"
-
-        # Strong bull: Price > SMA50 > SMA200 and positive momentum
-        if spy_price > sma50 > sma200 and spy_momentum > 5:
-            return "BULLISH"
-        # Bear: Below SMA200 or very negative momentum
-        elif spy_price < sma200 or spy_momentum < -10:
-            return "BEARISH"
-        else:
-            return "CAUTIOUS"
-
-    def get_regime_multiplier(self):
+        return market_regime(
+            self.securities[self.spy].price,
+            self.panel.sma(50)[self.spy_slot],
+            self.panel.sma(200)[self.spy_slot],
+            scores[self.spy_slot],
+            bull_momentum=5,
+            bear_momentum=-10
+        )
+
+    def get_regime_multiplier(self, regime):
         """Position size multiplier based on regime"""
-        regime = self.get_market_regime()
         if regime == "BULLISH":
             return 1.0
         elif regime == "CAUTIOUS":
@@ -126,109 +103,36 @@ class TopPicksAdaptive(QCAlgorithm):
         else:  # BEARISH
             return 0.4
 
-    def calculate_composite_score(self, symbol):
-        if symbol not in self.roc_21:
-            return None
-
-        roc21 = self.roc_21[symbol]
-        roc63 = self.roc_63[symbol]
-        roc126 = self.roc_126[symbol]
-
-        if not (roc21.is_ready and roc63.is_ready and roc126.is_ready):
-            return None
-
-        return (roc21.current.value * 0.5 +
-                roc63.current.value * 0.3 +
-                roc126.current.value * 0.2)
-
-    def calculate_spy_score(self):
-        if not (self.spy_roc_21.is_ready and self.spy_roc_63.is_ready and self.spy_roc_126.is_ready):
-            return None
-
-        return (self.spy_roc_21.current.value * 0.5 +
-                self.spy_roc_63.current.value * 0.3 +
-                self.spy_roc_126.current.value * 0.2)
-
-    def calculate_52wh_proximity(self, symbol):
-        if symbol not in self.max_252:
-            return None
-
-        max_ind = self.max_252[symbol]
-        if not max_ind.is_ready:
-            return None
-
-        current_price = self.securities[symbol].price
-        high_252 = max_ind.current.value
-
-        if high_252 <= 0:
-            return None
-
-        return current_price / high_252
-
-    def calculate_volatility_factor(self, symbol):
+    def calculate_volatility_factors(self, prices):
         """
         Inverse volatility factor for position sizing.
         Higher volatility = smaller position.
-        """
-        if symbol not in self.atr_14:
-            return 1.0
 
-        atr = self.atr_14[symbol]
-        if not atr.is_ready:
-            return 1.0
-
-        price = self.securities[symbol].price
-        if price <= 0:
-            return 1.0
-
-        # ATR as % of price
-        atr_pct = atr.current.value / price
+        Normalize: target 2% ATR = 1.0, scale inversely
+        <1% ATR = larger position (1.3x)
+        >3% ATR = smaller position (0.5x)
+        """
+        with np.errstate(divide="ignore", invalid="ignore"):
+            atr_pct = self.panel.atr(14) / prices
+        factors = np.select([atr_pct < 0.01, atr_pct < 0.02, atr_pct < 0.03, atr_pct >= 0.03],
+                            [1.3, 1.0, 0.75, 0.5], default=1.0)
+        return np.where(prices > 0, factors, 1.0)
 
-        # Normalize: target 2% ATR = 1.0, scale inversely
-        # <1% ATR = larger position (1.5x)
-        # >3% ATR = smaller position (0.5x)
-        if atr_pct < 0.01:
-            return 1.3
-        elif atr_pct < 0.02:
-            return 1.0
-        elif atr_pct < 0.03:
-            return 0.75
-        else:
-            return 0.5
-
-    def is_qualified(self, symbol):
-        score = self.calculate_composite_score(symbol)
-        if score is None or score <= 0:
-            return False
-
-        spy_score = self.calculate_spy_score()
-        if spy_score is not None and score <= spy_score:
-            return False
-
-        sma = self.sma50.get(symbol)
-        if sma is None or not sma.is_ready:
-            return False
-        if self.securities[symbol].price <= sma.current.value:
-            return False
+    def screen(self, scores, prices):
+        """Qualified and exit masks for every symbol"""
+        spy_score = scores[self.spy_slot]
+        sma50 = self.panel.sma(50)
 
         # Within 30% of high
-        proximity = self.calculate_52wh_proximity(symbol)
-        if proximity is None or proximity < 0.70:
-            return False
-
-        return True
-
-    def should_exit(self, symbol):
-        score = self.calculate_composite_score(symbol)
-        if score is None or score < 0:
-            return True
-
-        sma = self.sma50.get(symbol)
-        if sma is not None and sma.is_ready:
-            if self.securities[symbol].price < sma.current.value * 0.97:
-                return True
-
-        return False
+        qualified = (
+            self.is_stock &
+            (scores > 0) &
+            (np.isnan(spy_score) | (scores > spy_score)) &
+            (prices > sma50) &
+            (high_proximity(self.panel) >= 0.70)
+        )
+        exits = np.isnan(scores) | (scores < 0) | (prices < sma50 * 0.97)
+        return qualified, exits
 
     def check_stops(self):
         if self.is_warming_up:
@@ -252,8 +156,9 @@ class TopPicksAdaptive(QCAlgorithm):
         if self.is_warming_up:
             return
 
-        regime = self.get_market_regime()
-        regime_mult = self.get_regime_multiplier()
+        scores = composite_roc(self.panel, self.roc_weights)
+        regime = self.get_market_regime(scores)
+        regime_mult = self.get_regime_multiplier(regime)
         self.log(f"Market Regime: {regime} (mult: {regime_mult})")
 
         # In bearish regime, reduce positions aggressively
@@ -265,47 +170,32 @@ class TopPicksAdaptive(QCAlgorithm):
                         del self.entry_prices[symbol]
             return
 
-        candidates = []
-        for ticker, symbol in self.symbols.items():
-            if self.is_qualified(symbol):
-                score = self.calculate_composite_score(symbol)
-                if score is not None:
-                    vol_factor = self.calculate_volatility_factor(symbol)
-                    candidates.append((symbol, ticker, score, vol_factor))
+        prices = np.array([self.securities[symbol].price for symbol in self.panel.symbols])
+        qualified, exits = self.screen(scores, prices)
+        vol_factors = self.calculate_volatility_factors(prices)
 
-        # Sort by score
-        candidates.sort(key=lambda x: x[2], reverse=True)
+        # Top scores among qualified symbols, weighted by inverse volatility
+        # around the base size, scaled by the regime and capped at 15%
+        weights = target_weights(
+            scores, self.target_positions, qualified & ~exits, sizing=vol_factors,
+            position_size=self.base_position_pct * regime_mult, cap=0.15
+        )
 
-        top_picks = candidates[:self.target_positions]
-        target_symbols = set(s for s, _, _, _ in top_picks)
+        # Exits, entries and resizes of more than 3% in one batch
+        held = np.array([self.portfolio[symbol].invested for symbol in self.panel.symbols])
+        current = holdings_weights(self, self.panel.symbols)
+        targets = portfolio_targets(self.panel.symbols, weights, current, tolerance=0.03)
+        self.set_holdings(targets)
 
-        # Exit positions not in top picks
-        for symbol in self.symbols.values():
-            if self.portfolio[symbol].invested:
-                if symbol not in target_symbols or self.should_exit(symbol):
-                    self.liquidate(symbol, "Exit")
-                    self.log(f"EXIT: {symbol}")
-                    if symbol in self.entry_prices:
-                        del self.entry_prices[symbol]
+        for i in np.flatnonzero(held & (weights == 0)):
+            symbol = self.panel.symbols[i]
+            self.log(f"EXIT: {symbol}")
+            self.entry_prices.pop(symbol, None)
 
-        # Calculate target weights with volatility adjustment
-        if len(top_picks) > 0:
-            total_vol_factor = sum(vf for _, _, _, vf in top_picks)
-
-            for symbol, ticker, score, vol_factor in top_picks:
-                # Weight proportional to inverse volatility
-                base_weight = self.base_position_pct * (vol_factor / (total_vol_factor / len(top_picks)))
-                # Apply regime multiplier
-                target_weight = min(base_weight * regime_mult, 0.15)
-
-                if not self.portfolio[symbol].invested:
-                    self.set_holdings(symbol, target_weight)
-                    self.entry_prices[symbol] = self.securities[symbol].price
-                    self.log(f"ENTRY: {ticker} at {target_weight*100:.1f}% (score: {score:.1f}%, vol_factor: {vol_factor:.2f})")
-                else:
-                    current_weight = self.portfolio[symbol].holdings_value / self.portfolio.total_portfolio_value
-                    if abs(current_weight - target_weight) > 0.03:
-                        self.set_holdings(symbol, target_weight)
+        for i in np.flatnonzero(~held & (weights > 0)):
+            symbol = self.panel.symbols[i]
+            self.entry_prices[symbol] = prices[i]
+            self.log(f"ENTRY: {symbol.value} at {weights[i]*100:.1f}% (score: {scores[i]:.1f}%, vol_factor: {vol_factors[i]:.2f})")
 
     def on_data(self, data):
-        pass
+        self.panel.update(data)
@@ -6,7 +6,7 @@ Fetches orders from a QuantConnect backtest and calculates P&L per ticker.
 Saves orders to CSV and displays realized/unrealized P&L breakdown.
 
 Usage:
-    python scripts/backtest_pnl.py <project_id> <backtest_id> [--save-dir <dir>]
+    python scripts/backtest_pnl.py <project_id> <backtest_id> [--save-dir <dir>] [--cassette record|replay|auto]
 
 Example:
     python scripts/backtest_pnl.py 27320717 1621985cb8a866271907cb33d8d675f2
@@ -14,41 +14,29 @@ Example:
 
 import argparse
 import csv
-import hashlib
-import base64
 import json
 import os
 import sys
-import time
 from collections import defaultdict
 from datetime import datetime
 
-try:
-    import requests
-except ImportError:
-    print("Error: requests library required. Install with: pip install requests")
-    sys.exit(1)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'strategy-factory'))
 
+from core.transport import get_transport
 
-def get_qc_auth():
-    """Generate QuantConnect API authentication headers."""
-    user_id = os.environ.get('QC_USER_ID')
-    api_token = os.environ.get('QC_API_TOKEN')
+_api = None
 
-    if not user_id or not api_token:
-        print("Error: QC_USER_ID and QC_API_TOKEN environment variables required")
-        sys.exit(1)
 
-    timestamp = str(int(time.time()))
-    hash_input = f"{api_token}:{timestamp}"
-    hash_digest = hashlib.sha256(hash_input.encode()).hexdigest()
-    auth_string = base64.b64encode(f"{user_id}:{hash_digest}".encode()).decode()
-
-    return {
-        'Authorization': f'Basic {auth_string}',
-        'Timestamp': timestamp,
-        'Content-Type': 'application/json'
-    }
+def get_qc_api(cassette: str = None):
+    """Shared QuantConnect API transport (optionally recording/replaying a cassette)."""
+    global _api
+    if _api is None:
+        try:
+            _api = get_transport(mode=cassette)
+        except ValueError:
+            print("Error: QC_USER_ID and QC_API_TOKEN environment variables required")
+            sys.exit(1)
+    return _api
 
 
 def fetch_orders(project_id: int, backtest_id: str) -> list:
@@ -58,7 +46,6 @@ def fetch_orders(project_id: int, backtest_id: str) -> list:
     batch_size = 100
 
     while True:
-        headers = get_qc_auth()
         payload = {
             'projectId': project_id,
             'backtestId': backtest_id,
@@ -66,13 +53,7 @@ def fetch_orders(project_id: int, backtest_id: str) -> list:
             'end': start + batch_size
         }
 
-        response = requests.post(
-            'https://www.quantconnect.com/api/v2/backtests/orders/read',
-            headers=headers,
-            json=payload
-        )
-
-        data = response.json()
+        data = get_qc_api().call('POST', '/backtests/orders/read', payload)
 
         if not data.get('success'):
             error = data.get('errors', ['Unknown error'])
@@ -94,19 +75,12 @@ def fetch_orders(project_id: int, backtest_id: str) -> list:
 
 def fetch_backtest_stats(project_id: int, backtest_id: str) -> dict:
     """Fetch backtest statistics."""
-    headers = get_qc_auth()
     payload = {
         'projectId': project_id,
         'backtestId': backtest_id
     }
 
-    response = requests.post(
-        'https://www.quantconnect.com/api/v2/backtests/read',
-        headers=headers,
-        json=payload
-    )
-
-    data = response.json()
+    data = get_qc_api().call('POST', '/backtests/read', payload)
     if data.get('success'):
         return data.get('backtest', {})
     return {}
@@ -394,8 +368,11 @@ def main():
     parser.add_argument('backtest_id', type=str, help='Backtest ID')
     parser.add_argument('--save-dir', type=str, default='backtests', help='Directory to save results')
     parser.add_argument('--name', type=str, help='Strategy name for filenames')
+    parser.add_argument('--cassette', choices=['record', 'replay', 'auto'],
+                        help='Record API responses, or replay them without network access')
 
     args = parser.parse_args()
+    get_qc_api(args.cassette)
 
     # Create save directory
     os.makedirs(args.save_dir, exist_ok=True)
@@ -2,32 +2,33 @@
 """
 Calculate P&L per ticker from QC backtest orders.
 Fetches end prices from the backtest's latest trade prices.
+
+Set QC_CASSETTE=record|replay|auto to record or replay the API responses
+(see strategy-factory/core/transport.py).
 """
 import json
+import os
 import sys
-import subprocess
 from collections import defaultdict
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'strategy-factory'))
+
+from core.transport import get_transport
+
 
 def fetch_orders(project_id, backtest_id):
     """Fetch all orders from QC API"""
-    import re
+    api = get_transport()
     orders = []
     for start in range(0, 1000, 100):
         end = start + 100
-        cmd = f'./scripts/qc-api.sh orders {project_id} "{backtest_id}" {start} {end} 2>/dev/null'
         try:
-            result = subprocess.run(cmd, shell=True, capture_output=True, text=True, timeout=60)
-            output = result.stdout
-
-            # Find JSON object in output - look for opening brace
-            start_idx = output.find('{')
-            if start_idx == -1:
-                break
-
-            # Parse the JSON from that point
-            json_str = output[start_idx:]
-            data = json.loads(json_str)
+            data = api.call('POST', '/backtests/orders/read', {
+                'projectId': int(project_id),
+                'backtestId': backtest_id,
+                'start': start,
+                'end': end
+            })
 
             if 'orders' in data and data['orders']:
                 orders.extend(data['orders'])
@@ -43,16 +44,14 @@ def fetch_orders(project_id, backtest_id):
 
 def fetch_backtest_stats(project_id, backtest_id):
     """Fetch backtest statistics"""
-    cmd = f'./scripts/qc-api.sh results {project_id} "{backtest_id}"'
     try:
-        result = subprocess.run(cmd, shell=True, capture_output=True, text=True, timeout=30)
-        # Find JSON in output
-        for line in result.stdout.split('\n'):
-            if line.strip().startswith('{'):
-                data = json.loads(line)
-                if 'backtest' in data:
-                    return data['backtest']
-    except:
+        data = get_transport().call('POST', '/backtests/read', {
+            'projectId': int(project_id),
+            'backtestId': backtest_id
+        })
+        if 'backtest' in data:
+            return data['backtest']
+    except Exception:
         pass
     return None
 
@@ -2,30 +2,13 @@
 """Get project IDs for projects matching a name pattern."""
 import os
 import sys
-import time
-import hashlib
-import base64
-import requests
 
-USER_ID = os.environ.get('QC_USER_ID')
-API_TOKEN = os.environ.get('QC_API_TOKEN')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'strategy-factory'))
 
-def get_auth_headers():
-    timestamp = str(int(time.time()))
-    hash_str = f"{API_TOKEN}:{timestamp}"
-    hash_digest = hashlib.sha256(hash_str.encode()).hexdigest()
-    auth = base64.b64encode(f"{USER_ID}:{hash_digest}".encode()).decode()
-    return {
-        'Authorization': f'Basic {auth}',
-        'Timestamp': timestamp
-    }
+from core.transport import get_transport
 
 def get_projects(pattern=None):
-    resp = requests.get(
-        'https://www.quantconnect.com/api/v2/projects/read',
-        headers=get_auth_headers()
-    )
-    data = resp.json()
+    data = get_transport().call('GET', '/projects/read')
     projects = data.get('projects', [])
 
     if pattern:
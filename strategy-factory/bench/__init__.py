@@ -0,0 +1 @@
+"""Strategy Factory Benchmarks"""
@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""
+Pipeline Benchmark Suite
+
+Runs the pipeline end to end on fixed spec sets, entirely offline (local
+engine on synthetic data, or the mock QC API from core/mock_qc_server.py),
+and reports per scenario:
+- wall time per pipeline phase
+- QC API calls made (total and per endpoint)
+- backtests per minute (local and cloud)
+- result and indicator cache hit rates
+- peak resident memory
+
+Each scenario runs in a fresh process, so peak memory and caches are not
+shared between scenarios. Pipeline outputs (results, registry) go to a
+temporary directory and the repo's strategies/ and results/ are left
+untouched. The report is saved as JSON for comparison across commits:
+
+    python bench/run_bench.py                            # all scenarios
+    python bench/run_bench.py local synthetic            # some scenarios
+    python bench/run_bench.py --compare bench/results/bench_abc1234.json
+
+Scenarios:
+    local      the specs in strategies/specs/, local engine only,
+               including the parameter sweep
+    synthetic  swept variants of the repo and example specs (up to
+               --synthetic-specs of them), local engine only
+    mock       the specs in strategies/specs/ backtested against the mock
+               QC API with the async client (no sweep)
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import resource
+import tempfile
+import subprocess
+import contextlib
+import multiprocessing
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from generators.ai_generator import load_specs
+
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BENCH_RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+
+# Metrics compared by --compare, and whether a higher value is better
+COMPARED_METRICS = {
+    "total_seconds": False,
+    "api_calls": False,
+    "backtests_per_minute": True,
+    "peak_memory_mb": False,
+}
+
+# Thresholds that pass every strategy, so all specs reach the sweep and
+# validation phases whatever the synthetic data makes of them
+OPEN_THRESHOLDS = {
+    "MIN_SHARPE_RATIO": float("-inf"),
+    "MIN_CAGR": float("-inf"),
+    "MAX_DRAWDOWN": float("inf"),
+    "MIN_TRADE_COUNT": 0,
+    "MIN_WIN_RATE": 0.0,
+    "MIN_PROFIT_FACTOR": 0.0,
+    "DISQUALIFY_MAX_DRAWDOWN": float("inf"),
+}
+
+SCENARIOS: Dict[str, Dict[str, Any]] = {
+    "local": {
+        "description": "strategies/specs, local engine only, with parameter sweep",
+        "specs": "repo",
+        "pipeline": {"local_only": True},
+        "config": OPEN_THRESHOLDS,
+    },
+    "synthetic": {
+        "description": "swept variants of the repo and example specs, local engine only",
+        "specs": "synthetic",
+        "pipeline": {"local_only": True, "skip_sweep": True},
+        "config": OPEN_THRESHOLDS,
+    },
+    "mock": {
+        "description": "strategies/specs against the mock QC API, async client, no sweep",
+        "specs": "repo",
+        # No local data, so every spec is backtested through the API
+        "local_data": False,
+        "pipeline": {"mock_qc": True, "skip_sweep": True, "workers": 4, "use_async": True},
+        # Fast simulated backtests and a high rate limit, so the run
+        # measures client overhead rather than configured sleeps
+        "config": {
+            **OPEN_THRESHOLDS,
+            "MOCK_QC_LATENCY": 0.01,
+            "MOCK_QC_BACKTEST_SECONDS": 1.0,
+            "QC_RATE_LIMIT": 600,
+            "MOCK_QC_RATE_LIMIT": 600,
+        },
+    },
+}
+
+
+def synthetic_specs(count: int, specs_dir: str) -> int:
+    """Write swept variants of the example specs to specs_dir; returns the number written"""
+    from models.strategy_spec import create_example_momentum_strategy, create_example_mean_reversion_strategy
+    from generators.param_sweeper import ParameterSweeper
+    from generators.ai_generator import save_spec
+
+    bases = load_specs(config.SPECS_DIR) + [create_example_momentum_strategy(),
+                                            create_example_mean_reversion_strategy()]
+    sweeper = ParameterSweeper(max_combinations=max(1, count // len(bases)), sampling="random")
+    variants = [v for base in bases for v in sweeper.sweep(base)][:count]
+    for variant in variants:
+        save_spec(variant, specs_dir)
+    return len(variants)
+
+
+def synthetic_data(specs_dir: str, path: str, seed: int = 42) -> str:
+    """Save random-walk bars for every symbol the specs trade; returns the .npz path"""
+    from core.local_engine import generate_synthetic_ohlcv
+
+    symbols = sorted({s for spec in load_specs(specs_dir) for s in (spec.universe.symbols or [])})
+    return generate_synthetic_ohlcv(symbols or ["SPY", "QQQ", "IWM", "TLT", "GLD"], seed=seed).save_npz(path)
+
+
+def _rate(hits: int, misses: int) -> float:
+    return hits / (hits + misses) if hits + misses else 0.0
+
+
+def run_scenario(name: str, synthetic_count: int = 200, verbose: bool = False) -> Dict[str, Any]:
+    """
+    Run one scenario in the current process.
+
+    Returns:
+        Dict of benchmark metrics for the scenario
+    """
+    scenario = SCENARIOS[name]
+    for key, value in scenario["config"].items():
+        setattr(config, key, value)
+
+    with tempfile.TemporaryDirectory(prefix=f"bench_{name}_") as workdir:
+        # Keep pipeline outputs out of the repo
+        config.RESULTS_DIR = os.path.join(workdir, "results")
+        config.COMPILED_DIR = os.path.join(workdir, "compiled")
+        config.RESULT_CACHE_PATH = os.path.join(config.RESULTS_DIR, "backtest_cache.sqlite")
+        config.RUN_JOURNAL_PATH = os.path.join(config.RESULTS_DIR, "run_journal.sqlite")
+        config.REGISTRY_PATH = os.path.join(workdir, "registry.json")
+        config.REGISTRY_DB_PATH = os.path.join(workdir, "registry.sqlite")
+        config.QC_CASSETTE_MODE = None
+        os.makedirs(config.RESULTS_DIR)
+        os.makedirs(config.COMPILED_DIR)
+
+        output = sys.stdout if verbose else open(os.devnull, "w")
+        with contextlib.redirect_stdout(output):
+            if scenario["specs"] == "synthetic":
+                specs_dir = os.path.join(workdir, "specs")
+                os.makedirs(specs_dir)
+                synthetic_specs(synthetic_count, specs_dir)
+            else:
+                specs_dir = config.SPECS_DIR
+            spec_count = len(load_specs(specs_dir))
+            local_data = None
+            if scenario.get("local_data", True):
+                local_data = synthetic_data(specs_dir, os.path.join(workdir, "ohlcv.npz"))
+
+            from run_pipeline import Pipeline
+
+            start = time.perf_counter()
+            pipeline = Pipeline(specs_dir=specs_dir, local_data=local_data, **scenario["pipeline"])
+            try:
+                pipeline.run()
+            finally:
+                if pipeline.mock_server is not None:
+                    pipeline.mock_server.stop()
+        total = time.perf_counter() - start
+        if not verbose:
+            output.close()
+
+        mock = pipeline.mock_server.stats() if pipeline.mock_server is not None else None
+        # Every engine/API run that produced metrics (screening, sweep and
+        # walk-forward windows alike); failed runs fail the scenario
+        counts = pipeline.backtest_counts
+        local_backtests = counts["local"]
+        cloud_backtests = counts["cloud"]
+        failed_backtests = counts["local_failed"] + counts["cloud_failed"]
+
+        result_cache = None
+        if pipeline.cache is not None:
+            stats = pipeline.cache.stats()
+            result_cache = {"hits": stats["hits"], "misses": stats["misses"],
+                            "hit_rate": _rate(stats["hits"], stats["misses"])}
+        indicator_cache = None
+        if pipeline.local_engine is not None:
+            stats = pipeline.local_engine.indicator_cache.stats()
+            indicator_cache = {"hits": stats["hits"], "misses": stats["misses"], "hit_rate": stats["hit_rate"],
+                               "bytes": stats["bytes"]}
+
+        result = {
+            "description": scenario["description"],
+            "specs": spec_count,
+            "phase_seconds": {k: round(v, 3) for k, v in pipeline.phase_times.items()},
+            "total_seconds": round(total, 3),
+            "api_calls": mock["requests"] if mock else 0,
+            "api_calls_by_endpoint": mock["by_endpoint"] if mock else {},
+            "local_backtests": local_backtests,
+            "cloud_backtests": cloud_backtests,
+            "failed_backtests": failed_backtests,
+            "backtests_per_minute": round((local_backtests + cloud_backtests) / total * 60, 1) if total else 0.0,
+            "result_cache": result_cache,
+            "indicator_cache": indicator_cache,
+            # ru_maxrss is in KB on Linux and bytes on macOS
+            "peak_memory_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+                                    / (1024 * 1024 if sys.platform == "darwin" else 1024), 1),
+        }
+        if failed_backtests:
+            result["error"] = f"{failed_backtests} backtest(s) failed"
+        return result
+
+
+def _scenario_worker(name: str, synthetic_count: int, verbose: bool, queue):
+    try:
+        queue.put(run_scenario(name, synthetic_count, verbose))
+    except Exception as e:
+        queue.put({"error": f"{type(e).__name__}: {e}"})
+
+
+def run_isolated(name: str, synthetic_count: int = 200, verbose: bool = False) -> Dict[str, Any]:
+    """Run a scenario in a fresh process (clean caches and peak memory)"""
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    process = ctx.Process(target=_scenario_worker, args=(name, synthetic_count, verbose, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def git_commit() -> Optional[str]:
+    """Short hash of the checked-out commit (None outside a git checkout)"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BENCH_DIR,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = 0.10) -> List[str]:
+    """
+    Compare a report with a baseline report.
+
+    Returns:
+        Regressions beyond tolerance, as printable lines
+    """
+    regressions = []
+    print(f"\nComparison with {baseline.get('commit') or 'baseline'} ({baseline.get('timestamp', '?')})")
+    for name, current in report["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if not previous or "error" in current or "error" in previous:
+            continue
+        print(f"  {name}:")
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            old, new = previous.get(metric), current.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            worse = change < -tolerance if higher_is_better else change > tolerance
+            flag = "  REGRESSION" if worse else ""
+            print(f"    {metric:<22} {old:>10} -> {new:>10} ({change * 100:+.1f}%){flag}")
+            if worse:
+                regressions.append(f"{name}.{metric}: {old} -> {new} ({change * 100:+.1f}%)")
+    return regressions
+
+
+def print_scenario(name: str, result: Dict[str, Any]):
+    if "description" not in result:
+        print(f"\n{name}: FAILED ({result['error']})")
+        return
+    print(f"\n{name}: {result['description']} ({result['specs']} specs)")
+    print("  Phases: " + ", ".join(f"{k.split('_')[0]} {v:.1f}s" for k, v in result["phase_seconds"].items()))
+    print(f"  Total: {result['total_seconds']:.1f}s, {result['backtests_per_minute']} backtests/min "
+          f"({result['local_backtests']} local, {result['cloud_backtests']} cloud)")
+    print(f"  API calls: {result['api_calls']}")
+    for label in ("result_cache", "indicator_cache"):
+        stats = result[label]
+        if stats and stats["hits"] + stats["misses"]:
+            print(f"  {label.replace('_', ' ').capitalize()}: {stats['hit_rate'] * 100:.0f}% hit rate "
+                  f"({stats['hits']}/{stats['hits'] + stats['misses']})")
+    print(f"  Peak memory: {result['peak_memory_mb']} MB")
+    if "error" in result:
+        print(f"  FAILED: {result['error']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("scenarios", nargs="*", help=f"Scenarios to run: {', '.join(SCENARIOS)} (default: all)")
+    parser.add_argument("--synthetic-specs", type=int, default=200,
+                        help="Number of specs in the synthetic scenario (default: 200)")
+    parser.add_argument("--output", help="Report path (default: bench/results/bench_<commit>_<time>.json)")
+    parser.add_argument("--compare", help="Baseline report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="Relative change reported as a regression (default: 0.10)")
+    parser.add_argument("--verbose", action="store_true", help="Show pipeline output")
+    args = parser.parse_args()
+
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"Unknown scenario(s): {', '.join(unknown)}")
+
+    commit = git_commit()
+    report = {
+        "commit": commit,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "scenarios": {},
+    }
+
+    for name in args.scenarios or list(SCENARIOS):
+        print(f"Running {name}...", flush=True)
+        report["scenarios"][name] = run_isolated(name, args.synthetic_specs, args.verbose)
+        print_scenario(name, report["scenarios"][name])
+
+    output = args.output or os.path.join(
+        BENCH_RESULTS_DIR, f"bench_{commit or 'nogit'}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nReport saved to: {output}")
+
+    failed = [name for name, result in report["scenarios"].items() if "error" in result]
+    if failed:
+        print(f"\nFailed scenario(s): {', '.join(failed)}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s):")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
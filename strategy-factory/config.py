@@ -45,6 +45,13 @@ MIN_TRADE_COUNT = 20  # production: 30
 DISQUALIFY_MAX_DRAWDOWN = 0.40  # 40%
 DISQUALIFY_NEGATIVE_YEARS = 2  # Max years with negative returns
 
+# Walk-forward validation (core/walk_forward.py): the train/validate/test
+# windows above, plus optional anchored folds that split the full range
+# into WALK_FORWARD_FOLDS + 1 segments and test on each segment after the first
+WALK_FORWARD_ENABLED = True
+WALK_FORWARD_FOLDS = 0
+WALK_FORWARD_MIN_PROFITABLE_FOLDS = 0.5  # share of folds with a positive Sharpe
+
 # =============================================================================
 # SCORING WEIGHTS
 # =============================================================================
@@ -89,6 +96,7 @@ SLIPPAGE_PERCENT = 0.001  # 0.1%
 # Commission model (IBKR)
 COMMISSION_PER_SHARE = 0.005  # $0.005 per share
 COMMISSION_MIN = 1.0           # $1 minimum
+COMMISSION_MAX_PCT = 0.005     # Capped at 0.5% of trade value
 
 # Liquidity filters
 MIN_PRICE = 5.0                    # Minimum stock price
@@ -112,12 +120,30 @@ QC_API_BASE = "https://www.quantconnect.com/api/v2"
 QC_RATE_LIMIT = 30  # requests per minute
 QC_RATE_LIMIT_BUFFER = 5  # safety buffer
 
-# Backtest polling
-BACKTEST_POLL_INTERVAL = 5  # seconds
+# Async client: keep-alive connections and concurrently running backtests
+QC_API_MAX_CONNECTIONS = 8
+MAX_BACKTESTS_IN_FLIGHT = 24
+
+# Local mock API for offline runs and load tests (core/mock_qc_server.py)
+MOCK_QC_LATENCY = 0.05  # seconds added to each request
+MOCK_QC_BACKTEST_SECONDS = 5.0  # simulated backtest duration
+MOCK_QC_RATE_LIMIT = QC_RATE_LIMIT  # requests per minute before 429s (0 = unlimited)
+MOCK_QC_ERROR_RATE = 0.0  # probability of a spurious 429
+MOCK_QC_MAX_CONCURRENT = 0  # running backtests allowed at once (0 = unlimited)
+
+# Backtest polling (adaptive, see core/polling.py)
+BACKTEST_POLL_INTERVAL = 5  # seconds, shortest interval between polls
+BACKTEST_POLL_MAX_INTERVAL = 60  # seconds, longest interval between polls
+BACKTEST_POLL_BACKOFF = 1.5  # interval multiplier while progress is stalled
+POLL_BUDGET_FRACTION = 0.25  # max share of the rate limit spent on polling
 BACKTEST_TIMEOUT = 300  # 5 minutes max wait
 
 # Sandbox project
 SANDBOX_PROJECT_ID = 27315240  # Strategy Factory Sandbox
+SANDBOX_PROJECT_NAME = "Strategy Factory Sandbox"
+
+# Project pool for concurrent backtests (one in-flight backtest per project)
+SANDBOX_POOL_SIZE = 4
 
 # =============================================================================
 # INDICATOR MAPPINGS
@@ -186,12 +212,45 @@ DYNAMIC_UNIVERSE_OPTIONS = {
     ],
 }
 
+# Compiled dynamic universes (core/compiler.py): index membership comes from
+# the constituents of a tracking ETF, sectors from Morningstar sector codes
+INDEX_ETFS = {"SP500": "SPY", "NASDAQ100": "QQQ", "DJIA": "DIA"}
+MORNINGSTAR_SECTOR_CODES = {
+    "Basic Materials": 101, "Materials": 101,
+    "Consumer Cyclical": 102, "Consumer Discretionary": 102,
+    "Financial Services": 103, "Financials": 103,
+    "Real Estate": 104,
+    "Consumer Defensive": 205, "Consumer Staples": 205,
+    "Healthcare": 206,
+    "Utilities": 207,
+    "Communication Services": 308,
+    "Energy": 309,
+    "Industrials": 310,
+    "Technology": 311,
+}
+UNIVERSE_REFRESH_OPTIONS = ("daily", "weekly", "monthly")
+UNIVERSE_FINE_CANDIDATES = 10  # coarse candidates per symbol kept when fine (sector) filtering
 # =============================================================================
 # GENERATION SETTINGS
 # =============================================================================
 
 DEFAULT_BATCH_SIZE = 15  # Number of strategies to generate per batch
 MAX_PARAMETER_COMBINATIONS = 50  # Max variations per strategy in sweep
+SWEEP_SAMPLING = "lhs"  # How larger grids are sampled: grid, random, lhs, sobol
+SWEEP_SEED = 42  # Seed for random/lhs sampling (reproducible sweeps)
+
+# Successive-halving sweeps (--sweep-mode halving): variants are scored on
+# windows growing eta-fold, keeping the top 1/eta each rung
+HALVING_ETA = 3
+HALVING_MIN_WINDOW_DAYS = 180  # shortest (first) rung window
+HALVING_MIN_SURVIVORS = 2  # variants kept per strategy in every rung
+
+# Bayesian optimization sweeps (--sweep-mode bayes)
+BAYES_OBJECTIVE = "sharpe_ratio"  # ParsedMetrics field, or "score" for the ranker score
+BAYES_INITIAL_POINTS = 8  # Latin hypercube points before the surrogate is fit
+BAYES_MAX_EVALUATIONS = 24  # backtests per strategy
+BAYES_BATCH_SIZE = 4  # points proposed per round (backtested concurrently)
+BAYES_MAX_CANDIDATES = 4096  # grid points scored per proposal
 
 # =============================================================================
 # FILE PATHS
@@ -203,4 +262,30 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 SPECS_DIR = os.path.join(BASE_DIR, "strategies", "specs")
 COMPILED_DIR = os.path.join(BASE_DIR, "strategies", "compiled")
 RESULTS_DIR = os.path.join(BASE_DIR, "results")
-REGISTRY_PATH = os.path.join(BASE_DIR, "strategies", "registry.json")
+REGISTRY_PATH = os.path.join(BASE_DIR, "strategies", "registry.json")  # snapshot, exported per run
+REGISTRY_DB_PATH = os.path.join(BASE_DIR, "strategies", "registry.sqlite")
+LOCAL_DATA_DIR = os.path.join(BASE_DIR, "data", "ohlcv")  # core/data_store.py
+
+# =============================================================================
+# RESULT CACHE
+# =============================================================================
+
+RESULT_CACHE_PATH = os.path.join(RESULTS_DIR, "backtest_cache.sqlite")
+RESULT_CACHE_MAX_ENTRIES = 5000
+RESULT_CACHE_MAX_AGE_DAYS = 90
+RESULT_CACHE_MAX_BYTES = 500 * 1024 * 1024  # 500 MB
+
+# Checkpoint of the current run's cloud backtests (core/journal.py)
+RUN_JOURNAL_PATH = os.path.join(RESULTS_DIR, "run_journal.sqlite")
+
+# In-memory indicator arrays shared across specs by the local engine
+# (core/indicator_cache.py)
+INDICATOR_CACHE_MAX_BYTES = 256 * 1024 * 1024  # 256 MB
+
+# Record/replay of QC API responses (core/transport.py):
+# None/"off", "record", "replay" or "auto"
+QC_CASSETTE_MODE = os.environ.get("QC_CASSETTE")
+QC_CASSETTE_DIR = os.environ.get("QC_CASSETTE_DIR", os.path.join(BASE_DIR, "cassettes"))
+
+# Spans and counters kept by core/tracing.py before further events are dropped
+TRACE_MAX_EVENTS = 200_000
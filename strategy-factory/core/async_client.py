@@ -0,0 +1,605 @@
+"""
+Async QuantConnect API Client
+
+asyncio counterpart to QCRunner for keeping many backtests in flight:
+- Keep-alive HTTP connection pool (one TLS handshake per connection,
+  not per request)
+- Token-bucket rate limiter shared by all coroutines
+- Batched, adaptive polling: one /backtests/list request per project per
+  poll, timed from progress-based ETAs (see core/polling.py)
+
+Blocking socket I/O runs on a small thread pool, one pooled connection per
+in-flight request, so the client needs only the standard library.
+
+A sandbox project is held only while its code is pushed, compiled and the
+backtest is created. The compile ID pins the code, so the project is free
+for the next strategy while the backtest runs and is polled.
+"""
+
+import os
+import json
+import time
+import asyncio
+import http.client
+import threading
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple, Callable
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.runner import BacktestResult, is_rate_limit_error
+from core.transport import make_auth_headers, get_cassette, Cassette
+from core.tracing import tracer, traced
+from core.polling import PollSchedule, is_backtest_finished, min_poll_interval, backtests_by_id
+import config
+
+
+# Errors that mean a reused keep-alive connection was already closed by the
+# server and the request never reached it (no response bytes read)
+STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError)
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of keep-alive HTTP(S) connections to one host.
+
+    Connections are created lazily up to max_size and returned to the
+    pool after each complete request/response exchange.
+    """
+
+    def __init__(self, base_url: str, max_size: int = 8, timeout: float = 60):
+        parsed = urllib.parse.urlparse(base_url)
+        self.scheme = parsed.scheme
+        self.host = parsed.hostname
+        self.port = parsed.port
+        self.base_path = parsed.path.rstrip("/")
+        self.max_size = max_size
+        self.timeout = timeout
+        self.connections_created = 0
+
+        self._idle: List[http.client.HTTPConnection] = []
+        self._slots = threading.Semaphore(max_size)
+        self._lock = threading.Lock()
+
+    def _new_connection(self) -> http.client.HTTPConnection:
+        self.connections_created += 1
+        if self.scheme == "https":
+            return http.client.HTTPSConnection(self.host, self.port, timeout=self.timeout)
+        return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    def request(
+        self,
+        method: str,
+        endpoint: str,
+        body: Optional[bytes],
+        headers: Dict[str, str]
+    ) -> Tuple[int, bytes]:
+        """
+        Perform one request on a pooled connection.
+
+        A stale keep-alive connection (closed by the server before any
+        response) is replaced and the request retried once on a fresh
+        connection. Other failures, e.g. timeouts, may come after the
+        server acted on the request, so they are raised for call() to
+        handle rather than re-sent here.
+
+        Returns:
+            (HTTP status, response body)
+        """
+        self._slots.acquire()
+        try:
+            with self._lock:
+                conn = self._idle.pop() if self._idle else None
+            reused = conn is not None
+            if conn is None:
+                conn = self._new_connection()
+
+            try:
+                try:
+                    response = self._send(conn, method, endpoint, body, headers)
+                except STALE_CONNECTION_ERRORS:
+                    if not reused:
+                        raise
+                    conn.close()
+                    conn = self._new_connection()
+                    response = self._send(conn, method, endpoint, body, headers)
+                data = response.read()  # Must drain fully before the connection is reused
+            except (http.client.HTTPException, OSError):
+                conn.close()
+                raise
+
+            if response.will_close:
+                conn.close()  # Reopened automatically on next request
+            with self._lock:
+                self._idle.append(conn)
+            return response.status, data
+        finally:
+            self._slots.release()
+
+    def _send(self, conn, method, endpoint, body, headers) -> http.client.HTTPResponse:
+        """Send the request and read the status line and headers"""
+        conn.request(method, self.base_path + endpoint, body=body, headers=headers)
+        return conn.getresponse()
+
+    def close(self):
+        """Close all idle connections"""
+        with self._lock:
+            for conn in self._idle:
+                conn.close()
+            self._idle.clear()
+
+
+class TokenBucket:
+    """
+    Async token-bucket rate limiter.
+
+    Tokens refill continuously at requests_per_minute; up to `burst`
+    requests may go out back-to-back. A rate-limit response penalizes the
+    whole bucket so every coroutine backs off together.
+    """
+
+    def __init__(self, requests_per_minute: float, burst: int = 1):
+        self.rate = requests_per_minute / 60.0
+        self.capacity = float(burst)
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.consecutive_rate_limits = 0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        """Wait until a request may be sent"""
+        start = time.monotonic()
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.blocked_until:
+                    await asyncio.sleep(self.blocked_until - now)
+                    continue
+                self._refill(now)
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    tracer.observe("rate_limit.wait_seconds", now - start)
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def report_rate_limit(self) -> float:
+        """Back off after a rate-limit response; returns the backoff seconds"""
+        tracer.count("api.rate_limited")
+        self.consecutive_rate_limits += 1
+        wait_time = 10 * (2 ** min(self.consecutive_rate_limits, 4))  # Cap at ~160s
+        self.blocked_until = max(self.blocked_until, time.monotonic() + wait_time)
+        self.tokens = 0.0
+        return wait_time
+
+    def report_success(self):
+        if self.consecutive_rate_limits > 0:
+            self.consecutive_rate_limits -= 1
+
+
+class AsyncQCClient:
+    """
+    asyncio QuantConnect API client.
+
+    Usage:
+        client = runner.async_client()
+        results = asyncio.run(client.run_many(jobs, runner.project_pool))
+    """
+
+    def __init__(
+        self,
+        user_id: str = None,
+        api_token: str = None,
+        api_base: str = None,
+        requests_per_minute: float = None,
+        max_connections: int = None,
+        cassette: Cassette = None,
+        verbose: bool = True
+    ):
+        """
+        Args:
+            user_id: QC user ID (default: QC_USER_ID env var)
+            api_token: QC API token (default: QC_API_TOKEN env var)
+            api_base: API base URL (default: config.QC_API_BASE)
+            requests_per_minute: Rate limit (default: config limit - buffer)
+            max_connections: Keep-alive connections / concurrent requests
+            cassette: Record/replay cassette (default: config.QC_CASSETTE_MODE)
+            verbose: Whether to print progress
+        """
+        self.user_id = user_id or os.environ.get("QC_USER_ID")
+        self.api_token = api_token or os.environ.get("QC_API_TOKEN")
+        self.cassette = cassette if cassette is not None else get_cassette()
+        offline = self.cassette is not None and self.cassette.mode == "replay"
+        if not offline and (not self.user_id or not self.api_token):
+            raise ValueError("QC_USER_ID and QC_API_TOKEN must be set")
+
+        self.verbose = verbose
+        self.max_connections = max_connections or config.QC_API_MAX_CONNECTIONS
+        self.pool = ConnectionPool(api_base or config.QC_API_BASE, self.max_connections)
+        self.limiter = TokenBucket(
+            requests_per_minute or (config.QC_RATE_LIMIT - config.QC_RATE_LIMIT_BUFFER)
+        )
+        self._executor = ThreadPoolExecutor(max_workers=self.max_connections)
+        self.request_count = 0
+
+        # Batched polling: project_id -> {backtest_id: (future, schedule)},
+        # one poller task per project with backtests in flight
+        self._waiters: Dict[int, Dict[str, Tuple[asyncio.Future, PollSchedule]]] = {}
+        self._pollers: Dict[int, asyncio.Task] = {}
+
+    def _log(self, msg: str, indent: int = 2):
+        if self.verbose:
+            print(" " * indent + msg)
+
+    @traced("async.api_call", args=("method", "endpoint"))
+    async def call(
+        self,
+        method: str,
+        endpoint: str,
+        data: Dict[str, Any] = None,
+        retries: int = 5
+    ) -> Dict[str, Any]:
+        """
+        Make an API call, with rate limiting and retries.
+
+        Args:
+            method: HTTP method (GET or POST)
+            endpoint: API endpoint
+            data: JSON data for POST requests
+            retries: Number of retries
+
+        Returns:
+            Parsed JSON response
+        """
+        if self.cassette is not None:
+            hit = self.cassette.play(method, endpoint, data)
+            if hit is not None:
+                return json.loads(hit[1])
+
+        loop = asyncio.get_running_loop()
+        body = json.dumps(data).encode() if data else None
+
+        for attempt in range(retries):
+            await self.limiter.acquire()
+            headers = make_auth_headers(self.user_id, self.api_token)
+            self.request_count += 1
+
+            start = time.perf_counter()
+            try:
+                with tracer.span("api.request", endpoint=endpoint) as span:
+                    status, raw = await loop.run_in_executor(
+                        self._executor, self.pool.request, method, endpoint, body, headers
+                    )
+                    span["status"] = status
+            except (http.client.HTTPException, OSError) as e:
+                tracer.count("api.errors")
+                if attempt < retries - 1:
+                    wait = 2 ** (attempt + 1)
+                    self._log(f"Network error, retrying in {wait}s...")
+                    await asyncio.sleep(wait)
+                    continue
+                raise RuntimeError(f"Network error: {e}")
+
+            tracer.count("api.requests")
+            tracer.observe("api.latency_seconds", time.perf_counter() - start)
+            text = raw.decode(errors="replace")
+            if status == 429 or (status >= 400 and is_rate_limit_error(text)):
+                wait = self.limiter.report_rate_limit()
+                self._log(f"[Rate limit HIT] Backing off for {wait}s")
+                continue
+
+            if status >= 400:
+                tracer.count("api.errors")
+                if attempt < retries - 1:
+                    wait = 2 ** (attempt + 1)
+                    self._log(f"HTTP error {status}, retrying in {wait}s...")
+                    await asyncio.sleep(wait)
+                    continue
+                raise RuntimeError(f"API call failed: {status} - {text}")
+
+            self.limiter.report_success()
+            if self.cassette is not None:
+                self.cassette.record(method, endpoint, data, status, text)
+            return json.loads(text)
+
+        raise RuntimeError("API call failed after all retries")
+
+    # -------------------------------------------------------------------------
+    # Endpoints
+    # -------------------------------------------------------------------------
+
+    async def push_code(self, project_id: int, code: str, filename: str = "main.py") -> Dict[str, Any]:
+        return await self.call("POST", "/files/update", {
+            "projectId": project_id,
+            "name": filename,
+            "content": code
+        })
+
+    async def compile_project(self, project_id: int) -> Dict[str, Any]:
+        return await self.call("POST", "/compile/create", {"projectId": project_id})
+
+    async def create_backtest(self, project_id: int, compile_id: str, name: str) -> Dict[str, Any]:
+        return await self.call("POST", "/backtests/create", {
+            "projectId": project_id,
+            "backtestName": name,
+            "compileId": compile_id
+        })
+
+    async def read_backtest(self, project_id: int, backtest_id: str) -> Dict[str, Any]:
+        return await self.call("POST", "/backtests/read", {
+            "projectId": project_id,
+            "backtestId": backtest_id
+        })
+
+    async def list_backtests(self, project_id: int) -> Dict[str, Any]:
+        return await self.call("POST", "/backtests/list", {
+            "projectId": project_id,
+            "includeStatistics": False
+        })
+
+    async def wait_for_backtest(
+        self,
+        project_id: int,
+        backtest_id: str,
+        timeout: float = None,
+        poll_interval: float = None
+    ) -> Dict[str, Any]:
+        """
+        Wait until a backtest completes or errors.
+
+        All backtests awaited on a project are checked together by one
+        poller task with one /backtests/list request per poll, timed by
+        the adaptive PollSchedule of the soonest-due backtest. Cancelling
+        the awaiting task stops polling for this backtest.
+
+        Args:
+            poll_interval: Shortest seconds between polls (default: the
+                           polling budget floor)
+
+        Raises:
+            TimeoutError: If not complete within timeout
+        """
+        timeout = timeout or config.BACKTEST_TIMEOUT
+
+        future = asyncio.get_running_loop().create_future()
+        waiters = self._waiters.setdefault(project_id, {})
+        min_interval = poll_interval or min_poll_interval(1, self.limiter.rate * 60)
+        waiters[backtest_id] = (future, PollSchedule(min_interval=min_interval))
+        if project_id not in self._pollers:
+            self._pollers[project_id] = asyncio.create_task(self._poll_project(project_id))
+
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"Backtest timed out after {timeout}s")
+        finally:
+            waiters.pop(backtest_id, None)
+
+    async def _poll_project(self, project_id: int):
+        """Poll every awaited backtest of one project until none remain"""
+        waiters = self._waiters[project_id]
+        last_poll = 0.0
+        try:
+            while waiters:
+                # Every project poller shares the polling budget
+                floor = min_poll_interval(len(self._pollers), self.limiter.rate * 60)
+                next_poll = min(schedule.next_poll_at for _, schedule in waiters.values())
+                await asyncio.sleep(max(0.0, max(next_poll, last_poll + floor) - time.time()))
+                if not waiters:
+                    break
+                last_poll = time.time()
+
+                listing = await self.list_backtests(project_id)
+                found = backtests_by_id(listing) if listing.get("success") else {}
+
+                for backtest_id, (future, schedule) in list(waiters.items()):
+                    if future.done():
+                        continue
+                    response = None
+                    backtest = found.get(backtest_id)
+                    if backtest is None:
+                        # Not in the listing: fall back to a full read when due
+                        if not schedule.due():
+                            continue
+                        response = await self.read_backtest(project_id, backtest_id)
+                        backtest = response.get("backtest", {}) if response.get("success") else {}
+
+                    if is_backtest_finished(backtest):
+                        if response is None:
+                            response = await self.read_backtest(project_id, backtest_id)
+                        if not future.done():
+                            future.set_result(response)
+                    else:
+                        schedule.update(backtest.get("progress", 0))
+        except Exception as e:
+            for future, _ in waiters.values():
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            self._pollers.pop(project_id, None)
+
+    # -------------------------------------------------------------------------
+    # Orchestration
+    # -------------------------------------------------------------------------
+
+    async def run_full_backtest(
+        self,
+        projects: "asyncio.Queue[int]",
+        code: str,
+        strategy_id: str,
+        backtest_name: str = None,
+        on_start: Callable[[str, int, str, str], None] = None
+    ) -> BacktestResult:
+        """
+        Push, compile, start and wait for one backtest.
+
+        A project is checked out from `projects` only for push → compile →
+        create, then returned before polling. on_start, if given, is called
+        with (strategy_id, project_id, backtest_id, backtest_name) once the
+        backtest is created.
+        """
+        if backtest_name is None:
+            backtest_name = f"{strategy_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+
+        def failed(status: str, error: str, raw: Dict[str, Any] = None, logs: List[str] = None) -> BacktestResult:
+            self._log(f"[{strategy_id}] {status}: {error}")
+            return BacktestResult(
+                backtest_id="",
+                strategy_id=strategy_id,
+                name=backtest_name,
+                status=status,
+                success=False,
+                error=error,
+                statistics={},
+                raw_response=raw or {},
+                logs=logs or [],
+                runtime_errors=logs or [error]
+            )
+
+        project_id = await projects.get()
+        try:
+            push = await self.push_code(project_id, code)
+            if not push.get("success"):
+                return failed("push_failed", str(push.get("errors", "Push failed")), push)
+
+            compiled = await self.compile_project(project_id)
+            if not compiled.get("success"):
+                errors = compiled.get("errors", [])
+                return failed("compile_failed", "; ".join(errors) or "Unknown compilation error",
+                              {"compile_error": compiled}, errors)
+
+            created = await self.create_backtest(project_id, compiled.get("compileId"), backtest_name)
+            if not created.get("success"):
+                errors = created.get("errors", [])
+                return failed("backtest_start_failed", "; ".join(errors) or "Unknown backtest error",
+                              {"backtest_error": created})
+            backtest_id = created.get("backtest", {}).get("backtestId")
+        finally:
+            projects.put_nowait(project_id)
+
+        self._log(f"[{strategy_id}] Started backtest {backtest_id}")
+        if on_start:
+            on_start(strategy_id, project_id, backtest_id, backtest_name)
+        try:
+            response = await self.wait_for_backtest(project_id, backtest_id)
+        except TimeoutError as e:
+            result = failed("timeout", str(e))
+            result.backtest_id = backtest_id
+            return result
+
+        backtest = response.get("backtest", {})
+        runtime_errors = []
+        if backtest.get("error"):
+            runtime_errors.append(backtest.get("error"))
+        if backtest.get("stacktrace"):
+            runtime_errors.append(f"Stack trace: {backtest.get('stacktrace')[:500]}")
+
+        statistics = backtest.get("statistics", {})
+        self._log(f"[{strategy_id}] Results: Sharpe={statistics.get('Sharpe Ratio', 'N/A')}, "
+                  f"Trades={statistics.get('Total Orders', 'N/A')}")
+
+        return BacktestResult(
+            backtest_id=backtest_id,
+            strategy_id=strategy_id,
+            name=backtest_name,
+            status="completed",
+            success=True,
+            error=None,
+            statistics=statistics,
+            raw_response=response,
+            logs=backtest.get("logs", []),
+            runtime_errors=runtime_errors
+        )
+
+    async def run_many(
+        self,
+        jobs: List[Tuple[str, str, str]],
+        project_ids: List[int],
+        on_complete: Callable[[BacktestResult], None] = None,
+        max_in_flight: int = None,
+        on_start: Callable[[str, int, str, str], None] = None
+    ) -> Dict[str, BacktestResult]:
+        """
+        Run many backtests concurrently.
+
+        Args:
+            jobs: List of (code, strategy_id, backtest_name) tuples
+            project_ids: Sandbox projects to push code to
+            on_complete: Optional callback invoked as each backtest finishes
+            max_in_flight: Max concurrently running backtests
+                           (default: config.MAX_BACKTESTS_IN_FLIGHT)
+            on_start: Optional callback invoked as each backtest is created
+
+        Returns:
+            Dict mapping strategy_id to BacktestResult
+        """
+        projects: "asyncio.Queue[int]" = asyncio.Queue()
+        for project_id in project_ids:
+            projects.put_nowait(project_id)
+        in_flight = asyncio.Semaphore(max_in_flight or config.MAX_BACKTESTS_IN_FLIGHT)
+
+        async def run_job(code: str, strategy_id: str, backtest_name: str) -> BacktestResult:
+            async with in_flight:
+                try:
+                    return await self.run_full_backtest(projects, code, strategy_id, backtest_name, on_start)
+                except Exception as e:
+                    return BacktestResult(
+                        backtest_id="",
+                        strategy_id=strategy_id,
+                        name=backtest_name,
+                        status="error",
+                        success=False,
+                        error=str(e),
+                        statistics={},
+                        raw_response={},
+                        runtime_errors=[str(e)]
+                    )
+
+        results = {}
+        tasks = [asyncio.create_task(run_job(*job)) for job in jobs]
+        try:
+            for task in asyncio.as_completed(tasks):
+                result = await task
+                results[result.strategy_id] = result
+                if on_complete:
+                    on_complete(result)
+        finally:
+            # Stop any remaining pollers if we were cancelled or failed
+            for task in tasks:
+                task.cancel()
+
+        return results
+
+    def close(self):
+        """Release pooled connections and worker threads"""
+        for task in self._pollers.values():
+            task.cancel()
+        self.pool.close()
+        self._executor.shutdown(wait=False)
+
+
+# =============================================================================
+# TESTING
+# =============================================================================
+
+if __name__ == "__main__":
+    print("Testing Async QC Client...")
+
+    async def main():
+        client = AsyncQCClient()
+        try:
+            start = time.time()
+            responses = await asyncio.gather(*[client.call("GET", "/authenticate") for _ in range(3)])
+            print(f"  Auth: {[r.get('success') for r in responses]} in {time.time() - start:.1f}s")
+            print(f"  Requests: {client.request_count}, connections opened: {client.pool.connections_created}")
+        finally:
+            client.close()
+
+    asyncio.run(main())
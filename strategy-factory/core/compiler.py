@@ -15,18 +15,41 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from models.strategy_spec import (
     StrategySpec, IndicatorSpec, Condition, ConditionGroup,
-    Operator, Logic, Timeframe, UniverseType
+    Operator, Logic, Timeframe, UniverseType, UniverseFilters
 )
-from templates.base_algorithm import get_template
+from templates.base_algorithm import get_template, get_dynamic_universe_methods
+from core.tracing import traced
 import config
 
 
+def parameter_name(path: str) -> str:
+    """QC parameter name for a dot-notation spec path"""
+    return re.sub(r'[^a-zA-Z0-9]', '_', path)
+
+
+class ParameterRef:
+    """
+    Placeholder for a swept value in parameterized compilation.
+
+    Renders as a self.get_parameter() call, so it can be substituted
+    anywhere the compiler formats a numeric spec value into code.
+    """
+
+    def __init__(self, name: str, default: Any):
+        self.name = name
+        self.default = default
+
+    def __str__(self) -> str:
+        return f'self.get_parameter("{self.name}", {self.default!r})'
+
+
 class StrategyCompiler:
     """Compiles StrategySpec to QuantConnect Python code"""
 
     def __init__(self):
         self.template = get_template()
 
+    @traced("compiler.compile")
     def compile(
         self,
         spec: StrategySpec,
@@ -51,6 +74,84 @@ class StrategyCompiler:
         if errors:
             raise ValueError(f"Invalid strategy spec: {errors}")
 
+        warmup_period = spec.get_max_indicator_period() + config.WARMUP_BUFFER_DAYS
+        return self._render(spec, start_date, end_date, initial_capital, warmup_period)
+
+    @traced("compiler.compile_parameterized")
+    def compile_parameterized(
+        self,
+        spec: StrategySpec,
+        start_date: str = None,
+        end_date: str = None,
+        initial_capital: float = None,
+    ) -> Tuple[str, Dict[str, str]]:
+        """
+        Compile a spec into a single algorithm whose swept parameters are
+        read at runtime via self.get_parameter().
+
+        Every variation of the spec can then be backtested against one
+        compile ID by passing its values as backtest parameters, instead
+        of pushing and compiling code per variation.
+
+        Args:
+            spec: Base strategy with parameter ranges defined
+            start_date: Override start date (YYYY-MM-DD)
+            end_date: Override end date (YYYY-MM-DD)
+            initial_capital: Override initial capital
+
+        Returns:
+            (code, {parameter path: QC parameter name})
+
+        Raises:
+            ValueError: If the spec is invalid or a swept value is not numeric
+        """
+        from generators.param_sweeper import ParameterSweeper
+
+        errors = spec.validate()
+        if errors:
+            raise ValueError(f"Invalid strategy spec: {errors}")
+
+        sweeper = ParameterSweeper()
+        names = {}
+        refs = {}
+        widest = {}
+        for param in spec.parameters:
+            values = list(param.values)
+            if not values or not all(
+                isinstance(v, (int, float)) and not isinstance(v, bool) for v in values
+            ):
+                raise ValueError(f"Parameter {param.path} has non-numeric values")
+
+            default = sweeper.get_nested_value(spec, param.path)
+            if all(isinstance(v, int) for v in values) and isinstance(default, int):
+                default = int(default)
+            else:
+                default = float(default)
+
+            name = parameter_name(param.path)
+            names[param.path] = name
+            refs[param.path] = ParameterRef(name, default)
+            widest[param.path] = max(values + [default])
+
+        # Warm up for the longest lookback any variation can use
+        warmup_spec = sweeper.apply_parameters(spec, widest)
+        warmup_period = max(
+            spec.get_max_indicator_period(), warmup_spec.get_max_indicator_period()
+        ) + config.WARMUP_BUFFER_DAYS
+
+        template_spec = sweeper.apply_parameters(spec, refs)
+        code = self._render(template_spec, start_date, end_date, initial_capital, warmup_period)
+        return code, names
+
+    def _render(
+        self,
+        spec: StrategySpec,
+        start_date: str,
+        end_date: str,
+        initial_capital: float,
+        warmup_period: int,
+    ) -> str:
+        """Fill the algorithm template for a validated spec"""
         # Parse dates
         if start_date is None:
             start_date = config.DATE_RANGES[config.ACTIVE_DATE_RANGE]["full"][0]
@@ -69,13 +170,13 @@ class StrategyCompiler:
 
         # Generate code sections
         universe_code = self._generate_universe_code(spec)
+        universe_methods = (
+            get_dynamic_universe_methods() if spec.universe.type == UniverseType.DYNAMIC else ""
+        )
         indicator_code = self._generate_indicator_code(spec)
         entry_conditions_code = self._generate_conditions_code(spec.entry_conditions, spec)
         exit_conditions_code = self._generate_conditions_code(spec.exit_conditions, spec)
 
-        # Calculate warmup period
-        warmup_period = spec.get_max_indicator_period() + config.WARMUP_BUFFER_DAYS
-
         # Risk management values
         stop_loss = spec.risk_management.stop_loss_pct
         take_profit = spec.risk_management.take_profit_pct
@@ -97,6 +198,7 @@ class StrategyCompiler:
             initial_capital=int(initial_capital),
             slippage_percent=config.SLIPPAGE_PERCENT,
             universe_code=universe_code,
+            universe_methods=universe_methods,
             indicator_code=indicator_code,
             position_size_dollars=spec.risk_management.position_size_dollars,
             stop_loss_pct=f"{stop_loss}" if stop_loss else "None",
@@ -140,84 +242,132 @@ class StrategyCompiler:
             lines.append(f"    equity = self.add_equity(ticker, Resolution.DAILY)")
             lines.append(f"    self.symbols.append(equity.symbol)")
         else:
-            # Dynamic universe - use coarse selection
-            # For now, fall back to a default set if dynamic
-            # Full dynamic universe would require more complex implementation
-            lines.append(f"# Dynamic universe (simplified to liquid stocks)")
-            lines.append(f"# TODO: Implement full coarse/fine universe selection")
-            default_symbols = ["SPY", "QQQ", "AAPL", "MSFT", "GOOGL", "AMZN", "NVDA", "META"]
-            symbols_str = ", ".join(f'"{s}"' for s in default_symbols)
-            lines.append(f"for ticker in [{symbols_str}]:")
-            lines.append(f"    equity = self.add_equity(ticker, Resolution.DAILY)")
-            lines.append(f"    self.symbols.append(equity.symbol)")
+            lines.extend(self._generate_dynamic_universe_lines(spec.universe.filters or UniverseFilters()))
 
         return "\n        ".join(lines)
 
+    def _generate_dynamic_universe_lines(self, filters: UniverseFilters) -> List[str]:
+        """
+        Coarse/fine universe setup for the template's dynamic-universe methods.
+
+        Coarse filters price and dollar volume (and index membership, from
+        the index ETF's constituents), fine filters the Morningstar sector.
+        Selection runs once per refresh period and is cached otherwise.
+
+        Raises:
+            ValueError: If the sector, index or refresh is unknown
+        """
+        sector_code = None
+        if filters.sector:
+            if filters.sector not in config.MORNINGSTAR_SECTOR_CODES:
+                raise ValueError(f"Unknown universe sector: {filters.sector}")
+            sector_code = config.MORNINGSTAR_SECTOR_CODES[filters.sector]
+        if filters.index and filters.index not in config.INDEX_ETFS:
+            raise ValueError(f"Unknown universe index: {filters.index}")
+        if filters.refresh not in config.UNIVERSE_REFRESH_OPTIONS:
+            raise ValueError(f"Unknown universe refresh: {filters.refresh}")
+
+        description = [f"price >= {filters.min_price}", f"dollar volume >= {filters.min_dollar_volume}"]
+        if filters.index:
+            description.append(f"{filters.index} member")
+        if filters.sector:
+            description.append(filters.sector)
+        # Fine selection narrows by sector, so coarse passes extra candidates
+        coarse_limit = filters.max_symbols
+        if sector_code is not None:
+            coarse_limit = f"{filters.max_symbols} * {config.UNIVERSE_FINE_CANDIDATES}"
+
+        lines = [
+            f"# Dynamic universe: {', '.join(description)};",
+            f"# top {filters.max_symbols} by dollar volume, reselected {filters.refresh}",
+            f"self.universe_settings.resolution = Resolution.DAILY",
+            f"self.universe_min_price = {filters.min_price}",
+            f"self.universe_min_dollar_volume = {filters.min_dollar_volume}",
+            f"self.universe_max_symbols = {filters.max_symbols}",
+            f"self.universe_coarse_limit = {coarse_limit}",
+            f"self.universe_sector_code = {sector_code}",
+            f"self.universe_index = {filters.index!r}",
+            f"self.universe_refresh = {filters.refresh!r}",
+            f"self.universe_refresh_key = None  # Period of the cached selection",
+            f"self.index_members = None",
+            f"self.coarse_rank = {{}}",
+            f"self.universe_deferred_removals = set()  # Removed while invested",
+            f"# Anchor for scheduled events and the benchmark (not traded)",
+            f'self.universe_anchor = self.add_equity("SPY", Resolution.DAILY).symbol',
+        ]
+        if filters.index:
+            etf = config.INDEX_ETFS[filters.index]
+            lines.append(
+                f'self.add_universe(self.universe.etf("{etf}", self.universe_settings, self.select_index_members))'
+            )
+        if sector_code is not None:
+            lines.append(f"self.add_universe(self.select_coarse, self.select_fine)")
+        else:
+            lines.append(f"self.add_universe(self.select_coarse)")
+        return lines
+
     def _generate_indicator_code(self, spec: StrategySpec) -> str:
-        """Generate indicator initialization code"""
+        """Generate the body of _add_indicators (indicators for one symbol)"""
         lines = []
 
         for ind in spec.indicators:
             lines.append(f"# Indicator: {ind.name} ({ind.type})")
-            lines.append(f"for symbol in self.symbols:")
-            lines.append(f"    if symbol not in self.indicators:")
-            lines.append(f"        self.indicators[symbol] = {{}}")
 
             qc_class = config.INDICATOR_MAPPING.get(ind.type, ind.type)
 
             # Build parameters
             if ind.type == "SMA":
                 period = ind.params.get("period", 20)
-                lines.append(f"    self.indicators[symbol]['{ind.name}'] = self.sma(symbol, {period}, Resolution.DAILY)")
+                lines.append(f"self.indicators[symbol]['{ind.name}'] = self.sma(symbol, {period}, Resolution.DAILY)")
 
             elif ind.type == "EMA":
                 period = ind.params.get("period", 20)
-                lines.append(f"    self.indicators[symbol]['{ind.name}'] = self.ema(symbol, {period}, Resolution.DAILY)")
+                lines.append(f"self.indicators[symbol]['{ind.name}'] = self.ema(symbol, {period}, Resolution.DAILY)")
 
             elif ind.type == "RSI":
                 period = ind.params.get("period", 14)
                 # RSI requires: symbol, period, MovingAverageType, resolution
-                lines.append(f"    self.indicators[symbol]['{ind.name}'] = self.rsi(symbol, {period}, MovingAverageType.WILDERS, Resolution.DAILY)")
+                lines.append(f"self.indicators[symbol]['{ind.name}'] = self.rsi(symbol, {period}, MovingAverageType.WILDERS, Resolution.DAILY)")
 
             elif ind.type == "MACD":
                 fast = ind.params.get("fast_period", 12)
                 slow = ind.params.get("slow_period", 26)
                 signal = ind.params.get("signal_period", 9)
-                lines.append(f"    self.indicators[symbol]['{ind.name}'] = self.macd(symbol, {fast}, {slow}, {signal}, Resolution.DAILY)")
+                lines.append(f"self.indicators[symbol]['{ind.name}'] = self.macd(symbol, {fast}, {slow}, {signal}, Resolution.DAILY)")
 
             elif ind.type == "ADX":
                 period = ind.params.get("period", 14)
                 # ADX shortcut: symbol, period, resolution
-                lines.append(f"    self.indicators[symbol]['{ind.name}'] = self.adx(symbol, {period})")
+                lines.append(f"self.indicators[symbol]['{ind.name}'] = self.adx(symbol, {period})")
 
             elif ind.type == "ATR":
                 period = ind.params.get("period", 14)
-                lines.append(f"    self.indicators[symbol]['{ind.name}'] = self.atr(symbol, {period}, Resolution.DAILY)")
+                lines.append(f"self.indicators[symbol]['{ind.name}'] = self.atr(symbol, {period}, Resolution.DAILY)")
 
             elif ind.type == "BB":
                 period = ind.params.get("period", 20)
                 k = ind.params.get("k", 2)
-                lines.append(f"    self.indicators[symbol]['{ind.name}'] = self.bb(symbol, {period}, {k}, Resolution.DAILY)")
+                lines.append(f"self.indicators[symbol]['{ind.name}'] = self.bb(symbol, {period}, {k}, Resolution.DAILY)")
 
             elif ind.type == "ROC":
                 period = ind.params.get("period", 14)
-                lines.append(f"    self.indicators[symbol]['{ind.name}'] = self.roc(symbol, {period}, Resolution.DAILY)")
+                lines.append(f"self.indicators[symbol]['{ind.name}'] = self.roc(symbol, {period}, Resolution.DAILY)")
 
             elif ind.type == "MOM":
                 period = ind.params.get("period", 14)
-                lines.append(f"    self.indicators[symbol]['{ind.name}'] = self.mom(symbol, {period}, Resolution.DAILY)")
+                lines.append(f"self.indicators[symbol]['{ind.name}'] = self.mom(symbol, {period}, Resolution.DAILY)")
 
             elif ind.type == "STOCH":
                 period = ind.params.get("period", 14)
                 k_period = ind.params.get("k_period", 3)
                 d_period = ind.params.get("d_period", 3)
-                lines.append(f"    self.indicators[symbol]['{ind.name}'] = self.sto(symbol, {period}, {k_period}, {d_period}, Resolution.DAILY)")
+                lines.append(f"self.indicators[symbol]['{ind.name}'] = self.sto(symbol, {period}, {k_period}, {d_period}, Resolution.DAILY)")
 
             else:
                 # Generic fallback
                 period = ind.params.get("period", 14)
-                lines.append(f"    # Unknown indicator type: {ind.type}")
-                lines.append(f"    # self.indicators[symbol]['{ind.name}'] = ...")
+                lines.append(f"# Unknown indicator type: {ind.type}")
+                lines.append(f"# self.indicators[symbol]['{ind.name}'] = ...")
 
             lines.append("")
 
@@ -246,7 +396,7 @@ class StrategyCompiler:
         op = cond.operator
 
         # Format right side
-        if isinstance(right, (int, float)):
+        if isinstance(right, (int, float, ParameterRef)):
             right_str = str(right)
         else:
             right_str = f'"{right}"'
@@ -258,7 +408,7 @@ class StrategyCompiler:
         else:
             # Standard comparison
             left_val = f'self._get_indicator_value(symbol, "{left}")'
-            if isinstance(right, (int, float)):
+            if isinstance(right, (int, float, ParameterRef)):
                 right_val = str(right)
             else:
                 right_val = f'self._get_indicator_value(symbol, "{right}")'
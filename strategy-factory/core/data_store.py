@@ -0,0 +1,358 @@
+"""
+Local OHLCV Data Store
+
+Columnar, memory-mapped store of daily bars for offline research:
+
+    {root}/
+        index.json          # symbol -> first/last date, row count
+        AAPL/
+            dates.npy       # datetime64[D]
+            open.npy        # float64
+            high.npy
+            low.npy
+            close.npy
+            volume.npy      # int64
+
+Each column is a contiguous .npy file opened with mmap_mode="r", so a
+date-range read is a binary search plus a zero-copy slice of the mapped
+file - no parsing. load() aligns symbols onto one calendar as the
+OHLCVData used by the local engine.
+
+Data is imported (OHLCVStore.import_lean, or
+`python core/data_store.py <LEAN data dir> [SYMBOL ...]`) from LEAN-format
+daily equity files
+(equity/usa/daily/{symbol}.zip containing "YYYYMMDD 00:00,open,high,low,
+close,volume" rows with prices x10000) or plain CSV files with a
+date,open,high,low,close,volume header.
+"""
+
+import os
+import io
+import csv
+import json
+import glob
+import zipfile
+from datetime import datetime
+from typing import Dict, List, Optional, Iterable, Tuple
+
+import numpy as np
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.local_engine import OHLCVData
+import config
+
+
+FIELDS = ("open", "high", "low", "close", "volume")
+LEAN_PRICE_SCALE = 10000.0
+
+
+class OHLCVStore:
+    """
+    Memory-mapped daily bar store.
+
+    Usage:
+        store = OHLCVStore()
+        store.import_lean("~/lean/Data")
+        bars = store.read("AAPL", "2020-01-01", "2024-12-31")   # zero-copy views
+        data = store.universe("faang_plus", "2020-01-01")       # OHLCVData
+    """
+
+    def __init__(self, root: str = None):
+        """
+        Args:
+            root: Store directory (default: config.LOCAL_DATA_DIR)
+        """
+        self.root = os.path.expanduser(root or config.LOCAL_DATA_DIR)
+        self._index_path = os.path.join(self.root, "index.json")
+        self._mapped: Dict[str, Dict[str, np.ndarray]] = {}
+        self.index: Dict[str, Dict[str, object]] = {}
+        if os.path.exists(self._index_path):
+            with open(self._index_path, 'r') as f:
+                self.index = json.load(f).get("symbols", {})
+
+    # -------------------------------------------------------------------------
+    # Reading
+    # -------------------------------------------------------------------------
+
+    def symbols(self) -> List[str]:
+        return sorted(self.index)
+
+    def has(self, symbol: str) -> bool:
+        return symbol.upper() in self.index
+
+    def _columns(self, symbol: str) -> Dict[str, np.ndarray]:
+        """Memory-mapped columns of a symbol (mapped once, then reused)"""
+        symbol = symbol.upper()
+        if symbol not in self._mapped:
+            if symbol not in self.index:
+                raise KeyError(f"No data for {symbol} in {self.root}")
+            directory = os.path.join(self.root, symbol)
+            self._mapped[symbol] = {
+                name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r")
+                for name in ("dates",) + FIELDS
+            }
+        return self._mapped[symbol]
+
+    def read(self, symbol: str, start: str = None, end: str = None) -> Dict[str, np.ndarray]:
+        """
+        Read a symbol's bars within [start, end].
+
+        Returns:
+            Dict of read-only views into the mapped files:
+            dates (datetime64[D]), open/high/low/close (float64), volume (int64)
+        """
+        columns = self._columns(symbol)
+        lo, hi = self._bounds(columns["dates"], start, end)
+        return {name: column[lo:hi] for name, column in columns.items()}
+
+    @staticmethod
+    def _bounds(dates: np.ndarray, start: Optional[str], end: Optional[str]) -> Tuple[int, int]:
+        lo = 0 if start is None else int(np.searchsorted(dates, np.datetime64(start, "D"), side="left"))
+        hi = len(dates) if end is None else int(np.searchsorted(dates, np.datetime64(end, "D"), side="right"))
+        return lo, hi
+
+    def load(self, symbols: Iterable[str] = None, start: str = None, end: str = None) -> OHLCVData:
+        """
+        Load symbols aligned onto the union of their trading dates.
+
+        Symbols without data (or without bars on a date) get NaN.
+
+        Args:
+            symbols: Symbols to load (default: all)
+            start: First date (YYYY-MM-DD, inclusive)
+            end: Last date (YYYY-MM-DD, inclusive)
+        """
+        symbols = [s.upper() for s in symbols] if symbols is not None else self.symbols()
+        reads = {s: self.read(s, start, end) for s in symbols if self.has(s)}
+
+        if reads:
+            dates = np.unique(np.concatenate([r["dates"] for r in reads.values()]))
+        else:
+            dates = np.array([], dtype="datetime64[D]")
+
+        out = {name: np.full((len(symbols), len(dates)), np.nan) for name in FIELDS}
+        for row, symbol in enumerate(symbols):
+            bars = reads.get(symbol)
+            if bars is None or not len(bars["dates"]):
+                continue
+            if len(bars["dates"]) == len(dates):
+                cols = slice(None)  # Same calendar: straight copy
+            else:
+                cols = np.searchsorted(dates, bars["dates"])
+            for name in FIELDS:
+                out[name][row, cols] = bars[name]
+
+        return OHLCVData(symbols=symbols, dates=dates, **out)
+
+    def universe(self, name: str, start: str = None, end: str = None) -> OHLCVData:
+        """Load one of config.STATIC_UNIVERSES"""
+        if name not in config.STATIC_UNIVERSES:
+            raise ValueError(f"Unknown universe: {name} (expected one of {list(config.STATIC_UNIVERSES)})")
+        return self.load(config.STATIC_UNIVERSES[name], start, end)
+
+    # -------------------------------------------------------------------------
+    # Writing
+    # -------------------------------------------------------------------------
+
+    def write(
+        self,
+        symbol: str,
+        dates: np.ndarray,
+        open: np.ndarray,
+        high: np.ndarray,
+        low: np.ndarray,
+        close: np.ndarray,
+        volume: np.ndarray,
+        merge: bool = True
+    ):
+        """
+        Store a symbol's bars.
+
+        Args:
+            merge: Combine with existing bars (new values win on shared
+                   dates) instead of replacing them
+        """
+        symbol = symbol.upper()
+        columns = {
+            "dates": np.asarray(dates, dtype="datetime64[D]"),
+            "open": np.asarray(open, dtype=np.float64),
+            "high": np.asarray(high, dtype=np.float64),
+            "low": np.asarray(low, dtype=np.float64),
+            "close": np.asarray(close, dtype=np.float64),
+            "volume": np.asarray(volume, dtype=np.int64),
+        }
+
+        if merge and symbol in self.index:
+            existing = {k: np.array(v) for k, v in self._columns(symbol).items()}
+            keep = ~np.isin(existing["dates"], columns["dates"])
+            columns = {k: np.concatenate([existing[k][keep], columns[k]]) for k in columns}
+
+        order = np.argsort(columns["dates"], kind="stable")
+        columns = {k: v[order] for k, v in columns.items()}
+
+        # Release any mapping of the old files before overwriting them
+        self._mapped.pop(symbol, None)
+        directory = os.path.join(self.root, symbol)
+        os.makedirs(directory, exist_ok=True)
+        for name, values in columns.items():
+            np.save(os.path.join(directory, f"{name}.npy"), np.ascontiguousarray(values))
+
+        dates = columns["dates"]
+        self.index[symbol] = {
+            "start": str(dates[0]) if len(dates) else None,
+            "end": str(dates[-1]) if len(dates) else None,
+            "rows": int(len(dates)),
+        }
+        self._save_index()
+
+    def write_ohlcv(self, data: OHLCVData, merge: bool = True):
+        """Store every symbol of an OHLCVData (NaN bars are dropped)"""
+        for row, symbol in enumerate(data.symbols):
+            valid = ~np.isnan(data.close[row])
+            self.write(
+                symbol, data.dates[valid],
+                data.open[row, valid], data.high[row, valid], data.low[row, valid],
+                data.close[row, valid], np.nan_to_num(data.volume[row, valid]),
+                merge=merge,
+            )
+
+    def _save_index(self):
+        os.makedirs(self.root, exist_ok=True)
+        with open(self._index_path, 'w') as f:
+            json.dump({"version": 1, "symbols": self.index}, f, indent=2, sort_keys=True)
+
+    # -------------------------------------------------------------------------
+    # Importing
+    # -------------------------------------------------------------------------
+
+    def import_lean(self, path: str, symbols: Iterable[str] = None) -> Dict[str, int]:
+        """
+        Import daily bars from LEAN-format zip or CSV files.
+
+        Args:
+            path: A LEAN data root (containing equity/usa/daily), a
+                  directory of {symbol}.zip / {symbol}.csv files, or one file
+            symbols: Only import these symbols (default: all found)
+
+        Returns:
+            Dict mapping symbol to number of bars imported
+        """
+        path = os.path.expanduser(path)
+        if os.path.isdir(os.path.join(path, "equity", "usa", "daily")):
+            path = os.path.join(path, "equity", "usa", "daily")
+
+        if os.path.isdir(path):
+            files = sorted(glob.glob(os.path.join(path, "*.zip")) + glob.glob(os.path.join(path, "*.csv")))
+        else:
+            files = [path]
+
+        wanted = {s.upper() for s in symbols} if symbols is not None else None
+        imported = {}
+        for filepath in files:
+            symbol = os.path.splitext(os.path.basename(filepath))[0].upper()
+            if wanted is not None and symbol not in wanted:
+                continue
+            bars = read_bar_file(filepath)
+            if bars is None:
+                print(f"  Skipping {filepath}: no daily bars found")
+                continue
+            self.write(symbol, *bars)
+            imported[symbol] = len(bars[0])
+        return imported
+
+
+def read_bar_file(filepath: str) -> Optional[Tuple[np.ndarray, ...]]:
+    """
+    Parse a LEAN daily zip/CSV or a plain OHLCV CSV.
+
+    Returns:
+        (dates, open, high, low, close, volume) arrays, or None if empty
+    """
+    if filepath.endswith(".zip"):
+        with zipfile.ZipFile(filepath) as archive:
+            names = [n for n in archive.namelist() if n.endswith(".csv")]
+            if not names:
+                return None
+            text = archive.read(names[0]).decode()
+    else:
+        with open(filepath, 'r') as f:
+            text = f.read()
+
+    rows = [r for r in csv.reader(io.StringIO(text)) if r]
+    if not rows:
+        return None
+
+    header = [h.strip().lower() for h in rows[0]]
+    if "close" in header:
+        # Plain CSV with a header: prices as-is
+        cols = [header.index(name) for name in ("date",) + FIELDS]
+        rows = [[r[i] for i in cols] for r in rows[1:]]
+        scale = 1.0
+    else:
+        # LEAN daily: "YYYYMMDD 00:00", prices in deci-cents
+        scale = LEAN_PRICE_SCALE
+
+    if not rows:
+        return None
+
+    dates = np.array([_parse_date(r[0]) for r in rows], dtype="datetime64[D]")
+    values = np.array([[float(x) for x in r[1:6]] for r in rows])
+    return (
+        dates,
+        values[:, 0] / scale,
+        values[:, 1] / scale,
+        values[:, 2] / scale,
+        values[:, 3] / scale,
+        values[:, 4].astype(np.int64),
+    )
+
+
+def _parse_date(text: str) -> str:
+    text = text.strip()
+    if len(text) >= 8 and text[:8].isdigit():
+        return f"{text[:4]}-{text[4:6]}-{text[6:8]}"
+    return datetime.strptime(text[:10], "%Y-%m-%d").strftime("%Y-%m-%d")
+
+
+# =============================================================================
+# TESTING
+# =============================================================================
+
+if __name__ == "__main__" and len(sys.argv) > 1:
+    # python core/data_store.py <LEAN data dir or file> [SYMBOL ...]
+    store = OHLCVStore()
+    counts = store.import_lean(sys.argv[1], sys.argv[2:] or None)
+    print(f"Imported {len(counts)} symbols ({sum(counts.values())} bars) into {store.root}")
+
+elif __name__ == "__main__":
+    import time
+    import tempfile
+    from core.local_engine import generate_synthetic_ohlcv
+
+    print("Testing OHLCV Store...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Write a LEAN-format zip
+        lean_dir = os.path.join(tmp, "lean", "equity", "usa", "daily")
+        os.makedirs(lean_dir)
+        with zipfile.ZipFile(os.path.join(lean_dir, "spy.zip"), "w") as archive:
+            archive.writestr("spy.csv", "20240102 00:00,4729900,4737800,4700900,4722800,123456789\n"
+                                        "20240103 00:00,4704900,4712600,4685700,4688100,103585807\n")
+
+        store = OHLCVStore(os.path.join(tmp, "store"))
+        print(f"  Imported LEAN: {store.import_lean(os.path.join(tmp, 'lean'))}")
+        print(f"  SPY closes: {store.read('SPY')['close'].tolist()}")
+
+        universe = config.STATIC_UNIVERSES["faang_plus"]
+        store.write_ohlcv(generate_synthetic_ohlcv(universe, "2000-01-01", "2024-12-31"))
+
+        start = time.time()
+        data = store.universe("faang_plus", "2015-01-01", "2024-12-31")
+        print(f"  Loaded {data.close.shape} (symbols x days) in {(time.time() - start) * 1000:.1f}ms")
+
+        start = time.time()
+        bars = store.read("AAPL", "2020-01-01", "2020-12-31")
+        print(f"  Read AAPL 2020: {len(bars['close'])} bars in {(time.time() - start) * 1e6:.0f}us, "
+              f"memory-mapped: {isinstance(bars['close'].base, np.memmap) or isinstance(bars['close'], np.memmap)}")
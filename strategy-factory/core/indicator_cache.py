@@ -0,0 +1,151 @@
+"""
+Indicator Cache
+
+In-memory memoization of computed indicator arrays, shared by every spec
+a LocalEngine evaluates.
+
+Sweep variants usually differ in one or two parameters, so most of their
+indicators are identical. Entries are keyed by (symbols, indicator type,
+parameters with defaults filled in, source fields, first and last date),
+so each distinct indicator is computed once per data window. The least
+recently used arrays are evicted when the total size exceeds a byte
+budget.
+
+Note that the key includes the first (warm-up) date: recursive
+indicators depend on where computation starts, so variants whose longest
+indicator period differs get different warm-up windows and do not share
+entries.
+"""
+
+import os
+from collections import OrderedDict
+from typing import Dict, Any, Callable, Hashable, Tuple
+
+import numpy as np
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import indicators
+import config
+
+
+def indicator_key(ind_type: str, params: Dict[str, Any], bars) -> Tuple[Hashable, ...]:
+    """
+    Cache key for an indicator computed over a set of bars.
+
+    Args:
+        ind_type: Indicator type (key of config.INDICATOR_MAPPING)
+        params: Indicator parameters (missing values keyed as their defaults)
+        bars: OHLCVData the indicator is computed on
+
+    Returns:
+        Hashable key
+    """
+    params = indicators.indicator_params(ind_type, params)
+    cls = indicators.STREAMING_INDICATORS.get(ind_type)
+    fields = cls.inputs if cls else ("close",)
+    dates = (str(bars.dates[0]), str(bars.dates[-1])) if len(bars.dates) else (None, None)
+    return (
+        tuple(bars.symbols),
+        ind_type,
+        tuple(sorted((k, float(v)) for k, v in params.items())),
+        fields,
+    ) + dates
+
+
+class IndicatorCache:
+    """
+    LRU cache of indicator arrays under a memory budget.
+
+    Usage:
+        cache = IndicatorCache()
+        values = cache.get_or_compute(indicator_key(t, params, bars), lambda: compute(...))
+
+    Cached arrays are made read-only, since they are shared between specs.
+    """
+
+    def __init__(self, max_bytes: int = None):
+        """
+        Args:
+            max_bytes: Total size budget for cached arrays (default from config)
+        """
+        self.max_bytes = max_bytes or config.INDICATOR_CACHE_MAX_BYTES
+        self._entries: "OrderedDict[Hashable, np.ndarray]" = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], np.ndarray]) -> np.ndarray:
+        """Return the cached array for key, computing and storing it on a miss"""
+        values = self._entries.get(key)
+        if values is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return values
+
+        self.misses += 1
+        values = compute()
+        values.flags.writeable = False
+        if values.nbytes <= self.max_bytes:
+            self._entries[key] = values
+            self.nbytes += values.nbytes
+            self._evict()
+        return values
+
+    def _evict(self):
+        while self.nbytes > self.max_bytes and self._entries:
+            _, values = self._entries.popitem(last=False)
+            self.nbytes -= values.nbytes
+            self.evictions += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self):
+        """Remove all entries"""
+        self._entries.clear()
+        self.nbytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache size and hit statistics"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.nbytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+# =============================================================================
+# TESTING
+# =============================================================================
+
+if __name__ == "__main__":
+    import time
+    from core.local_engine import LocalEngine, generate_synthetic_ohlcv
+    from models.strategy_spec import create_example_momentum_strategy
+    from generators.param_sweeper import ParameterSweeper
+
+    print("Testing Indicator Cache...")
+
+    base = create_example_momentum_strategy()
+    data = generate_synthetic_ohlcv(base.universe.symbols or ["SPY", "QQQ", "AAPL", "MSFT"])
+    variants = ParameterSweeper(max_combinations=50).sweep(base)
+
+    for label, cache in (("without cache", IndicatorCache(max_bytes=1)), ("with cache", IndicatorCache())):
+        engine = LocalEngine(data, indicator_cache=cache)
+        start = time.time()
+        engine.run_many(variants)
+        stats = cache.stats()
+        print(f"  {len(variants)} variants {label}: {time.time() - start:.2f}s, "
+              f"{stats['misses']} computed, {stats['hits']} reused, {stats['bytes'] / 1e6:.1f} MB")
+
+    cache = IndicatorCache(max_bytes=3 * 8 * 100)
+    for i in range(5):
+        cache.get_or_compute(i, lambda: np.zeros(100))
+    print(f"  LRU under budget: {len(cache)} entries, {cache.stats()['evictions']} evicted")
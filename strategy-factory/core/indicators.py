@@ -0,0 +1,708 @@
+"""
+Indicator Library
+
+NumPy implementations of every indicator in config.INDICATOR_MAPPING,
+following LEAN's definitions (and its readiness rules), in two forms:
+
+- Batch: functions over (symbols x time) arrays, NaN until the indicator
+  is ready. Used by the local engine to compute whole histories at once.
+- Streaming: classes named after the LEAN indicators, updated one bar at a
+  time for a vector of symbols. Each update is O(1) per symbol (Stochastic's
+  window high/low is O(period)), so live-style signal code does not
+  recompute history.
+
+Both forms produce the same numbers for the same bars. The LEAN semantics
+they follow:
+- EMA, RSI, ATR and ADX averages are seeded with the SMA of their first
+  `period` inputs, then updated recursively (EMA alpha 2/(n+1), Wilder 1/n)
+- RSI, ADX and the directional movement start at the second bar
+- WMA weights are 1..period, newest highest
+- BB middle band is the SMA, bands use the population standard deviation
+- ROC is a fraction ((close - past) / past), MOM a price difference
+- Stochastic's value is fast %K; it is ready once slow %D is
+- OBV starts at the first bar's volume
+- VWAP is a rolling volume-weighted mean of (open + high + low + close) / 4
+
+Batch functions expect gap-free rows (see the local engine's
+_rowwise_on_valid); streaming indicators skip a symbol's update when any
+of its inputs is NaN and carry the last value, like LEAN does when a
+symbol has no data.
+"""
+
+import os
+from typing import Dict, Any, Tuple
+
+import numpy as np
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+
+
+# =============================================================================
+# BATCH (rows = symbols, NaN until ready)
+# =============================================================================
+
+def shift(x: np.ndarray, n: int) -> np.ndarray:
+    """Values n bars ago (NaN for the first n bars)"""
+    out = np.full(x.shape, np.nan)
+    if n < x.shape[1]:
+        out[:, n:] = x[:, :-n]
+    return out
+
+
+def sma(x: np.ndarray, period: int) -> np.ndarray:
+    out = np.full(x.shape, np.nan)
+    if x.shape[1] < period:
+        return out
+    csum = np.cumsum(x, axis=1)
+    out[:, period - 1] = csum[:, period - 1]
+    out[:, period:] = csum[:, period:] - csum[:, :-period]
+    out[:, period - 1:] /= period
+    return out
+
+
+def recursive_average(x: np.ndarray, period: int, alpha: float, first: int = 0) -> np.ndarray:
+    """SMA-seeded recursive average (EMA / Wilder), starting at column `first`"""
+    out = np.full(x.shape, np.nan)
+    seed = first + period - 1
+    if x.shape[1] <= seed:
+        return out
+    out[:, seed] = x[:, first:seed + 1].mean(axis=1)
+    for t in range(seed + 1, x.shape[1]):
+        out[:, t] = out[:, t - 1] + alpha * (x[:, t] - out[:, t - 1])
+    return out
+
+
+def ema(x: np.ndarray, period: int, first: int = 0) -> np.ndarray:
+    return recursive_average(x, period, 2.0 / (period + 1), first)
+
+
+def wilder(x: np.ndarray, period: int, first: int = 0) -> np.ndarray:
+    return recursive_average(x, period, 1.0 / period, first)
+
+
+def wma(x: np.ndarray, period: int) -> np.ndarray:
+    out = np.full(x.shape, np.nan)
+    if x.shape[1] < period:
+        return out
+    weights = np.arange(1, period + 1, dtype=float)
+    windows = np.lib.stride_tricks.sliding_window_view(x, period, axis=1)
+    out[:, period - 1:] = windows @ weights / weights.sum()
+    return out
+
+
+def rsi(close: np.ndarray, period: int) -> np.ndarray:
+    change = np.diff(close, axis=1, prepend=np.nan)
+    gain = wilder(np.where(change > 0, change, 0.0), period, first=1)
+    loss = wilder(np.where(change < 0, -change, 0.0), period, first=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        value = 100.0 - 100.0 / (1.0 + gain / loss)
+    return np.where(loss == 0, np.where(np.isnan(gain), np.nan, 100.0), value)
+
+
+def macd(
+    close: np.ndarray,
+    fast_period: int = 12,
+    slow_period: int = 26,
+    signal_period: int = 9
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Returns:
+        (macd, signal, histogram), all NaN until the signal line is ready
+    """
+    line = ema(close, fast_period) - ema(close, slow_period)
+    signal = ema(line, signal_period, first=slow_period - 1)
+    ready_at = slow_period - 1 + signal_period - 1
+    line[:, :ready_at] = np.nan
+    return line, signal, line - signal
+
+
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    prev_close = shift(close, 1)
+    tr = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+    tr[:, 0] = high[:, 0] - low[:, 0]
+    return tr
+
+
+def atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int) -> np.ndarray:
+    return wilder(true_range(high, low, close), period)
+
+
+def adx(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int) -> np.ndarray:
+    up = high - shift(high, 1)
+    down = shift(low, 1) - low
+    plus_dm = np.where((up > down) & (up > 0), up, 0.0)
+    minus_dm = np.where((down > up) & (down > 0), down, 0.0)
+    tr_avg = wilder(true_range(high, low, close), period, first=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        plus_di = 100.0 * wilder(plus_dm, period, first=1) / tr_avg
+        minus_di = 100.0 * wilder(minus_dm, period, first=1) / tr_avg
+        dx = 100.0 * np.abs(plus_di - minus_di) / (plus_di + minus_di)
+    dx = np.where(np.isfinite(dx) | np.isnan(tr_avg), dx, 0.0)
+    return wilder(np.nan_to_num(dx), period, first=period)
+
+
+def bollinger_bands(close: np.ndarray, period: int = 20, k: float = 2) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Returns:
+        (middle, upper, lower)
+    """
+    middle = sma(close, period)
+    std = np.full(close.shape, np.nan)
+    if close.shape[1] >= period:
+        std[:, period - 1:] = np.lib.stride_tricks.sliding_window_view(close, period, axis=1).std(axis=2)
+    return middle, middle + k * std, middle - k * std
+
+
+def roc(close: np.ndarray, period: int) -> np.ndarray:
+    prev = shift(close, period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(prev != 0, (close - prev) / prev, np.where(np.isnan(prev), np.nan, 0.0))
+
+
+def momentum(close: np.ndarray, period: int) -> np.ndarray:
+    return close - shift(close, period)
+
+
+def stochastic(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    period: int = 14,
+    k_period: int = 3,
+    d_period: int = 3
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Returns:
+        (fast %K, slow %K, slow %D), all NaN until slow %D is ready
+    """
+    highest = np.full(high.shape, np.nan)
+    lowest = np.full(low.shape, np.nan)
+    if high.shape[1] >= period:
+        highest[:, period - 1:] = np.lib.stride_tricks.sliding_window_view(high, period, axis=1).max(axis=2)
+        lowest[:, period - 1:] = np.lib.stride_tricks.sliding_window_view(low, period, axis=1).min(axis=2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fast = np.where(highest > lowest, 100.0 * (close - lowest) / (highest - lowest), 0.0)
+    fast[np.isnan(highest)] = np.nan
+
+    slow_k = np.full(fast.shape, np.nan)
+    slow_d = np.full(fast.shape, np.nan)
+    slow_k[:, period - 1:] = sma(fast[:, period - 1:], k_period)
+    slow_d[:, period + k_period - 2:] = sma(slow_k[:, period + k_period - 2:], d_period)
+
+    ready_at = period - 1 + k_period - 1 + d_period - 1
+    for line in (fast, slow_k):
+        line[:, :ready_at] = np.nan
+    return fast, slow_k, slow_d
+
+
+def obv(close: np.ndarray, volume: np.ndarray) -> np.ndarray:
+    direction = np.sign(np.diff(close, axis=1, prepend=close[:, :1]))
+    flow = direction * volume
+    flow[:, 0] = volume[:, 0]
+    return np.cumsum(flow, axis=1)
+
+
+def vwap(
+    open: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    volume: np.ndarray,
+    period: int
+) -> np.ndarray:
+    price = (open + high + low + close) / 4.0
+    pv = sma(price * volume, period)
+    v = sma(volume, period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(v > 0, pv / v, np.where(np.isnan(v), np.nan, price))
+
+
+def indicator_params(ind_type: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    """An indicator's parameters with config.INDICATOR_DEFAULTS filled in"""
+    merged = dict(config.INDICATOR_DEFAULTS.get(ind_type, {}))
+    merged.update(params or {})
+    if ind_type == "VWAP":
+        merged.setdefault("period", 14)
+    return merged
+
+
+def compute(ind_type: str, params: Dict[str, Any], bars) -> np.ndarray:
+    """
+    Compute an indicator's current value (LEAN's Current.Value) for every bar.
+
+    Args:
+        ind_type: Key of config.INDICATOR_MAPPING
+        params: Indicator parameters (defaults from config.INDICATOR_DEFAULTS)
+        bars: Object with (N, T) open/high/low/close/volume arrays (OHLCVData)
+
+    Returns:
+        (N, T) array, NaN where the indicator is not ready
+    """
+    p = indicator_params(ind_type, params)
+    period = int(p.get("period", 14))
+    close = bars.close
+
+    if ind_type == "SMA":
+        return sma(close, period)
+    if ind_type == "EMA":
+        return ema(close, period)
+    if ind_type == "WMA":
+        return wma(close, period)
+    if ind_type == "RSI":
+        return rsi(close, period)
+    if ind_type == "MACD":
+        return macd(close, int(p["fast_period"]), int(p["slow_period"]), int(p["signal_period"]))[0]
+    if ind_type == "ADX":
+        return adx(bars.high, bars.low, close, period)
+    if ind_type == "ATR":
+        return atr(bars.high, bars.low, close, period)
+    if ind_type == "BB":
+        return bollinger_bands(close, period, float(p["k"]))[0]
+    if ind_type == "ROC":
+        return roc(close, period)
+    if ind_type == "MOM":
+        return momentum(close, period)
+    if ind_type == "STOCH":
+        return stochastic(bars.high, bars.low, close, period, int(p["k_period"]), int(p["d_period"]))[0]
+    if ind_type == "OBV":
+        return obv(close, bars.volume)
+    if ind_type == "VWAP":
+        return vwap(bars.open, bars.high, bars.low, close, bars.volume, period)
+    raise ValueError(f"Unknown indicator type: {ind_type}")
+
+
+# =============================================================================
+# STREAMING (one bar at a time, vectorized across symbols)
+# =============================================================================
+
+class _Window:
+    """Per-symbol ring buffer of the last `size` values"""
+
+    def __init__(self, n: int, size: int):
+        self.size = size
+        self.values = np.full((n, size), np.nan)
+        self.count = np.zeros(n, dtype=np.int64)
+
+    def push(self, valid: np.ndarray, x: np.ndarray) -> np.ndarray:
+        """Add x for valid rows; returns the evicted values (NaN while filling)"""
+        rows = np.flatnonzero(valid)
+        slots = self.count[rows] % self.size
+        evicted = np.full(len(self.count), np.nan)
+        evicted[rows] = self.values[rows, slots]
+        self.values[rows, slots] = x[rows]
+        self.count[rows] += 1
+        return evicted
+
+
+class StreamingIndicator:
+    """
+    Base class for streaming indicators over n symbols.
+
+    update() takes one bar's inputs (scalars or (n,) arrays) and returns
+    the (n,) current values, NaN until each symbol's indicator is ready.
+    update_bar() takes the full OHLCV bar, so indicators can be driven
+    uniformly.
+    """
+
+    inputs: Tuple[str, ...] = ("close",)
+
+    def __init__(self, n: int = 1):
+        self.n = n
+        self.samples = np.zeros(n, dtype=np.int64)
+        self.value = np.full(n, np.nan)
+
+    @property
+    def warm_up_period(self) -> int:
+        raise NotImplementedError
+
+    @property
+    def is_ready(self) -> np.ndarray:
+        return self.samples >= self.warm_up_period
+
+    def update(self, *values) -> np.ndarray:
+        arrays = [np.broadcast_to(np.asarray(v, dtype=np.float64), (self.n,)) for v in values]
+        valid = np.logical_and.reduce([np.isfinite(a) for a in arrays])
+        if not valid.any():
+            return self.value
+        self.samples += valid
+        with np.errstate(divide="ignore", invalid="ignore"):
+            current = self._step(valid, *arrays)
+        self.value = np.where(valid, np.where(self.is_ready, current, np.nan), self.value)
+        return self.value
+
+    def update_bar(self, open=None, high=None, low=None, close=None, volume=None) -> np.ndarray:
+        bar = {"open": open, "high": high, "low": low, "close": close, "volume": volume}
+        return self.update(*(bar[name] for name in self.inputs))
+
+    def _step(self, valid: np.ndarray, *values: np.ndarray) -> np.ndarray:
+        """Advance state for valid rows; return the new value for every row"""
+        raise NotImplementedError
+
+    @staticmethod
+    def _masked(valid: np.ndarray, x: np.ndarray) -> np.ndarray:
+        """x for valid rows, NaN elsewhere (so a child indicator skips them)"""
+        return np.where(valid, x, np.nan)
+
+
+class SimpleMovingAverage(StreamingIndicator):
+    def __init__(self, period: int, n: int = 1):
+        super().__init__(n)
+        self.period = period
+        self.window = _Window(n, period)
+        self.total = np.zeros(n)
+
+    @property
+    def warm_up_period(self) -> int:
+        return self.period
+
+    def _step(self, valid, x):
+        evicted = np.nan_to_num(self.window.push(valid, x))
+        self.total = np.where(valid, self.total + x - evicted, self.total)
+        return self.total / self.period
+
+
+class _RecursiveAverage(StreamingIndicator):
+    """SMA-seeded recursive average (EMA / Wilder)"""
+
+    def __init__(self, period: int, alpha: float, n: int = 1):
+        super().__init__(n)
+        self.period = period
+        self.alpha = alpha
+        self.total = np.zeros(n)
+
+    @property
+    def warm_up_period(self) -> int:
+        return self.period
+
+    def _step(self, valid, x):
+        filling = valid & (self.samples <= self.period)
+        self.total = np.where(filling, self.total + x, self.total)
+        seeded = np.where(self.samples == self.period, self.total / self.period, self.value)
+        return np.where(self.samples > self.period, self.value + self.alpha * (x - self.value), seeded)
+
+
+class ExponentialMovingAverage(_RecursiveAverage):
+    def __init__(self, period: int, n: int = 1):
+        super().__init__(period, 2.0 / (period + 1), n)
+
+
+class _WilderAverage(_RecursiveAverage):
+    def __init__(self, period: int, n: int = 1):
+        super().__init__(period, 1.0 / period, n)
+
+
+class WeightedMovingAverage(StreamingIndicator):
+    """Linear weights 1..period; the weighted sum is updated in O(1)"""
+
+    def __init__(self, period: int, n: int = 1):
+        super().__init__(n)
+        self.period = period
+        self.window = _Window(n, period)
+        self.total = np.zeros(n)
+        self.weighted = np.zeros(n)
+
+    @property
+    def warm_up_period(self) -> int:
+        return self.period
+
+    def _step(self, valid, x):
+        evicted = np.nan_to_num(self.window.push(valid, x))
+        # Every value in the window loses one weight, x enters with weight `period`
+        self.weighted = np.where(valid, self.weighted - self.total + self.period * x, self.weighted)
+        self.total = np.where(valid, self.total + x - evicted, self.total)
+        return self.weighted / (self.period * (self.period + 1) / 2.0)
+
+
+class RelativeStrengthIndex(StreamingIndicator):
+    def __init__(self, period: int, n: int = 1):
+        super().__init__(n)
+        self.period = period
+        self.prev = np.full(n, np.nan)
+        self.gain = _WilderAverage(period, n)
+        self.loss = _WilderAverage(period, n)
+
+    @property
+    def warm_up_period(self) -> int:
+        return self.period + 1
+
+    def _step(self, valid, close):
+        moved = valid & (self.samples > 1)
+        change = close - self.prev
+        self.prev = np.where(valid, close, self.prev)
+        gain = self.gain.update(self._masked(moved, np.where(change > 0, change, 0.0)))
+        loss = self.loss.update(self._masked(moved, np.where(change < 0, -change, 0.0)))
+        value = 100.0 - 100.0 / (1.0 + gain / loss)
+        return np.where(loss == 0, 100.0, value)
+
+
+class MovingAverageConvergenceDivergence(StreamingIndicator):
+    """value is the MACD line; signal and histogram are kept alongside"""
+
+    def __init__(self, fast_period: int = 12, slow_period: int = 26, signal_period: int = 9, n: int = 1):
+        super().__init__(n)
+        self.fast = ExponentialMovingAverage(fast_period, n)
+        self.slow = ExponentialMovingAverage(slow_period, n)
+        self.signal_line = ExponentialMovingAverage(signal_period, n)
+        self.signal = np.full(n, np.nan)
+        self.histogram = np.full(n, np.nan)
+
+    @property
+    def warm_up_period(self) -> int:
+        return self.slow.period + self.signal_line.period - 1
+
+    def _step(self, valid, close):
+        line = self.fast.update(self._masked(valid, close)) - self.slow.update(self._masked(valid, close))
+        signal = self.signal_line.update(self._masked(valid, line))
+        self.signal = np.where(valid, signal, self.signal)
+        self.histogram = np.where(valid, line - signal, self.histogram)
+        return line
+
+
+class AverageTrueRange(StreamingIndicator):
+    inputs = ("high", "low", "close")
+
+    def __init__(self, period: int, n: int = 1):
+        super().__init__(n)
+        self.prev_close = np.full(n, np.nan)
+        self.average = _WilderAverage(period, n)
+
+    @property
+    def warm_up_period(self) -> int:
+        return self.average.period
+
+    def _step(self, valid, high, low, close):
+        tr = np.fmax(high - low, np.fmax(np.abs(high - self.prev_close), np.abs(low - self.prev_close)))
+        self.prev_close = np.where(valid, close, self.prev_close)
+        return self.average.update(self._masked(valid, tr))
+
+
+class AverageDirectionalIndex(StreamingIndicator):
+    inputs = ("high", "low", "close")
+
+    def __init__(self, period: int, n: int = 1):
+        super().__init__(n)
+        self.period = period
+        self.prev_high = np.full(n, np.nan)
+        self.prev_low = np.full(n, np.nan)
+        self.prev_close = np.full(n, np.nan)
+        self.tr = _WilderAverage(period, n)
+        self.plus_dm = _WilderAverage(period, n)
+        self.minus_dm = _WilderAverage(period, n)
+        self.average = _WilderAverage(period, n)
+
+    @property
+    def warm_up_period(self) -> int:
+        return 2 * self.period
+
+    def _step(self, valid, high, low, close):
+        moved = valid & (self.samples > 1)
+        up = high - self.prev_high
+        down = self.prev_low - low
+        tr = np.fmax(high - low, np.fmax(np.abs(high - self.prev_close), np.abs(low - self.prev_close)))
+        self.prev_high = np.where(valid, high, self.prev_high)
+        self.prev_low = np.where(valid, low, self.prev_low)
+        self.prev_close = np.where(valid, close, self.prev_close)
+
+        tr_avg = self.tr.update(self._masked(moved, tr))
+        plus_di = 100.0 * self.plus_dm.update(self._masked(moved, np.where((up > down) & (up > 0), up, 0.0))) / tr_avg
+        minus_di = 100.0 * self.minus_dm.update(self._masked(moved, np.where((down > up) & (down > 0), down, 0.0))) / tr_avg
+        dx = 100.0 * np.abs(plus_di - minus_di) / (plus_di + minus_di)
+        dx = np.where(np.isfinite(dx), dx, 0.0)
+        return self.average.update(self._masked(moved & self.tr.is_ready, dx))
+
+
+class BollingerBands(StreamingIndicator):
+    """value is the middle band; upper, lower and std are kept alongside"""
+
+    def __init__(self, period: int = 20, k: float = 2, n: int = 1):
+        super().__init__(n)
+        self.period = period
+        self.k = k
+        self.window = _Window(n, period)
+        self.total = np.zeros(n)
+        self.total_sq = np.zeros(n)
+        self.upper = np.full(n, np.nan)
+        self.lower = np.full(n, np.nan)
+        self.std = np.full(n, np.nan)
+
+    @property
+    def warm_up_period(self) -> int:
+        return self.period
+
+    def _step(self, valid, close):
+        evicted = np.nan_to_num(self.window.push(valid, close))
+        self.total = np.where(valid, self.total + close - evicted, self.total)
+        self.total_sq = np.where(valid, self.total_sq + close ** 2 - evicted ** 2, self.total_sq)
+        middle = self.total / self.period
+        std = np.sqrt(np.maximum(self.total_sq / self.period - middle ** 2, 0.0))
+        ready = valid & (self.samples >= self.period)
+        self.std = np.where(ready, std, self.std)
+        self.upper = np.where(ready, middle + self.k * std, self.upper)
+        self.lower = np.where(ready, middle - self.k * std, self.lower)
+        return middle
+
+
+class RateOfChange(StreamingIndicator):
+    def __init__(self, period: int, n: int = 1):
+        super().__init__(n)
+        self.period = period
+        self.window = _Window(n, period)
+
+    @property
+    def warm_up_period(self) -> int:
+        return self.period + 1
+
+    def _step(self, valid, close):
+        past = self.window.push(valid, close)
+        return np.where(past != 0, (close - past) / past, 0.0)
+
+
+class Momentum(RateOfChange):
+    def _step(self, valid, close):
+        return close - self.window.push(valid, close)
+
+
+class Stochastic(StreamingIndicator):
+    """
+    value is fast %K; slow %K (stoch_k) and slow %D (stoch_d) are kept
+    alongside. The window high/low scan is O(period) per bar.
+    """
+    inputs = ("high", "low", "close")
+
+    def __init__(self, period: int = 14, k_period: int = 3, d_period: int = 3, n: int = 1):
+        super().__init__(n)
+        self.period = period
+        self.highs = _Window(n, period)
+        self.lows = _Window(n, period)
+        self.slow_k = SimpleMovingAverage(k_period, n)
+        self.slow_d = SimpleMovingAverage(d_period, n)
+        self.stoch_k = np.full(n, np.nan)
+        self.stoch_d = np.full(n, np.nan)
+
+    @property
+    def warm_up_period(self) -> int:
+        return self.period + self.slow_k.period + self.slow_d.period - 2
+
+    def _step(self, valid, high, low, close):
+        self.highs.push(valid, high)
+        self.lows.push(valid, low)
+        filled = valid & (self.samples >= self.period)
+        highest = self.highs.values.max(axis=1)
+        lowest = self.lows.values.min(axis=1)
+        fast = np.where(highest > lowest, 100.0 * (close - lowest) / (highest - lowest), 0.0)
+
+        slow_k = self.slow_k.update(self._masked(filled, fast))
+        slow_d = self.slow_d.update(self._masked(filled & self.slow_k.is_ready, slow_k))
+        ready = valid & (self.samples >= self.warm_up_period)
+        self.stoch_k = np.where(ready, slow_k, self.stoch_k)
+        self.stoch_d = np.where(ready, slow_d, self.stoch_d)
+        return fast
+
+
+class OnBalanceVolume(StreamingIndicator):
+    inputs = ("close", "volume")
+
+    def __init__(self, n: int = 1):
+        super().__init__(n)
+        self.prev = np.full(n, np.nan)
+        self.total = np.zeros(n)
+
+    @property
+    def warm_up_period(self) -> int:
+        return 1
+
+    def _step(self, valid, close, volume):
+        flow = np.where(np.isnan(self.prev), volume, np.sign(close - self.prev) * volume)
+        self.prev = np.where(valid, close, self.prev)
+        self.total = np.where(valid, self.total + flow, self.total)
+        return self.total
+
+
+class VolumeWeightedAveragePriceIndicator(StreamingIndicator):
+    inputs = ("open", "high", "low", "close", "volume")
+
+    def __init__(self, period: int = 14, n: int = 1):
+        super().__init__(n)
+        self.pv = SimpleMovingAverage(period, n)
+        self.volume = SimpleMovingAverage(period, n)
+
+    @property
+    def warm_up_period(self) -> int:
+        return self.pv.period
+
+    def _step(self, valid, open, high, low, close, volume):
+        price = (open + high + low + close) / 4.0
+        pv = self.pv.update(self._masked(valid, price * volume))
+        v = self.volume.update(self._masked(valid, volume))
+        return np.where(v > 0, pv / v, price)
+
+
+STREAMING_INDICATORS = {
+    "SMA": SimpleMovingAverage,
+    "EMA": ExponentialMovingAverage,
+    "WMA": WeightedMovingAverage,
+    "ADX": AverageDirectionalIndex,
+    "RSI": RelativeStrengthIndex,
+    "MACD": MovingAverageConvergenceDivergence,
+    "ROC": RateOfChange,
+    "MOM": Momentum,
+    "STOCH": Stochastic,
+    "ATR": AverageTrueRange,
+    "BB": BollingerBands,
+    "OBV": OnBalanceVolume,
+    "VWAP": VolumeWeightedAveragePriceIndicator,
+}
+
+
+def create_streaming(ind_type: str, params: Dict[str, Any] = None, n: int = 1) -> StreamingIndicator:
+    """Create a streaming indicator for n symbols from a spec's type and params"""
+    if ind_type not in STREAMING_INDICATORS:
+        raise ValueError(f"Unknown indicator type: {ind_type}")
+    kwargs = {k: (float(v) if k == "k" else int(v)) for k, v in indicator_params(ind_type, params).items()}
+    return STREAMING_INDICATORS[ind_type](n=n, **kwargs)
+
+
+# =============================================================================
+# TESTING
+# =============================================================================
+
+if __name__ == "__main__":
+    import time
+    from core.local_engine import generate_synthetic_ohlcv
+
+    print("Testing Indicator Library...")
+
+    bars = generate_synthetic_ohlcv([f"SYM{i}" for i in range(20)], start="2015-01-01")
+    print(f"  Bars: {bars.close.shape} (symbols x days)")
+
+    # Hand-checked LEAN reference values
+    c = np.array([[10.0, 11, 12, 11, 13, 14]])
+    assert np.allclose(sma(c, 3)[0, 2:], [11, 34 / 3, 12, 38 / 3])
+    assert np.allclose(wma(c, 3)[0, 2], (10 + 22 + 36) / 6)
+    assert np.allclose(ema(c, 3)[0, 3], 11 + 0.5 * (11 - 11))
+    assert np.allclose(roc(c, 2)[0, 2], 0.2) and momentum(c, 2)[0, 3] == 0
+    assert np.allclose(obv(c, np.full(c.shape, 100.0))[0], [100, 200, 300, 200, 300, 400])
+    print("  Reference values: OK")
+
+    for ind_type in config.INDICATOR_MAPPING:
+        params = {"period": 10} if ind_type not in ("MACD", "OBV") else {}
+
+        start = time.time()
+        batch = compute(ind_type, params, bars)
+        batch_time = time.time() - start
+
+        indicator = create_streaming(ind_type, params, n=len(bars.symbols))
+        streamed = np.full(bars.close.shape, np.nan)
+        start = time.time()
+        for t in range(bars.close.shape[1]):
+            streamed[:, t] = indicator.update_bar(
+                bars.open[:, t], bars.high[:, t], bars.low[:, t], bars.close[:, t], bars.volume[:, t]
+            )
+        stream_time = time.time() - start
+
+        match = np.allclose(batch, streamed, rtol=1e-7, atol=1e-7, equal_nan=True)
+        print(f"  {ind_type:5s} batch {batch_time * 1000:6.1f}ms, "
+              f"streaming {stream_time / bars.close.shape[1] * 1e6:5.1f}us/bar, match: {match}")
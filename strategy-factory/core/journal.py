@@ -0,0 +1,212 @@
+"""
+Run Journal
+
+Durable checkpoint of the cloud backtests of a pipeline run, so an
+interrupted run can be resumed (run_pipeline.py --resume) without paying
+for the same backtests again.
+
+Each backtest is journaled twice, keyed like the result cache (SHA-256 of
+the compiled code plus date range, see core/result_cache.py):
+- when it is created on QuantConnect: spec ID, project ID, backtest ID
+- when its result is collected: the BacktestResult and parsed metrics
+
+On resume, completed entries are reused as they are, and backtests that
+were started but never collected are re-attached (polled by backtest ID)
+instead of being started again.
+
+Unlike the result cache, the journal keeps failed backtests too (a
+runtime error costs as much as a success) and covers one run: a run
+without --resume starts a fresh journal.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import threading
+from dataclasses import asdict, replace
+from typing import Dict, Any, Optional, Tuple
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.runner import BacktestResult
+import config
+
+
+# Results that mean no backtest ran, or that it may still be running;
+# these are not journaled as completed
+UNJOURNALED_STATUSES = ("push_failed", "compile_failed", "backtest_start_failed",
+                        "rate_limited", "error", "timeout", "not_found")
+
+
+class RunJournal:
+    """
+    SQLite journal of started and completed backtests.
+
+    Usage:
+        journal = RunJournal()
+        journal.record_started(key, spec_id, project_id, backtest_id, name)
+        ...
+        journal.record_completed(key, result, metrics)
+
+        # After a restart
+        result = journal.completed(key, spec_id)
+        started = journal.started(key)   # (project_id, backtest_id, name)
+
+    Safe to call from worker threads.
+    """
+
+    def __init__(self, path: str = None):
+        """
+        Args:
+            path: SQLite file (default: config.RUN_JOURNAL_PATH)
+        """
+        self.path = path or config.RUN_JOURNAL_PATH
+        self.resumed = 0
+        self.reattached = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS backtests (
+                key TEXT PRIMARY KEY,
+                spec_id TEXT NOT NULL,
+                project_id INTEGER,
+                backtest_id TEXT,
+                backtest_name TEXT,
+                started_at REAL,
+                completed_at REAL,
+                result TEXT,
+                metrics TEXT
+            )
+        """)
+        self.conn.commit()
+
+    def reset(self):
+        """Start a new run (forget every journaled backtest)"""
+        with self._lock:
+            self.conn.execute("DELETE FROM backtests")
+            self.conn.commit()
+
+    def record_started(self, key: str, spec_id: str, project_id: int, backtest_id: str, backtest_name: str):
+        """Journal a backtest created on QuantConnect"""
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO backtests "
+                "(key, spec_id, project_id, backtest_id, backtest_name, started_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, spec_id, project_id, backtest_id, backtest_name, time.time())
+            )
+            self.conn.commit()
+
+    def record_completed(self, key: str, result: BacktestResult, metrics: Dict[str, Any] = None) -> bool:
+        """
+        Journal a collected result.
+
+        Results where no backtest ran (push or compile failures) are not
+        journaled, and a timed-out backtest stays "started" so a resumed
+        run re-attaches to it.
+
+        Returns:
+            True if journaled
+        """
+        if result.status in UNJOURNALED_STATUSES or not result.backtest_id:
+            return False
+        with self._lock:
+            self.conn.execute(
+                "INSERT INTO backtests (key, spec_id, backtest_id, backtest_name, completed_at, result, metrics) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET completed_at = excluded.completed_at, "
+                "result = excluded.result, metrics = excluded.metrics",
+                (key, result.strategy_id, result.backtest_id, result.name, time.time(),
+                 json.dumps(asdict(result)), json.dumps(metrics) if metrics is not None else None)
+            )
+            self.conn.commit()
+        return True
+
+    def completed(self, key: str, spec_id: str = None) -> Optional[BacktestResult]:
+        """
+        Journaled result for a key.
+
+        Args:
+            key: Cache key from make_cache_key
+            spec_id: If given, the returned result is relabeled with it
+
+        Returns:
+            BacktestResult, or None if not completed in this run
+        """
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT result FROM backtests WHERE key = ? AND result IS NOT NULL", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        self.resumed += 1
+        result = BacktestResult(**json.loads(row[0]))
+        return replace(result, strategy_id=spec_id) if spec_id else result
+
+    def started(self, key: str) -> Optional[Tuple[int, str, str]]:
+        """
+        A backtest started but not collected in this run.
+
+        Returns:
+            (project_id, backtest_id, backtest_name), or None
+        """
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT project_id, backtest_id, backtest_name FROM backtests "
+                "WHERE key = ? AND result IS NULL AND backtest_id IS NOT NULL", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        self.reattached += 1
+        return row
+
+    def stats(self) -> Dict[str, Any]:
+        """Journal size and resume statistics for this session"""
+        with self._lock:
+            completed, started = self.conn.execute(
+                "SELECT COUNT(result), COUNT(*) - COUNT(result) FROM backtests"
+            ).fetchone()
+        return {
+            "completed": completed,
+            "in_flight": started,
+            "resumed": self.resumed,
+            "reattached": self.reattached,
+        }
+
+    def close(self):
+        self.conn.close()
+
+
+# =============================================================================
+# TESTING
+# =============================================================================
+
+if __name__ == "__main__":
+    import tempfile
+
+    print("Testing Run Journal...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "journal.sqlite")
+        journal = RunJournal(path)
+        journal.record_started("k1", "spec1", 101, "bt1", "spec1_run")
+        journal.record_started("k2", "spec2", 102, "bt2", "spec2_run")
+        journal.record_completed("k1", BacktestResult(
+            backtest_id="bt1", strategy_id="spec1", name="spec1_run", status="completed",
+            success=True, error=None, statistics={"Sharpe Ratio": "1.2"}, raw_response={}
+        ), {"sharpe_ratio": 1.2})
+        journal.close()
+
+        # Simulated restart
+        journal = RunJournal(path)
+        print(f"  Completed k1: {journal.completed('k1', 'spec1b').strategy_id}")
+        print(f"  Re-attach k2: {journal.started('k2')}")
+        print(f"  Unknown k3: {journal.completed('k3')}, {journal.started('k3')}")
+        print(f"  Stats: {journal.stats()}")
+        journal.reset()
+        print(f"  After reset: {journal.stats()}")
+        journal.close()
@@ -0,0 +1,808 @@
+"""
+Local Backtest Engine
+
+Evaluates StrategySpecs locally against daily OHLCV arrays, without a
+QuantConnect cloud round-trip. Used to screen large numbers of specs so that
+only survivors are sent to the cloud for the authoritative backtest.
+
+Mirrors the semantics of templates/base_algorithm.py:
+- Signals generated at the close, filled at the next bar's open
+- Constant slippage (config.SLIPPAGE_PERCENT)
+- IBKR commissions ($0.005/share, $1 min, 0.5% of trade value max)
+- Price and 5-day dollar-volume filters on entry
+- Stop loss, take profit and max holding period exits
+- Indicator warmup (config.WARMUP_BUFFER_DAYS calendar days + longest period)
+
+Condition masks are computed fully vectorized over (symbols x time); the
+position state machine steps through time with array operations across
+all symbols (and across a batch of specs) at once. run_many evaluates
+same-structure specs (sweep variants) as one (variants x symbols x time)
+batch via core/batch_evaluator.py.
+
+Known differences from the cloud:
+- No buying-power leverage: entries are skipped when cash is insufficient
+- Orders submitted on the same open are funded in universe order
+- Statistics are computed with a zero risk-free rate
+- Dynamic universes trade every symbol in the local data (no coarse/fine
+  selection, sector or index filters)
+"""
+
+import os
+from typing import Dict, Any, List
+from dataclasses import dataclass
+
+import numpy as np
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.strategy_spec import StrategySpec, Condition, ConditionGroup, Operator, Logic
+from core.runner import BacktestResult
+from core import indicators
+from core.indicator_cache import IndicatorCache, indicator_key
+from core.batch_evaluator import BatchSignalEvaluator, group_by_structure
+import config
+
+
+TRADING_DAYS_PER_YEAR = 252
+
+# Stand-in symbols for a dynamic universe when no data is loaded yet
+DYNAMIC_UNIVERSE_FALLBACK = ["SPY", "QQQ", "AAPL", "MSFT", "GOOGL", "AMZN", "NVDA", "META"]
+
+PRICE_FIELDS = {
+    "price": "close",
+    "price.close": "close",
+    "price.open": "open",
+    "price.high": "high",
+    "price.low": "low",
+    "volume": "volume",
+}
+
+
+@dataclass
+class OHLCVData:
+    """
+    Daily bars for a set of symbols, laid out as (symbols x time) arrays.
+
+    Missing bars are NaN. All arrays share the same date axis.
+    """
+    symbols: List[str]
+    dates: np.ndarray  # datetime64[D], shape (T,)
+    open: np.ndarray   # shape (N, T)
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    def field(self, name: str) -> np.ndarray:
+        """Get a price field array by name (open, high, low, close, volume)"""
+        if name not in ("open", "high", "low", "close", "volume"):
+            raise ValueError(f"Unknown price field: {name}")
+        return getattr(self, name)
+
+    def select(
+        self,
+        symbols: List[str] = None,
+        start: str = None,
+        end: str = None
+    ) -> "OHLCVData":
+        """
+        Slice the data by symbols and/or date range (inclusive).
+
+        Symbols not present in the data are returned as all-NaN rows so the
+        universe order is preserved.
+        """
+        col_mask = np.ones(len(self.dates), dtype=bool)
+        if start is not None:
+            col_mask &= self.dates >= np.datetime64(start, "D")
+        if end is not None:
+            col_mask &= self.dates <= np.datetime64(end, "D")
+
+        if symbols is None:
+            symbols = list(self.symbols)
+        index = {s: i for i, s in enumerate(self.symbols)}
+
+        def take(arr: np.ndarray) -> np.ndarray:
+            out = np.full((len(symbols), int(col_mask.sum())), np.nan)
+            for row, symbol in enumerate(symbols):
+                if symbol in index:
+                    out[row] = arr[index[symbol], col_mask]
+            return out
+
+        return OHLCVData(
+            symbols=list(symbols),
+            dates=self.dates[col_mask],
+            open=take(self.open),
+            high=take(self.high),
+            low=take(self.low),
+            close=take(self.close),
+            volume=take(self.volume),
+        )
+
+    def save_npz(self, filepath: str) -> str:
+        """Save to a compressed .npz file"""
+        os.makedirs(os.path.dirname(os.path.abspath(filepath)), exist_ok=True)
+        np.savez_compressed(
+            filepath,
+            symbols=np.array(self.symbols),
+            dates=self.dates.astype("datetime64[D]").astype(np.int64),
+            open=self.open, high=self.high, low=self.low,
+            close=self.close, volume=self.volume,
+        )
+        return filepath
+
+    @classmethod
+    def load_npz(cls, filepath: str) -> "OHLCVData":
+        """Load from a .npz file written by save_npz"""
+        with np.load(filepath) as data:
+            return cls(
+                symbols=[str(s) for s in data["symbols"]],
+                dates=data["dates"].astype("datetime64[D]"),
+                open=data["open"], high=data["high"], low=data["low"],
+                close=data["close"], volume=data["volume"],
+            )
+
+
+# =============================================================================
+# INDICATORS (batch, rows = symbols, NaN until ready; see core/indicators.py)
+# =============================================================================
+
+# Indicator types the compiler generates code for
+COMPILED_INDICATORS = {"SMA", "EMA", "RSI", "MACD", "ADX", "ATR", "BB", "ROC", "MOM", "STOCH"}
+
+
+def compute_indicator(ind_type: str, params: Dict[str, Any], bars: OHLCVData) -> np.ndarray:
+    """
+    Compute an indicator's current value for every bar.
+
+    Returns an (N, T) array, NaN where the indicator is not ready. Types the
+    compiler does not generate code for evaluate to 0.0 (matching the
+    template's _get_indicator_value fallback).
+    """
+    if ind_type not in COMPILED_INDICATORS:
+        return np.zeros(bars.close.shape)
+    return indicators.compute(ind_type, params, bars)
+
+
+def _rowwise_on_valid(fn, bars: OHLCVData) -> np.ndarray:
+    """
+    Apply an indicator function to each symbol's own bars only.
+
+    LEAN only updates indicators when a symbol has data, so gaps are
+    compacted out before computing and values are carried forward after.
+    """
+    missing = np.isnan(bars.close)
+    if not missing.any():
+        return fn(bars)
+
+    out = np.full(bars.close.shape, np.nan)
+    for row in range(len(bars.symbols)):
+        keep = ~missing[row]
+        if not keep.any():
+            continue
+        sub = OHLCVData(
+            symbols=[bars.symbols[row]],
+            dates=bars.dates[keep],
+            open=bars.open[row:row + 1, keep], high=bars.high[row:row + 1, keep],
+            low=bars.low[row:row + 1, keep], close=bars.close[row:row + 1, keep],
+            volume=bars.volume[row:row + 1, keep],
+        )
+        out[row, keep] = fn(sub)[0]
+    return _ffill(out, missing)
+
+
+def _ffill(x: np.ndarray, gaps: np.ndarray = None) -> np.ndarray:
+    """Forward-fill NaNs along the time axis (only at `gaps` if given)"""
+    if gaps is None:
+        gaps = np.isnan(x)
+    idx = np.where(~gaps, np.arange(x.shape[1]), 0)
+    np.maximum.accumulate(idx, axis=1, out=idx)
+    return np.take_along_axis(x, idx, axis=1)
+
+
+# =============================================================================
+# ENGINE
+# =============================================================================
+
+class LocalEngine:
+    """
+    Vectorized local backtester for StrategySpecs.
+
+    Produces BacktestResults whose raw_response mimics the QC API
+    (statistics keyed and formatted like QC), so ResultsParser and the rest
+    of the pipeline consume local and cloud results identically.
+    """
+
+    def __init__(self, data: OHLCVData, initial_capital: float = None, indicator_cache: IndicatorCache = None):
+        """
+        Args:
+            data: OHLCV arrays covering the universes and dates to evaluate
+            initial_capital: Starting cash (default from config)
+            indicator_cache: Indicator arrays shared across specs
+                             (default: a new IndicatorCache)
+        """
+        self.data = data
+        self.initial_capital = initial_capital or config.DEFAULT_INITIAL_CAPITAL
+        self.indicator_cache = indicator_cache if indicator_cache is not None else IndicatorCache()
+
+    def run(
+        self,
+        spec: StrategySpec,
+        start_date: str = None,
+        end_date: str = None,
+    ) -> BacktestResult:
+        """
+        Backtest a single strategy spec.
+
+        Args:
+            spec: The strategy specification
+            start_date: Override start date (YYYY-MM-DD)
+            end_date: Override end date (YYYY-MM-DD)
+
+        Returns:
+            BacktestResult with QC-style statistics
+        """
+        errors = spec.validate()
+        if errors:
+            return self._failed(spec, f"Invalid strategy spec: {errors}")
+
+        if start_date is None:
+            start_date = config.DATE_RANGES[config.ACTIVE_DATE_RANGE]["full"][0]
+        if end_date is None:
+            end_date = config.DATE_RANGES[config.ACTIVE_DATE_RANGE]["full"][1]
+
+        warmup_days = spec.get_max_indicator_period() + config.WARMUP_BUFFER_DAYS
+        warmup_start = str(np.datetime64(start_date, "D") - np.timedelta64(warmup_days, "D"))
+        bars = self.data.select(self._universe(spec, self.data), warmup_start, end_date)
+
+        start_idx = int(np.searchsorted(bars.dates, np.datetime64(start_date, "D")))
+        if start_idx >= len(bars.dates) or np.isnan(bars.close).all():
+            return self._failed(spec, "No data for universe in backtest period")
+
+        values = self._indicator_values(spec, bars)
+        entry = self._evaluate_group(spec.entry_conditions, bars, values)
+        exit_ = self._evaluate_group(spec.exit_conditions, bars, values)
+        valid = self._valid(bars, values)
+
+        risk = spec.risk_management
+        sim = self._simulate(
+            entry[None], exit_[None], valid[None], bars, start_idx,
+            position_size=np.array([risk.position_size_dollars], dtype=float),
+            stop_loss=np.array([risk.stop_loss_pct or np.nan], dtype=float),
+            take_profit=np.array([risk.take_profit_pct or np.nan], dtype=float),
+            max_holding=np.array([risk.max_holding_days or np.nan], dtype=float),
+        )
+
+        statistics = self._compute_statistics(
+            equity=sim["equity"][0],
+            benchmark=_ffill(bars.close[0:1, start_idx:])[0],
+            trade_pnls=sim["trade_pnls"][0],
+            trade_returns=sim["trade_returns"][0],
+            orders=int(sim["orders"][0]),
+        )
+        return self._completed(spec, statistics, bars.dates[start_idx], bars.dates[-1])
+
+    def run_many(
+        self,
+        specs: List[StrategySpec],
+        start_date: str = None,
+        end_date: str = None,
+    ) -> Dict[str, BacktestResult]:
+        """
+        Backtest several specs, keyed by spec ID.
+
+        Specs sharing a structure (e.g. sweep variants) are evaluated
+        together with run_family.
+        """
+        results = {}
+        for family in group_by_structure(specs):
+            if len(family) == 1:
+                results[family[0].id] = self.run(family[0], start_date, end_date)
+            else:
+                results.update(self.run_family(family, start_date, end_date))
+        return {spec.id: results[spec.id] for spec in specs}
+
+    def run_family(
+        self,
+        specs: List[StrategySpec],
+        start_date: str = None,
+        end_date: str = None,
+    ) -> Dict[str, BacktestResult]:
+        """
+        Backtest specs sharing a structure (batch_evaluator.structure_key)
+        in one pass.
+
+        Signals for all variants are evaluated as (V, N, T) tensors by a
+        BatchSignalEvaluator and the position state machine steps every
+        variant at once. Each variant keeps its own indicator warm-up
+        window (computed on the tail of the family's bars), so results
+        match running the specs one at a time.
+
+        Returns:
+            Dict mapping spec ID to BacktestResult
+        """
+        results = {}
+        family = []
+        for spec in specs:
+            errors = spec.validate()
+            if errors:
+                results[spec.id] = self._failed(spec, f"Invalid strategy spec: {errors}")
+            else:
+                family.append(spec)
+        if not family:
+            return results
+
+        if start_date is None:
+            start_date = config.DATE_RANGES[config.ACTIVE_DATE_RANGE]["full"][0]
+        if end_date is None:
+            end_date = config.DATE_RANGES[config.ACTIVE_DATE_RANGE]["full"][1]
+
+        warmup_starts = [
+            np.datetime64(start_date, "D") - np.timedelta64(spec.get_max_indicator_period() + config.WARMUP_BUFFER_DAYS, "D")
+            for spec in family
+        ]
+        bars = self.data.select(self._universe(family[0], self.data), str(min(warmup_starts)), end_date)
+
+        start_idx = int(np.searchsorted(bars.dates, np.datetime64(start_date, "D")))
+        if start_idx >= len(bars.dates) or np.isnan(bars.close).all():
+            results.update({spec.id: self._failed(spec, "No data for universe in backtest period") for spec in family})
+            return results
+
+        # Stack each variant's indicators (and the price operands, forward
+        # filled within its window) at the tail of the family's date axis
+        V, (N, T) = len(family), bars.close.shape
+        values = {ind.name: np.full((V, N, T), np.nan) for ind in family[0].indicators}
+        prices = {name: np.full((V, N, T), np.nan) for name in PRICE_FIELDS}
+        valid = np.zeros((V, N, T), dtype=bool)
+        windows: Dict[int, OHLCVData] = {}
+
+        for v, (spec, first) in enumerate(zip(family, warmup_starts)):
+            offset = int(np.searchsorted(bars.dates, first))
+            if offset not in windows:
+                windows[offset] = self._tail(bars, offset)
+            own = windows[offset]
+            own_values = self._indicator_values(spec, own)
+            for name, arr in own_values.items():
+                values[name][v, :, offset:] = arr
+            for name, field in PRICE_FIELDS.items():
+                prices[name][v, :, offset:] = _ffill(own.field(field))
+            valid[v, :, offset:] = self._valid(own, own_values)
+
+        entry, exit_ = BatchSignalEvaluator(family).evaluate(prices, values)
+
+        risks = [spec.risk_management for spec in family]
+        sim = self._simulate(
+            entry, exit_, valid, bars, start_idx,
+            position_size=np.array([r.position_size_dollars for r in risks], dtype=float),
+            stop_loss=np.array([r.stop_loss_pct or np.nan for r in risks], dtype=float),
+            take_profit=np.array([r.take_profit_pct or np.nan for r in risks], dtype=float),
+            max_holding=np.array([r.max_holding_days or np.nan for r in risks], dtype=float),
+        )
+
+        benchmark = _ffill(bars.close[0:1, start_idx:])[0]
+        for v, spec in enumerate(family):
+            statistics = self._compute_statistics(
+                equity=sim["equity"][v],
+                benchmark=benchmark,
+                trade_pnls=sim["trade_pnls"][v],
+                trade_returns=sim["trade_returns"][v],
+                orders=int(sim["orders"][v]),
+            )
+            results[spec.id] = self._completed(spec, statistics, bars.dates[start_idx], bars.dates[-1])
+        return results
+
+    @staticmethod
+    def _tail(bars: OHLCVData, offset: int) -> OHLCVData:
+        """Bars from column `offset` on (same as selecting from that date)"""
+        return OHLCVData(
+            symbols=bars.symbols, dates=bars.dates[offset:],
+            open=bars.open[:, offset:], high=bars.high[:, offset:], low=bars.low[:, offset:],
+            close=bars.close[:, offset:], volume=bars.volume[:, offset:],
+        )
+
+    @staticmethod
+    def _universe(spec: StrategySpec, data: OHLCVData = None) -> List[str]:
+        """
+        Symbols the compiled algorithm would trade.
+
+        Dynamic universes have no fundamentals locally, so every symbol of
+        `data` is a candidate and the per-entry liquidity filter does the
+        screening; without data (e.g. to generate synthetic bars), a fixed
+        set of liquid symbols stands in.
+        """
+        if spec.universe.symbols:
+            return list(spec.universe.symbols)
+        if data is not None:
+            return list(data.symbols)
+        return list(DYNAMIC_UNIVERSE_FALLBACK)
+
+    # -------------------------------------------------------------------------
+    # Signals
+    # -------------------------------------------------------------------------
+
+    def _indicator_values(self, spec: StrategySpec, bars: OHLCVData) -> Dict[str, np.ndarray]:
+        """A spec's indicators on bars, through the indicator cache"""
+        return {
+            ind.name: self.indicator_cache.get_or_compute(
+                indicator_key(ind.type, ind.params, bars),
+                lambda ind=ind: _rowwise_on_valid(
+                    lambda b: compute_indicator(ind.type, ind.params, b), bars
+                )
+            )
+            for ind in spec.indicators
+        }
+
+    @staticmethod
+    def _valid(bars: OHLCVData, values: Dict[str, np.ndarray]) -> np.ndarray:
+        """Bars where the symbol has traded and every indicator is ready"""
+        valid = ~np.isnan(_ffill(bars.close))
+        for arr in values.values():
+            valid &= ~np.isnan(arr)
+        return valid
+
+    def _operand(self, name: Any, bars: OHLCVData, values: Dict[str, np.ndarray]) -> Any:
+        """Resolve a condition operand to an (N, T) array or scalar"""
+        if isinstance(name, (int, float)):
+            return float(name)
+        if name in PRICE_FIELDS:
+            return _ffill(bars.field(PRICE_FIELDS[name]))
+        if name in values:
+            return values[name]
+        return 0.0
+
+    def _evaluate_condition(
+        self,
+        cond: Condition,
+        bars: OHLCVData,
+        values: Dict[str, np.ndarray]
+    ) -> np.ndarray:
+        """Evaluate one condition to an (N, T) boolean mask"""
+        shape = bars.close.shape
+        left = np.broadcast_to(self._operand(cond.left, bars, values), shape)
+        right = np.broadcast_to(self._operand(cond.right, bars, values), shape)
+        op = cond.operator
+
+        with np.errstate(invalid="ignore"):
+            if op in (Operator.CROSSES_ABOVE, Operator.CROSSES_BELOW):
+                # The template only stores previous values for "price" and
+                # indicator names, so any other operand never crosses.
+                if cond.left != "price" and cond.left not in values:
+                    return np.zeros(shape, dtype=bool)
+                if isinstance(cond.right, str) and cond.right != "price" and cond.right not in values:
+                    return np.zeros(shape, dtype=bool)
+                left_prev, right_prev = indicators.shift(left, 1), indicators.shift(right, 1)
+                if isinstance(cond.right, (int, float)):
+                    right_prev = right
+                if op == Operator.CROSSES_ABOVE:
+                    return (left_prev <= right_prev) & (left > right)
+                return (left_prev >= right_prev) & (left < right)
+
+            if op == Operator.GREATER_THAN:
+                return left > right
+            if op == Operator.LESS_THAN:
+                return left < right
+            if op == Operator.GREATER_EQUAL:
+                return left >= right
+            if op == Operator.LESS_EQUAL:
+                return left <= right
+            if op == Operator.EQUALS:
+                return left == right
+        raise ValueError(f"Unsupported operator: {op}")
+
+    def _evaluate_group(
+        self,
+        group: ConditionGroup,
+        bars: OHLCVData,
+        values: Dict[str, np.ndarray]
+    ) -> np.ndarray:
+        """Combine a condition group's masks with AND/OR"""
+        if not group.conditions:
+            return np.zeros(bars.close.shape, dtype=bool)
+        masks = [self._evaluate_condition(c, bars, values) for c in group.conditions]
+        if group.logic == Logic.AND:
+            return np.logical_and.reduce(masks)
+        return np.logical_or.reduce(masks)
+
+    # -------------------------------------------------------------------------
+    # Execution
+    # -------------------------------------------------------------------------
+
+    @staticmethod
+    def _fees(shares: np.ndarray, value: np.ndarray) -> np.ndarray:
+        """IBKR fee model: per-share with a minimum, capped at a % of value"""
+        fee = np.maximum(shares * config.COMMISSION_PER_SHARE, config.COMMISSION_MIN)
+        return np.minimum(fee, value * config.COMMISSION_MAX_PCT)
+
+    def _simulate(
+        self,
+        entry: np.ndarray,
+        exit_: np.ndarray,
+        valid: np.ndarray,
+        bars: OHLCVData,
+        start_idx: int,
+        position_size: np.ndarray,
+        stop_loss: np.ndarray,
+        take_profit: np.ndarray,
+        max_holding: np.ndarray,
+    ) -> Dict[str, Any]:
+        """
+        Step the order/position state machine through time.
+
+        Signal masks are (B, N, T) for a batch of B specs sharing the same
+        bars; risk parameters are (B,) arrays (NaN = disabled).
+
+        Returns:
+            Dict with equity (B, T - start_idx), orders (B,), and per-spec
+            lists of closed-trade P&L and returns
+        """
+        B, N, T = entry.shape
+        slip = config.SLIPPAGE_PERCENT
+
+        close = _ffill(bars.close)
+        # Fill at the open; fall back to the last close when the bar is missing
+        fill_price = np.where(np.isnan(bars.open), indicators.shift(close, 1), bars.open)
+        day = bars.dates.astype("datetime64[D]").astype(np.int64)
+
+        # Liquidity filter: price at the open and 5-day average dollar volume
+        # from the bars completed before the open (template's rolling window)
+        avg_dollar_volume = indicators.shift(
+            indicators.sma(np.nan_to_num(bars.volume), 5) * indicators.sma(np.nan_to_num(bars.close), 5), 1
+        )
+        with np.errstate(invalid="ignore"):
+            tradable = (fill_price >= config.MIN_PRICE) & (avg_dollar_volume >= config.MIN_DOLLAR_VOLUME)
+
+        cash = np.full(B, float(self.initial_capital))
+        shares = np.zeros((B, N))
+        entry_price = np.zeros((B, N))
+        entry_day = np.zeros((B, N), dtype=np.int64)
+        cost_basis = np.zeros((B, N))
+        pending_entry = np.zeros((B, N), dtype=bool)
+        pending_exit = np.zeros((B, N), dtype=bool)
+
+        equity = np.empty((B, T - start_idx))
+        orders = np.zeros(B, dtype=np.int64)
+        trade_pnls: List[List[float]] = [[] for _ in range(B)]
+        trade_returns: List[List[float]] = [[] for _ in range(B)]
+
+        for t in range(start_idx, T):
+            # --- Market open: execute exits first, then entries ---
+            price = fill_price[:, t]
+            sell = pending_exit & (shares > 0)
+            if sell.any():
+                value = np.where(sell, shares * price * (1 - slip), 0.0)
+                proceeds = value - np.where(sell, self._fees(shares, value), 0.0)
+                pnl = proceeds - cost_basis
+                for b in np.flatnonzero(sell.any(axis=1)):
+                    trade_pnls[b].extend(pnl[b, sell[b]].tolist())
+                    trade_returns[b].extend((pnl[b, sell[b]] / cost_basis[b, sell[b]]).tolist())
+                cash += proceeds.sum(axis=1)
+                orders += sell.sum(axis=1)
+                shares[sell] = 0.0
+                cost_basis[sell] = 0.0
+
+            buy = pending_entry & (shares == 0) & tradable[:, t]
+            if buy.any():
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    qty = np.floor(position_size[:, None] / price[None, :])
+                buy &= qty > 0
+                value = np.where(buy, qty * price * (1 + slip), 0.0)
+                cost = value + np.where(buy, self._fees(qty, value), 0.0)
+                buy &= np.cumsum(cost, axis=1) <= cash[:, None]
+                cost = np.where(buy, cost, 0.0)
+                cash -= cost.sum(axis=1)
+                orders += buy.sum(axis=1)
+                shares[buy] = qty[buy]
+                cost_basis[buy] = cost[buy]
+                entry_price[buy] = np.broadcast_to(price, (B, N))[buy]
+                entry_day[buy] = day[t]
+
+            pending_entry[:] = False
+            pending_exit[:] = False
+
+            # --- Market close: mark to market and generate signals ---
+            equity[:, t - start_idx] = cash + np.nansum(shares * close[:, t], axis=1)
+
+            if t == start_idx:
+                continue  # First call only establishes crossover baselines
+
+            ok = valid[:, :, t]
+            held = shares > 0
+            with np.errstate(invalid="ignore", divide="ignore"):
+                change = (close[:, t] - entry_price) / entry_price
+                risk_exit = (
+                    (-change >= stop_loss[:, None])
+                    | (change >= take_profit[:, None])
+                    | ((day[t] - entry_day) >= max_holding[:, None])
+                )
+            pending_exit = ok & held & (risk_exit | exit_[:, :, t])
+            pending_entry = ok & ~held & entry[:, :, t]
+
+        return {
+            "equity": equity,
+            "orders": orders,
+            "trade_pnls": trade_pnls,
+            "trade_returns": trade_returns,
+        }
+
+    # -------------------------------------------------------------------------
+    # Statistics
+    # -------------------------------------------------------------------------
+
+    def _compute_statistics(
+        self,
+        equity: np.ndarray,
+        benchmark: np.ndarray,
+        trade_pnls: List[float],
+        trade_returns: List[float],
+        orders: int,
+    ) -> Dict[str, str]:
+        """Compute QC-style statistics strings from an equity curve"""
+        start_equity = float(self.initial_capital)
+        end_equity = float(equity[-1])
+        returns = np.diff(np.concatenate([[start_equity], equity])) / np.concatenate([[start_equity], equity[:-1]])
+
+        years = max(len(equity) / TRADING_DAYS_PER_YEAR, 1e-9)
+        net_profit = end_equity / start_equity - 1
+        cagr = (end_equity / start_equity) ** (1 / years) - 1 if end_equity > 0 else -1.0
+
+        annual_std = float(np.std(returns) * np.sqrt(TRADING_DAYS_PER_YEAR))
+        annual_mean = float(np.mean(returns) * TRADING_DAYS_PER_YEAR)
+        sharpe = annual_mean / annual_std if annual_std > 0 else 0.0
+        downside = returns[returns < 0]
+        downside_std = float(np.sqrt(np.mean(downside ** 2)) * np.sqrt(TRADING_DAYS_PER_YEAR)) if len(downside) else 0.0
+        sortino = annual_mean / downside_std if downside_std > 0 else 0.0
+
+        peak = np.maximum.accumulate(np.concatenate([[start_equity], equity]))
+        drawdown = float(np.max(1 - np.concatenate([[start_equity], equity]) / peak))
+
+        bench_prev = np.concatenate([[benchmark[0]], benchmark[:-1]])
+        bench_returns = np.nan_to_num((benchmark - bench_prev) / bench_prev)
+        bench_var = float(np.var(bench_returns))
+        beta = float(np.cov(returns, bench_returns, bias=True)[0, 1] / bench_var) if bench_var > 0 else 0.0
+        alpha = float((np.mean(returns) - beta * np.mean(bench_returns)) * TRADING_DAYS_PER_YEAR)
+        active = returns - bench_returns
+        tracking_error = float(np.std(active) * np.sqrt(TRADING_DAYS_PER_YEAR))
+        information_ratio = float(np.mean(active) * TRADING_DAYS_PER_YEAR / tracking_error) if tracking_error > 0 else 0.0
+        treynor = annual_mean / beta if beta != 0 else 0.0
+
+        pnls = np.array(trade_pnls)
+        rets = np.array(trade_returns)
+        wins, losses = rets[pnls > 0], rets[pnls <= 0]
+        win_rate = len(wins) / len(pnls) if len(pnls) else 0.0
+        avg_win = float(wins.mean()) if len(wins) else 0.0
+        avg_loss = float(losses.mean()) if len(losses) else 0.0
+        profit_loss_ratio = abs(avg_win / avg_loss) if avg_loss != 0 else 0.0
+
+        return {
+            "Total Orders": f"{orders}",
+            "Average Win": f"{avg_win * 100:.2f}%",
+            "Average Loss": f"{avg_loss * 100:.2f}%",
+            "Compounding Annual Return": f"{cagr * 100:.3f}%",
+            "Drawdown": f"{drawdown * 100:.3f}%",
+            "Net Profit": f"{net_profit * 100:.3f}%",
+            "Sharpe Ratio": f"{sharpe:.3f}",
+            "Sortino Ratio": f"{sortino:.3f}",
+            "Win Rate": f"{win_rate * 100:.0f}%",
+            "Loss Rate": f"{(1 - win_rate) * 100 if len(pnls) else 0:.0f}%",
+            "Profit-Loss Ratio": f"{profit_loss_ratio:.2f}",
+            "Alpha": f"{alpha:.3f}",
+            "Beta": f"{beta:.3f}",
+            "Annual Standard Deviation": f"{annual_std:.3f}",
+            "Information Ratio": f"{information_ratio:.3f}",
+            "Treynor Ratio": f"{treynor:.3f}",
+            "Start Equity": f"{start_equity:.0f}",
+            "End Equity": f"{end_equity:.2f}",
+        }
+
+    # -------------------------------------------------------------------------
+    # Result construction
+    # -------------------------------------------------------------------------
+
+    def _completed(self, spec: StrategySpec, statistics: Dict[str, str], start, end) -> BacktestResult:
+        backtest_id = f"local-{spec.id}"
+        response = {
+            "success": True,
+            "backtest": {
+                "backtestId": backtest_id,
+                "name": spec.name,
+                "completed": True,
+                "progress": 1,
+                "created": str(start),
+                "ended": str(end),
+                "statistics": statistics,
+            },
+        }
+        return BacktestResult(
+            backtest_id=backtest_id,
+            strategy_id=spec.id,
+            name=spec.name,
+            status="completed",
+            success=True,
+            error=None,
+            statistics=statistics,
+            raw_response=response,
+        )
+
+    def _failed(self, spec: StrategySpec, error: str) -> BacktestResult:
+        return BacktestResult(
+            backtest_id="",
+            strategy_id=spec.id,
+            name=spec.name,
+            status="local_failed",
+            success=False,
+            error=error,
+            statistics={},
+            raw_response={},
+            runtime_errors=[error],
+        )
+
+
+def load_ohlcv(path: str) -> OHLCVData:
+    """
+    Load OHLCV data for the local engine from a .npz file or an
+    OHLCVStore directory (see core/data_store.py).
+    """
+    if os.path.isdir(path):
+        from core.data_store import OHLCVStore
+        return OHLCVStore(path).load()
+    return OHLCVData.load_npz(path)
+
+
+def generate_synthetic_ohlcv(
+    symbols: List[str],
+    start: str = "2014-01-01",
+    end: str = "2024-12-31",
+    seed: int = 42
+) -> OHLCVData:
+    """
+    Generate random-walk daily bars (weekdays only) for offline testing.
+
+    Args:
+        symbols: Symbols to generate
+        start: First date (YYYY-MM-DD)
+        end: Last date (YYYY-MM-DD)
+        seed: Random seed
+
+    Returns:
+        OHLCVData with positive prices and volumes
+    """
+    rng = np.random.default_rng(seed)
+    days = np.arange(np.datetime64(start, "D"), np.datetime64(end, "D") + 1)
+    dates = days[np.is_busday(days)]
+    N, T = len(symbols), len(dates)
+
+    drift = rng.normal(0.0004, 0.0003, size=(N, 1))
+    vol = rng.uniform(0.01, 0.03, size=(N, 1))
+    log_returns = drift + vol * rng.standard_normal((N, T))
+    close = 50.0 * np.exp(np.cumsum(log_returns, axis=1))
+    open_ = close * np.exp(vol * 0.3 * rng.standard_normal((N, T)))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.005, (N, T))))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.005, (N, T))))
+    volume = rng.uniform(1e6, 5e6, size=(N, T)).round()
+
+    return OHLCVData(symbols=list(symbols), dates=dates, open=open_, high=high,
+                     low=low, close=close, volume=volume)
+
+
+# =============================================================================
+# TESTING
+# =============================================================================
+
+if __name__ == "__main__":
+    import time
+    from models.strategy_spec import create_example_momentum_strategy, create_example_mean_reversion_strategy
+
+    print("Testing Local Engine...")
+
+    specs = [create_example_momentum_strategy(), create_example_mean_reversion_strategy()]
+    symbols = sorted({s for spec in specs for s in spec.universe.symbols})
+    data = generate_synthetic_ohlcv(symbols)
+
+    engine = LocalEngine(data)
+    for spec in specs:
+        start = time.time()
+        result = engine.run(spec)
+        elapsed = time.time() - start
+        print(f"\n{spec.name}: {result.status} in {elapsed * 1000:.1f}ms")
+        for key in ("Total Orders", "Sharpe Ratio", "Compounding Annual Return", "Drawdown", "Win Rate"):
+            print(f"  {key}: {result.statistics.get(key)}")
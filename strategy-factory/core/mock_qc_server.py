@@ -0,0 +1,613 @@
+"""
+Mock QuantConnect API Server
+
+Local HTTP stand-in for the QuantConnect v2 API, so the runner and
+run_pipeline.py can run end to end without credentials or network, and
+the runner's concurrency and rate limiting can be load-tested offline.
+
+Implements the endpoints the runner and scripts use:
+    /authenticate
+    /projects/read, /projects/create, /projects/delete
+    /files/create, /files/update, /files/read
+    /compile/create, /compile/read
+    /backtests/create, /backtests/read, /backtests/list, /backtests/delete
+    /backtests/orders/read
+
+Backtests are backed by the local engine: the "Strategy ID" line of the
+pushed code selects a registered StrategySpec (backtest parameters are
+applied to it for parameterized compiles), and the start/end dates are
+read from set_start_date/set_end_date. Alternatively, recorded backtest
+responses ({strategy_id}.json files holding a /backtests/read response)
+are served as-is.
+
+Simulated behaviour, all configurable:
+- latency: per-request delay (plus up to 50% jitter)
+- backtest_seconds: time for a backtest to go from 0 to 100% progress
+- rate_limit: requests per minute before HTTP 429s (sliding window)
+- error_rate: probability of a spurious 429 on any request
+- max_concurrent: running backtests allowed at once (node limit)
+
+Usage:
+    with MockQCServer(specs=specs) as server:
+        config.QC_API_BASE = server.url
+        ...
+or from the command line:
+    python core/mock_qc_server.py --port 8765 --rate-limit 30 --error-rate 0.05
+"""
+
+import os
+import re
+import json
+import time
+import uuid
+import random
+import threading
+from collections import deque, Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, List, Optional, Tuple
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.strategy_spec import StrategySpec
+from core.local_engine import LocalEngine, OHLCVData, generate_synthetic_ohlcv
+from core.compiler import StrategyCompiler
+from generators.param_sweeper import ParameterSweeper
+import config
+
+
+STRATEGY_ID_PATTERN = re.compile(r"Strategy ID:\s*(\S+)")
+DATE_PATTERN = r"self\.set_{}_date\((\d+),\s*(\d+),\s*(\d+)\)"
+
+
+def _code_dates(code: str) -> Tuple[Optional[str], Optional[str]]:
+    """Backtest start/end dates set in algorithm code"""
+    dates = []
+    for which in ("start", "end"):
+        match = re.search(DATE_PATTERN.format(which), code)
+        dates.append(f"{int(match[1]):04d}-{int(match[2]):02d}-{int(match[3]):02d}" if match else None)
+    return dates[0], dates[1]
+
+
+class MockQCServer:
+    """
+    In-process mock of the QuantConnect API.
+
+    Runs a threaded HTTP server on localhost; start() returns its base
+    URL, to be used in place of config.QC_API_BASE. Any user ID / token
+    is accepted.
+    """
+
+    def __init__(
+        self,
+        port: int = 0,
+        specs: List[StrategySpec] = None,
+        data: OHLCVData = None,
+        responses_dir: str = None,
+        latency: float = None,
+        backtest_seconds: float = None,
+        rate_limit: int = None,
+        error_rate: float = None,
+        max_concurrent: int = None,
+        seed: int = None
+    ):
+        """
+        Args:
+            port: Port to listen on (0 = any free port)
+            specs: Specs that may be backtested (more via register())
+            data: OHLCV data for the local engine (default: synthetic
+                  bars generated per universe)
+            responses_dir: Directory of recorded {strategy_id}.json
+                           backtest responses, served instead of running
+                           the local engine
+            latency: Seconds added to every request (default from config)
+            backtest_seconds: Simulated backtest duration (default from config)
+            rate_limit: Requests per minute before 429s, 0 = unlimited
+                        (default from config)
+            error_rate: Probability of a spurious 429 (default from config)
+            max_concurrent: Running backtests allowed at once, 0 = unlimited
+                            (default from config)
+            seed: Seed for latency jitter and error injection
+        """
+        self.port = port
+        self.data = data
+        self.responses_dir = responses_dir
+        self.latency = config.MOCK_QC_LATENCY if latency is None else latency
+        self.backtest_seconds = config.MOCK_QC_BACKTEST_SECONDS if backtest_seconds is None else backtest_seconds
+        self.rate_limit = config.MOCK_QC_RATE_LIMIT if rate_limit is None else rate_limit
+        self.error_rate = config.MOCK_QC_ERROR_RATE if error_rate is None else error_rate
+        self.max_concurrent = config.MOCK_QC_MAX_CONCURRENT if max_concurrent is None else max_concurrent
+        self.random = random.Random(seed)
+
+        self.specs: Dict[str, StrategySpec] = {}
+        self.projects: Dict[int, Dict[str, Any]] = {}
+        self.compiles: Dict[str, Dict[str, Any]] = {}
+        self.backtests: Dict[str, Dict[str, Any]] = {}
+        self._engines: Dict[Tuple[str, ...], Tuple[LocalEngine, threading.Lock]] = {}
+        self._next_project_id = 1000
+        self._lock = threading.RLock()
+
+        self._request_times: deque = deque()
+        self.requests: Counter = Counter()
+        self.rate_limited = 0
+        self.injected_errors = 0
+        self.max_running = 0
+
+        self.httpd: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self.register(specs or [])
+
+    # -------------------------------------------------------------------------
+    # Lifecycle
+    # -------------------------------------------------------------------------
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}/api/v2"
+
+    def start(self) -> str:
+        """Start serving in a background thread. Returns the base URL."""
+        server = self
+
+        class Handler(MockQCHandler):
+            mock = server
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", self.port), Handler)
+        self.httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self.url
+
+    def stop(self):
+        if self.httpd:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            self.httpd = None
+
+    def __enter__(self) -> "MockQCServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def register(self, specs: List[StrategySpec]):
+        """Make specs available for backtesting (looked up by Strategy ID)"""
+        with self._lock:
+            for spec in specs:
+                self.specs[spec.id] = spec
+
+    def stats(self) -> Dict[str, Any]:
+        """Request counts and simulated-limit statistics"""
+        with self._lock:
+            return {
+                "requests": sum(self.requests.values()),
+                "by_endpoint": dict(self.requests),
+                "rate_limited": self.rate_limited,
+                "injected_errors": self.injected_errors,
+                "backtests": len(self.backtests),
+                "max_running": self.max_running,
+            }
+
+    # -------------------------------------------------------------------------
+    # Request handling
+    # -------------------------------------------------------------------------
+
+    def handle(self, endpoint: str, payload: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        """
+        Handle one API request.
+
+        Returns:
+            (HTTP status, JSON response)
+        """
+        if self.latency:
+            time.sleep(self.latency * (1 + 0.5 * self.random.random()))
+
+        with self._lock:
+            self.requests[endpoint] += 1
+            if self._throttled():
+                return 429, {"success": False, "errors": ["Too many requests, slow down"]}
+
+        route = ROUTES.get(endpoint)
+        if route is None:
+            return 404, {"success": False, "errors": [f"Unknown endpoint: {endpoint}"]}
+        # Routes lock the project/backtest tables themselves; backtest
+        # results are computed outside the lock, so requests stay concurrent
+        try:
+            return 200, route(self, payload)
+        except KeyError as e:
+            return 200, {"success": False, "errors": [f"Missing or unknown {e}"]}
+        except Exception as e:
+            return 500, {"success": False, "errors": [f"Internal error: {type(e).__name__}: {e}"]}
+
+    def _throttled(self) -> bool:
+        now = time.monotonic()
+        if self.error_rate and self.random.random() < self.error_rate:
+            self.injected_errors += 1
+            return True
+        if self.rate_limit:
+            while self._request_times and now - self._request_times[0] > 60:
+                self._request_times.popleft()
+            if len(self._request_times) >= self.rate_limit:
+                self.rate_limited += 1
+                return True
+            self._request_times.append(now)
+        return False
+
+    # -------------------------------------------------------------------------
+    # Endpoints
+    # -------------------------------------------------------------------------
+
+    def authenticate(self, payload):
+        return {"success": True}
+
+    def read_projects(self, payload):
+        with self._lock:
+            projects = list(self.projects.values())
+            if "projectId" in payload:
+                projects = [self.projects[int(payload["projectId"])]]
+            return {"success": True, "projects": [self._project_summary(p) for p in projects]}
+
+    def create_project(self, payload):
+        with self._lock:
+            project_id = self._next_project_id
+            self._next_project_id += 1
+            self.projects[project_id] = {
+                "projectId": project_id,
+                "name": payload["name"],
+                "language": payload.get("language", "Py"),
+                "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+                "files": {},
+            }
+            return {"success": True, "projects": [self._project_summary(self.projects[project_id])]}
+
+    def delete_project(self, payload):
+        with self._lock:
+            del self.projects[int(payload["projectId"])]
+        return {"success": True}
+
+    def update_file(self, payload):
+        with self._lock:
+            project = self.projects[int(payload["projectId"])]
+            project["files"][payload["name"]] = payload.get("content", "")
+        return {"success": True}
+
+    def read_files(self, payload):
+        with self._lock:
+            project = self.projects[int(payload["projectId"])]
+            files = [{"name": name, "content": content} for name, content in project["files"].items()]
+        if "name" in payload:
+            files = [f for f in files if f["name"] == payload["name"]]
+        return {"success": True, "files": files}
+
+    def create_compile(self, payload):
+        with self._lock:
+            project = self.projects[int(payload["projectId"])]
+            project_id = project["projectId"]
+            code = project["files"].get("main.py", "")
+        try:
+            compile(code, "main.py", "exec")
+        except SyntaxError as e:
+            return {"success": False, "errors": [f"main.py:{e.lineno}: {e.msg}"], "state": "BuildError"}
+        compile_id = f"{uuid.uuid4().hex[:8]}-{uuid.uuid4().hex[:24]}"
+        with self._lock:
+            self.compiles[compile_id] = {"projectId": project_id, "code": code}
+        return {"success": True, "compileId": compile_id, "state": "BuildSuccess", "logs": ["Build Success."]}
+
+    def read_compile(self, payload):
+        with self._lock:
+            found = payload["compileId"] in self.compiles
+        if not found:
+            return {"success": False, "errors": ["Compile not found"]}
+        return {"success": True, "compileId": payload["compileId"], "state": "BuildSuccess", "logs": []}
+
+    def create_backtest(self, payload):
+        with self._lock:
+            compiled = self.compiles.get(payload.get("compileId"))
+            if compiled is None:
+                return {"success": False, "errors": ["Invalid compile ID"]}
+            if self.max_concurrent and self._running() >= self.max_concurrent:
+                return {"success": False, "errors": ["No spare nodes available, please wait for a backtest to finish"]}
+
+            backtest_id = uuid.uuid4().hex
+            backtest = self.backtests[backtest_id] = {
+                "backtestId": backtest_id,
+                "projectId": compiled["projectId"],
+                "name": payload.get("backtestName", backtest_id),
+                "code": compiled["code"],
+                "parameters": payload.get("parameters") or {},
+                "started": time.monotonic(),
+                "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+                "result": None,
+                "result_lock": threading.Lock(),
+            }
+            self.max_running = max(self.max_running, self._running())
+        return {"success": True, "backtest": self._backtest_view(backtest)}
+
+    def read_backtest(self, payload):
+        with self._lock:
+            backtest = self.backtests[payload["backtestId"]]
+        return {"success": True, "backtest": self._backtest_view(backtest)}
+
+    def list_backtests(self, payload):
+        project_id = int(payload["projectId"])
+        with self._lock:
+            project_backtests = [b for b in self.backtests.values() if b["projectId"] == project_id]
+        backtests = [
+            self._backtest_view(b, statistics=bool(payload.get("includeStatistics", True)))
+            for b in project_backtests
+        ]
+        return {"success": True, "backtests": backtests, "count": len(backtests)}
+
+    def delete_backtest(self, payload):
+        with self._lock:
+            del self.backtests[payload["backtestId"]]
+        return {"success": True}
+
+    def read_orders(self, payload):
+        with self._lock:
+            backtest = self.backtests[payload["backtestId"]]
+        orders = []
+        if self._progress(backtest) >= 1:
+            orders = self._result(backtest).get("orders", [])
+        start, end = int(payload.get("start", 0)), int(payload.get("end", 100))
+        return {"success": True, "orders": orders[start:end], "length": len(orders)}
+
+    # -------------------------------------------------------------------------
+    # Backtest simulation
+    # -------------------------------------------------------------------------
+
+    def _project_summary(self, project: Dict[str, Any]) -> Dict[str, Any]:
+        return {k: v for k, v in project.items() if k != "files"}
+
+    def _progress(self, backtest: Dict[str, Any]) -> float:
+        if not self.backtest_seconds:
+            return 1.0
+        return min(1.0, (time.monotonic() - backtest["started"]) / self.backtest_seconds)
+
+    def _running(self) -> int:
+        return sum(1 for b in self.backtests.values() if self._progress(b) < 1)
+
+    def _backtest_view(self, backtest: Dict[str, Any], statistics: bool = True) -> Dict[str, Any]:
+        """The backtest object as the API returns it"""
+        progress = self._progress(backtest)
+        view = {
+            "backtestId": backtest["backtestId"],
+            "projectId": backtest["projectId"],
+            "name": backtest["name"],
+            "created": backtest["created"],
+            "progress": round(progress, 2),
+            "completed": False,
+            "status": "In Progress..." if progress > 0 else "In Queue...",
+        }
+        if progress < 1:
+            return view
+
+        result = self._result(backtest)
+        view.update({k: v for k, v in result.items() if k not in ("orders", "backtestId", "name")})
+        if not statistics:
+            view.pop("statistics", None)
+            view.pop("runtimeStatistics", None)
+        return view
+
+    def _result(self, backtest: Dict[str, Any]) -> Dict[str, Any]:
+        """Final backtest fields (computed once, on completion, outside the server lock)"""
+        with backtest["result_lock"]:
+            if backtest["result"] is None:
+                backtest["result"] = self._run(backtest)
+        return backtest["result"]
+
+    def _run(self, backtest: Dict[str, Any]) -> Dict[str, Any]:
+        match = STRATEGY_ID_PATTERN.search(backtest["code"])
+        strategy_id = match[1] if match else None
+
+        recorded = self._recorded(strategy_id)
+        if recorded is not None:
+            return recorded
+
+        with self._lock:
+            spec = self.specs.get(strategy_id)
+        if spec is None:
+            return self._runtime_error(f"Unknown strategy {strategy_id}: register its spec with the mock server")
+        if backtest["parameters"]:
+            spec = self._apply_parameters(spec, backtest["parameters"])
+
+        start, end = _code_dates(backtest["code"])
+        engine, engine_lock = self._engine(spec)
+        # One run at a time per engine (its indicator cache is not thread-safe)
+        with engine_lock:
+            result = engine.run(spec, start, end)
+        if not result.success:
+            return self._runtime_error(result.error)
+        return {
+            "completed": True,
+            "progress": 1,
+            "status": "Completed.",
+            "statistics": result.statistics,
+            "runtimeStatistics": {"Equity": "", "Net Profit": ""},
+            "ended": result.raw_response["backtest"].get("ended"),
+        }
+
+    def _recorded(self, strategy_id: Optional[str]) -> Optional[Dict[str, Any]]:
+        if not (self.responses_dir and strategy_id):
+            return None
+        path = os.path.join(self.responses_dir, f"{strategy_id}.json")
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r') as f:
+            response = json.load(f)
+        recorded = dict(response.get("backtest", response))
+        recorded.update({"completed": True, "progress": 1})
+        return recorded
+
+    @staticmethod
+    def _runtime_error(message: str) -> Dict[str, Any]:
+        return {
+            "completed": True,
+            "progress": 1,
+            "status": "Runtime Error",
+            "error": message,
+            "stacktrace": message,
+            "statistics": {},
+        }
+
+    @staticmethod
+    def _apply_parameters(spec: StrategySpec, parameters: Dict[str, str]) -> StrategySpec:
+        """Apply backtest parameters (by QC parameter name) to a spec"""
+        _, paths = StrategyCompiler().compile_parameterized(spec)
+        names = {name: path for path, name in paths.items()}
+        sweeper = ParameterSweeper()
+        values = {}
+        for name, raw in parameters.items():
+            if name in names:
+                default = sweeper.get_nested_value(spec, names[name])
+                values[names[name]] = type(default)(float(raw)) if isinstance(default, (int, float)) else raw
+        return sweeper.apply_parameters(spec, values)
+
+    def _engine(self, spec: StrategySpec) -> Tuple[LocalEngine, threading.Lock]:
+        """Engine for a spec's universe and the lock serializing its runs"""
+        key = () if self.data is not None else tuple(LocalEngine._universe(spec))
+        with self._lock:
+            entry = self._engines.get(key)
+        if entry is None:
+            # Synthetic data is generated outside the lock; a concurrent
+            # duplicate is discarded
+            engine = LocalEngine(self.data if self.data is not None else generate_synthetic_ohlcv(list(key)))
+            with self._lock:
+                entry = self._engines.setdefault(key, (engine, threading.Lock()))
+        return entry
+
+
+ROUTES = {
+    "/authenticate": MockQCServer.authenticate,
+    "/projects/read": MockQCServer.read_projects,
+    "/projects/create": MockQCServer.create_project,
+    "/projects/delete": MockQCServer.delete_project,
+    "/files/create": MockQCServer.update_file,
+    "/files/update": MockQCServer.update_file,
+    "/files/read": MockQCServer.read_files,
+    "/compile/create": MockQCServer.create_compile,
+    "/compile/read": MockQCServer.read_compile,
+    "/backtests/create": MockQCServer.create_backtest,
+    "/backtests/read": MockQCServer.read_backtest,
+    "/backtests/list": MockQCServer.list_backtests,
+    "/backtests/delete": MockQCServer.delete_backtest,
+    "/backtests/orders/read": MockQCServer.read_orders,
+}
+
+
+class MockQCHandler(BaseHTTPRequestHandler):
+    """HTTP/1.1 (keep-alive) handler delegating to a MockQCServer"""
+
+    protocol_version = "HTTP/1.1"
+    mock: MockQCServer = None
+
+    def do_GET(self):
+        self._dispatch({})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        try:
+            payload = json.loads(body) if body else {}
+        except json.JSONDecodeError:
+            self._send(400, {"success": False, "errors": ["Invalid JSON"]})
+            return
+        self._dispatch(payload)
+
+    def _dispatch(self, payload: Dict[str, Any]):
+        if not self.headers.get("Authorization"):
+            self._send(401, {"success": False, "errors": ["Hash doesn't match."]})
+            return
+        path = self.path.split("?")[0]
+        prefix = "/api/v2"
+        endpoint = path[len(prefix):] if path.startswith(prefix) else path
+        status, response = self.mock.handle(endpoint, payload)
+        self._send(status, response)
+
+    def _send(self, status: int, response: Dict[str, Any]):
+        body = json.dumps(response).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Keep pipeline output readable
+
+
+# =============================================================================
+# TESTING
+# =============================================================================
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Mock QuantConnect API server")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=None, help="Seconds per request")
+    parser.add_argument("--backtest-seconds", type=float, default=None, help="Simulated backtest duration")
+    parser.add_argument("--rate-limit", type=int, default=None, help="Requests per minute before 429s (0 = off)")
+    parser.add_argument("--error-rate", type=float, default=None, help="Probability of a spurious 429")
+    parser.add_argument("--max-concurrent", type=int, default=None, help="Running backtests allowed at once")
+    parser.add_argument("--specs-dir", default=config.SPECS_DIR, help="Specs available for backtesting")
+    parser.add_argument("--responses-dir", default=None, help="Recorded {strategy_id}.json responses")
+    parser.add_argument("--demo", action="store_true", help="Run a short self-test with the runner and exit")
+    args = parser.parse_args()
+
+    from generators.ai_generator import load_specs
+    specs = load_specs(args.specs_dir) if os.path.isdir(args.specs_dir) else []
+
+    server = MockQCServer(
+        port=0 if args.demo else args.port, specs=specs, responses_dir=args.responses_dir,
+        latency=args.latency, backtest_seconds=args.backtest_seconds, rate_limit=args.rate_limit,
+        error_rate=args.error_rate, max_concurrent=args.max_concurrent,
+    )
+    url = server.start()
+
+    if not args.demo:
+        print(f"Mock QC API at {url} ({len(specs)} specs); Ctrl-C to stop")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            server.stop()
+        sys.exit(0)
+
+    from core.runner import QCRunner
+    from models.strategy_spec import create_example_momentum_strategy
+
+    print("Testing Mock QC Server...")
+    config.QC_API_BASE = url
+    os.environ.setdefault("QC_USER_ID", "0")
+    os.environ.setdefault("QC_API_TOKEN", "mock")
+
+    spec = create_example_momentum_strategy()
+    server.register([spec])
+    server.backtest_seconds = 1.0
+    runner = QCRunner(verbose=False)
+    runner.rate_limiter.min_interval = 0.05
+
+    pool = runner.get_or_create_project_pool(2)
+    code = StrategyCompiler().compile(spec, "2020-01-01", "2023-12-31")
+    start = time.time()
+    result = runner.run_full_backtest(code, spec.id, spec.name)
+    print(f"  Backtest: {result.status} in {time.time() - start:.1f}s, "
+          f"Sharpe {result.statistics.get('Sharpe Ratio')}, orders {result.statistics.get('Total Orders')}")
+
+    # Burst of raw requests against a 10 rpm limit plus 20% injected 429s
+    import urllib.request
+    import urllib.error
+    from core.runner import make_auth_headers
+    server.rate_limit, server.error_rate = 10, 0.2
+    codes = Counter()
+    for _ in range(30):
+        request = urllib.request.Request(f"{url}/authenticate", headers=make_auth_headers("0", "mock"))
+        try:
+            with urllib.request.urlopen(request) as response:
+                codes[response.status] += 1
+        except urllib.error.HTTPError as e:
+            codes[e.code] += 1
+    print(f"  30 requests at 10 rpm with 20% injected 429s: {dict(codes)}")
+    print(f"  Stats: {server.stats()}")
+    server.stop()
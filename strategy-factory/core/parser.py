@@ -14,6 +14,7 @@ from datetime import datetime
 import sys
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from core.tracing import traced
 import config
 
 
@@ -100,6 +101,7 @@ class ParsedMetrics:
 class ResultsParser:
     """Parse and extract metrics from QC backtest results"""
 
+    @traced("parser.parse", args=("strategy_id",))
     def parse(
         self,
         raw_response: Dict[str, Any],
@@ -0,0 +1,168 @@
+"""
+Backtest Polling
+
+Adaptive poll timing shared by QCRunner and AsyncQCClient.
+
+Instead of reading a backtest every BACKTEST_POLL_INTERVAL seconds, each
+in-flight backtest gets a PollSchedule that:
+- Estimates time to completion from the reported progress deltas and
+  polls again partway to that ETA
+- Backs off exponentially while progress is stalled (queued, or a slow
+  stretch of the backtest)
+- Never polls faster than the budget floor, so polling uses at most
+  POLL_BUDGET_FRACTION of the API rate limit
+
+Many backtests on one project are checked with a single /backtests/list
+request (no statistics), and only finished ones are read in full.
+"""
+
+import os
+import time
+from typing import Dict, Any, Optional
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+
+
+def is_backtest_finished(backtest: Dict[str, Any]) -> bool:
+    """True once a backtest has completed or errored"""
+    if backtest.get("completed") or (backtest.get("progress") == 1 and backtest.get("statistics")):
+        return True
+    if backtest.get("error") or backtest.get("stacktrace"):
+        return True
+    status = str(backtest.get("status", ""))
+    return status.startswith("Completed") or status.startswith("Runtime Error")
+
+
+def min_poll_interval(pollers: int = 1, requests_per_minute: float = None) -> float:
+    """
+    Shortest allowed interval between polls for each of `pollers`
+    independent pollers sharing the request budget.
+    """
+    rpm = requests_per_minute or (config.QC_RATE_LIMIT - config.QC_RATE_LIMIT_BUFFER)
+    budget_floor = 60.0 * max(1, pollers) / (rpm * config.POLL_BUDGET_FRACTION)
+    return max(config.BACKTEST_POLL_INTERVAL, budget_floor)
+
+
+def backtests_by_id(list_response: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Index a /backtests/list response by backtest ID"""
+    return {
+        b.get("backtestId"): b
+        for b in list_response.get("backtests", []) or []
+        if b.get("backtestId")
+    }
+
+
+class PollSchedule:
+    """
+    Poll timing for one backtest.
+
+    Usage:
+        schedule = PollSchedule()
+        while True:
+            backtest = read()
+            if is_backtest_finished(backtest):
+                break
+            time.sleep(schedule.update(backtest.get("progress", 0)))
+    """
+
+    def __init__(
+        self,
+        min_interval: float = None,
+        max_interval: float = None,
+        backoff: float = None,
+        eta_fraction: float = 0.5
+    ):
+        """
+        Args:
+            min_interval: Shortest delay between polls (default: min_poll_interval())
+            max_interval: Longest delay between polls (default from config)
+            backoff: Delay multiplier while progress is stalled (default from config)
+            eta_fraction: Poll again after this fraction of the estimated
+                          remaining time
+        """
+        self.min_interval = min_interval or min_poll_interval()
+        self.max_interval = max(self.min_interval, max_interval or config.BACKTEST_POLL_MAX_INTERVAL)
+        self.backoff = backoff or config.BACKTEST_POLL_BACKOFF
+        self.eta_fraction = eta_fraction
+
+        self.started_at = time.time()
+        self.next_poll_at = self.started_at
+        self.delay = self.min_interval
+        self.polls = 0
+        self.rate: Optional[float] = None  # progress per second (smoothed)
+        self._last_progress: Optional[float] = None
+        self._last_time: Optional[float] = None
+
+    @property
+    def elapsed(self) -> float:
+        return time.time() - self.started_at
+
+    @property
+    def eta(self) -> Optional[float]:
+        """Estimated seconds to completion, or None before progress is seen"""
+        if not self.rate or self._last_progress is None:
+            return None
+        return max(0.0, 1.0 - self._last_progress) / self.rate
+
+    def due(self, now: float = None) -> bool:
+        return (now or time.time()) >= self.next_poll_at
+
+    def update(self, progress: Any, now: float = None) -> float:
+        """
+        Record a progress observation (0-1) and schedule the next poll.
+
+        Returns:
+            Seconds until the next poll
+        """
+        now = now or time.time()
+        try:
+            progress = float(progress or 0)
+        except (TypeError, ValueError):
+            progress = 0.0
+        self.polls += 1
+
+        advanced = self._last_progress is not None and progress > self._last_progress
+        if advanced and now > self._last_time:
+            rate = (progress - self._last_progress) / (now - self._last_time)
+            self.rate = rate if self.rate is None else 0.5 * self.rate + 0.5 * rate
+
+        if advanced and self.eta is not None:
+            delay = self.eta * self.eta_fraction
+        elif self._last_progress is None:
+            delay = self.min_interval
+        else:
+            delay = self.delay * self.backoff
+
+        if not advanced and self._last_progress is not None and self.rate:
+            # Stalled after making progress: slow down from the ETA estimate
+            self.rate *= 1.0 / self.backoff
+
+        self._last_progress = max(progress, self._last_progress or 0.0)
+        self._last_time = now
+        self.delay = min(self.max_interval, max(self.min_interval, delay))
+        self.next_poll_at = now + self.delay
+        return self.delay
+
+
+# =============================================================================
+# TESTING
+# =============================================================================
+
+if __name__ == "__main__":
+    print("Testing Poll Schedule...")
+    print(f"  Budget floor: 1 poller {min_poll_interval(1):.1f}s, 4 pollers {min_poll_interval(4):.1f}s")
+
+    # Simulated 120s backtest that sits queued for 20s
+    schedule = PollSchedule(min_interval=5)
+    now = schedule.started_at
+    polls = []
+    while True:
+        progress = min(1.0, max(0.0, (now - schedule.started_at - 20) / 100))
+        if progress >= 1.0:
+            break
+        polls.append(round(now - schedule.started_at))
+        now += schedule.update(progress, now)
+    print(f"  {len(polls)} polls (fixed 5s interval: {120 // 5}) at t={polls}")
@@ -0,0 +1,289 @@
+"""
+Strategy Registry
+
+Indexed SQLite registry of every strategy and variation the pipeline has
+seen: one row per strategy ID with its status, parent and key metrics.
+
+Updates are single-row upserts (O(1) regardless of registry size), and
+batches of updates can share one transaction. The legacy
+strategies/registry.json is imported once on first use, and a JSON
+snapshot can still be exported for reading by hand.
+"""
+
+import os
+import json
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Iterable, Iterator
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.strategy_spec import StrategySpec
+from core.parser import ParsedMetrics
+import config
+
+
+COLUMNS = ("id", "name", "created_at", "status", "parent_id", "sharpe_ratio", "cagr", "max_drawdown", "updated_at")
+METRIC_COLUMNS = ("sharpe_ratio", "cagr", "max_drawdown")
+
+
+class StrategyRegistry:
+    """
+    SQLite-backed strategy registry.
+
+    Usage:
+        registry = StrategyRegistry()
+        with registry.transaction():
+            for spec in specs:
+                registry.update(spec, "backtested", metrics[spec.id])
+        top = registry.top(10)
+    """
+
+    def __init__(self, path: str = None, import_from: str = None):
+        """
+        Args:
+            path: SQLite file (default: config.REGISTRY_DB_PATH)
+            import_from: Legacy registry.json to import the first time
+                         this database is opened
+        """
+        self.path = path or config.REGISTRY_DB_PATH
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.row_factory = sqlite3.Row
+        self._depth = 0  # nested transaction() depth
+
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS strategies (
+                id TEXT PRIMARY KEY,
+                name TEXT,
+                created_at TEXT,
+                status TEXT,
+                parent_id TEXT,
+                sharpe_ratio REAL,
+                cagr REAL,
+                max_drawdown REAL,
+                updated_at TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_strategies_status ON strategies (status);
+            CREATE INDEX IF NOT EXISTS idx_strategies_parent ON strategies (parent_id);
+            CREATE INDEX IF NOT EXISTS idx_strategies_sharpe ON strategies (sharpe_ratio);
+            CREATE TABLE IF NOT EXISTS metadata (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+        """)
+        self.conn.commit()
+
+        if import_from and os.path.exists(import_from) and self.get_metadata().get("imported_from") is None:
+            count = self.import_json(import_from)
+            print(f"Imported {count} strategies from {import_from}")
+
+    # -------------------------------------------------------------------------
+    # Writes
+    # -------------------------------------------------------------------------
+
+    @contextmanager
+    def transaction(self) -> Iterator["StrategyRegistry"]:
+        """
+        Group writes into one transaction (committed on exit, rolled back
+        on error). May be nested; only the outermost commits.
+        """
+        self._depth += 1
+        try:
+            yield self
+        except Exception:
+            self._depth -= 1
+            if self._depth == 0:
+                self.conn.rollback()
+            raise
+        self._depth -= 1
+        if self._depth == 0:
+            self.conn.commit()
+
+    def _commit(self):
+        if self._depth == 0:
+            self.conn.commit()
+
+    def upsert(self, entry: Dict[str, Any]):
+        """
+        Insert or update one strategy row.
+
+        Only the keys present in `entry` are updated, so e.g. a status
+        change keeps previously recorded metrics.
+        """
+        self._upsert(entry)
+        self._commit()
+
+    def upsert_many(self, entries: Iterable[Dict[str, Any]]) -> int:
+        """Upsert many rows in one transaction. Returns the row count."""
+        count = 0
+        with self.transaction():
+            for entry in entries:
+                self._upsert(entry)
+                count += 1
+        return count
+
+    def _upsert(self, entry: Dict[str, Any]):
+        row = {k: entry[k] for k in COLUMNS if k in entry}
+        row.setdefault("updated_at", datetime.utcnow().isoformat())
+        keys = list(row)
+        updates = ", ".join(f"{k} = excluded.{k}" for k in keys if k != "id")
+        self.conn.execute(
+            f"INSERT INTO strategies ({', '.join(keys)}) VALUES ({', '.join('?' * len(keys))}) "
+            f"ON CONFLICT (id) DO UPDATE SET {updates}",
+            [row[k] for k in keys]
+        )
+
+    def update(self, spec: StrategySpec, status: str, metrics: ParsedMetrics = None):
+        """Record a strategy's status (and metrics, if given)"""
+        entry = {
+            "id": spec.id,
+            "name": spec.name,
+            "created_at": spec.created_at,
+            "status": status,
+            "parent_id": spec.parent_id,
+        }
+        if metrics:
+            entry["sharpe_ratio"] = metrics.sharpe_ratio
+            entry["cagr"] = metrics.cagr
+            entry["max_drawdown"] = metrics.max_drawdown
+        self.upsert(entry)
+
+    def set_metadata(self, **values):
+        """Set registry-level metadata (JSON-serializable values)"""
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO metadata (key, value) VALUES (?, ?)",
+            [(k, json.dumps(v)) for k, v in values.items()]
+        )
+        self._commit()
+
+    # -------------------------------------------------------------------------
+    # Queries
+    # -------------------------------------------------------------------------
+
+    def get(self, strategy_id: str) -> Optional[Dict[str, Any]]:
+        row = self.conn.execute("SELECT * FROM strategies WHERE id = ?", (strategy_id,)).fetchone()
+        return dict(row) if row else None
+
+    def by_status(self, status: str) -> List[Dict[str, Any]]:
+        rows = self.conn.execute("SELECT * FROM strategies WHERE status = ? ORDER BY created_at", (status,))
+        return [dict(r) for r in rows]
+
+    def children(self, parent_id: str) -> List[Dict[str, Any]]:
+        """Variations derived from a strategy"""
+        rows = self.conn.execute("SELECT * FROM strategies WHERE parent_id = ? ORDER BY created_at", (parent_id,))
+        return [dict(r) for r in rows]
+
+    def top(self, n: int = 10, metric: str = "sharpe_ratio", status: str = None) -> List[Dict[str, Any]]:
+        """Strategies with the highest value of a metric column"""
+        if metric not in METRIC_COLUMNS:
+            raise ValueError(f"Unknown metric: {metric} (expected one of {METRIC_COLUMNS})")
+        query = f"SELECT * FROM strategies WHERE {metric} IS NOT NULL"
+        params: List[Any] = []
+        if status:
+            query += " AND status = ?"
+            params.append(status)
+        query += f" ORDER BY {metric} DESC LIMIT ?"
+        params.append(n)
+        return [dict(r) for r in self.conn.execute(query, params)]
+
+    def count(self, status: str = None) -> int:
+        if status:
+            return self.conn.execute("SELECT COUNT(*) FROM strategies WHERE status = ?", (status,)).fetchone()[0]
+        return self.conn.execute("SELECT COUNT(*) FROM strategies").fetchone()[0]
+
+    def status_counts(self) -> Dict[str, int]:
+        rows = self.conn.execute("SELECT status, COUNT(*) FROM strategies GROUP BY status")
+        return {status: count for status, count in rows}
+
+    def all(self) -> List[Dict[str, Any]]:
+        return [dict(r) for r in self.conn.execute("SELECT * FROM strategies ORDER BY created_at")]
+
+    def get_metadata(self) -> Dict[str, Any]:
+        return {k: json.loads(v) for k, v in self.conn.execute("SELECT key, value FROM metadata")}
+
+    # -------------------------------------------------------------------------
+    # JSON import / export
+    # -------------------------------------------------------------------------
+
+    def import_json(self, path: str) -> int:
+        """
+        Import a legacy registry.json (strategies list plus metadata).
+
+        Returns:
+            Number of strategies imported
+        """
+        with open(path, 'r') as f:
+            data = json.load(f)
+
+        with self.transaction():
+            count = self.upsert_many(data.get("strategies", []))
+            metadata = dict(data.get("metadata", {}))
+            for key in ("version", "created_at"):
+                if key in data:
+                    metadata[key] = data[key]
+            metadata["imported_from"] = os.path.abspath(path)
+            self.set_metadata(**metadata)
+        return count
+
+    def export_json(self, path: str = None) -> str:
+        """
+        Write a registry.json snapshot (same layout as the legacy file).
+
+        Returns:
+            The path written
+        """
+        path = path or config.REGISTRY_PATH
+        metadata = self.get_metadata()
+        metadata.pop("imported_from", None)
+        strategies = [
+            {k: v for k, v in row.items() if v is not None and k != "updated_at"}
+            for row in self.all()
+        ]
+        data = {
+            "version": metadata.pop("version", "1.0.0"),
+            "created_at": metadata.pop("created_at", None),
+            "updated_at": datetime.utcnow().isoformat(),
+            "strategies": strategies,
+            "metadata": metadata,
+        }
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=2)
+        return path
+
+    def close(self):
+        self.conn.close()
+
+
+# =============================================================================
+# TESTING
+# =============================================================================
+
+if __name__ == "__main__":
+    import time
+    import tempfile
+
+    print("Testing Strategy Registry...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        registry = StrategyRegistry(os.path.join(tmp, "registry.sqlite"), import_from=config.REGISTRY_PATH)
+        print(f"  Imported: {registry.count()} strategies, statuses {registry.status_counts()}")
+
+        start = time.time()
+        with registry.transaction():
+            for i in range(20000):
+                registry.upsert({"id": f"var{i}", "name": f"Variant {i}", "status": "backtested",
+                                 "parent_id": "base", "sharpe_ratio": (i % 97) / 50})
+        print(f"  20000 upserts in one transaction: {time.time() - start:.2f}s")
+
+        registry.upsert({"id": "var5", "status": "validated"})
+        print(f"  Partial update keeps metrics: {registry.get('var5')['sharpe_ratio']}")
+        print(f"  Children of base: {len(registry.children('base'))}")
+        print(f"  Top 3 by Sharpe: {[r['id'] for r in registry.top(3)]}")
+
+        path = registry.export_json(os.path.join(tmp, "registry.json"))
+        print(f"  Exported snapshot: {os.path.getsize(path)} bytes")
+        registry.close()
@@ -0,0 +1,230 @@
+"""
+Backtest Result Cache
+
+Persistent, content-addressed cache of cloud backtest results.
+
+Results are keyed by the SHA-256 of the compiled algorithm code plus the
+backtest date range, so byte-identical code (unchanged reruns, sweep
+variants with duplicate parameter combinations) is never backtested twice.
+The per-spec "Strategy ID" line is excluded from the hash since it does
+not affect the backtest.
+
+Stored in SQLite under config.RESULTS_DIR with age, entry-count and
+size-based (least recently used) eviction.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+from dataclasses import asdict, replace
+from typing import Dict, Any, Optional
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.runner import BacktestResult
+import config
+
+
+def make_cache_key(code: str, start_date: str, end_date: str) -> str:
+    """
+    Compute the cache key for compiled code and a date range.
+
+    Args:
+        code: Compiled QC Python code
+        start_date: Backtest start (YYYY-MM-DD)
+        end_date: Backtest end (YYYY-MM-DD)
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    normalized = "\n".join(
+        line for line in code.splitlines()
+        if not line.strip().startswith("Strategy ID:")
+    )
+    digest = hashlib.sha256()
+    digest.update(normalized.encode())
+    digest.update(f"|{start_date}|{end_date}".encode())
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    SQLite-backed cache of successful BacktestResults.
+
+    Usage:
+        cache = ResultCache()
+        key = make_cache_key(code, start, end)
+        result = cache.get(key, strategy_id)
+        if result is None:
+            result = runner.run_full_backtest(code, strategy_id)
+            cache.put(key, result)
+    """
+
+    def __init__(
+        self,
+        path: str = None,
+        max_entries: int = None,
+        max_age_days: float = None,
+        max_bytes: int = None
+    ):
+        """
+        Args:
+            path: SQLite file (default: config.RESULT_CACHE_PATH)
+            max_entries: Max cached results (default from config)
+            max_age_days: Entries older than this are evicted (default from config)
+            max_bytes: Max total size of stored results (default from config)
+        """
+        self.path = path or config.RESULT_CACHE_PATH
+        self.max_entries = max_entries or config.RESULT_CACHE_MAX_ENTRIES
+        self.max_age_days = max_age_days or config.RESULT_CACHE_MAX_AGE_DAYS
+        self.max_bytes = max_bytes or config.RESULT_CACHE_MAX_BYTES
+
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS results (
+                key TEXT PRIMARY KEY,
+                strategy_id TEXT,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                size INTEGER NOT NULL,
+                result TEXT NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_results_accessed ON results (accessed_at)")
+        self.conn.commit()
+
+    def get(self, key: str, strategy_id: str = None) -> Optional[BacktestResult]:
+        """
+        Look up a cached result.
+
+        Args:
+            key: Cache key from make_cache_key
+            strategy_id: If given, the returned result is relabeled with it
+
+        Returns:
+            BacktestResult or None on a miss
+        """
+        row = self.conn.execute(
+            "SELECT result, created_at FROM results WHERE key = ?", (key,)
+        ).fetchone()
+
+        if row is None or time.time() - row[1] > self.max_age_days * 86400:
+            self.misses += 1
+            return None
+
+        self.conn.execute("UPDATE results SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        self.conn.commit()
+        self.hits += 1
+
+        result = BacktestResult(**json.loads(row[0]))
+        if strategy_id:
+            result = replace(result, strategy_id=strategy_id)
+        return result
+
+    def put(self, key: str, result: BacktestResult) -> bool:
+        """
+        Store a result. Only successful backtests are cached.
+
+        Returns:
+            True if stored
+        """
+        if not result.success:
+            return False
+
+        payload = json.dumps(asdict(result))
+        now = time.time()
+        self.conn.execute(
+            "INSERT OR REPLACE INTO results (key, strategy_id, created_at, accessed_at, size, result) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (key, result.strategy_id, now, now, len(payload), payload)
+        )
+        self.conn.commit()
+        self.evict()
+        return True
+
+    def evict(self) -> int:
+        """
+        Remove expired entries, then least recently used entries until
+        within the entry and size limits.
+
+        Returns:
+            Number of entries removed
+        """
+        cutoff = time.time() - self.max_age_days * 86400
+        removed = self.conn.execute("DELETE FROM results WHERE created_at < ?", (cutoff,)).rowcount
+
+        count, total = self.conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results").fetchone()
+        if count > self.max_entries or total > self.max_bytes:
+            rows = self.conn.execute("SELECT key, size FROM results ORDER BY accessed_at").fetchall()
+            stale = []
+            for key, size in rows:
+                if count <= self.max_entries and total <= self.max_bytes:
+                    break
+                stale.append((key,))
+                count -= 1
+                total -= size
+            self.conn.executemany("DELETE FROM results WHERE key = ?", stale)
+            removed += len(stale)
+
+        self.conn.commit()
+        return removed
+
+    def clear(self):
+        """Remove all entries"""
+        self.conn.execute("DELETE FROM results")
+        self.conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache size and hit statistics for this session"""
+        count, total = self.conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "entries": count,
+            "bytes": total,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def close(self):
+        self.conn.close()
+
+
+# =============================================================================
+# TESTING
+# =============================================================================
+
+if __name__ == "__main__":
+    import tempfile
+
+    print("Testing Result Cache...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResultCache(os.path.join(tmp, "cache.sqlite"), max_entries=2)
+
+        result = BacktestResult(
+            backtest_id="bt-1", strategy_id="abc", name="Test", status="completed",
+            success=True, error=None, statistics={"Sharpe Ratio": "1.2"}, raw_response={}
+        )
+        code_a = "class A:\n    \"\"\"\n    Strategy ID: abc\n    \"\"\"\n"
+        code_b = "class A:\n    \"\"\"\n    Strategy ID: xyz\n    \"\"\"\n"
+
+        key_a = make_cache_key(code_a, "2020-01-01", "2024-12-31")
+        key_b = make_cache_key(code_b, "2020-01-01", "2024-12-31")
+        print(f"  Same code, different IDs share key: {key_a == key_b}")
+
+        cache.put(key_a, result)
+        hit = cache.get(key_b, "xyz")
+        print(f"  Hit relabeled: {hit.strategy_id if hit else None}")
+
+        for i in range(3):
+            cache.put(make_cache_key(code_a, "2020-01-01", f"2024-12-0{i + 1}"), result)
+        print(f"  Stats after eviction: {cache.stats()}")
+        cache.close()
@@ -7,25 +7,30 @@ Handles all interactions with the QuantConnect API:
 - Run backtests
 - Poll for completion
 - Fetch results
+- Fan out backtests across a pool of sandbox projects
 
 Includes rate limiting, retry logic, and verbose output.
 """
 
 import os
+import copy
 import time
 import json
-import hashlib
-import base64
+import queue
+import threading
 import subprocess
-import urllib.request
 import urllib.error
-from typing import Dict, Any, Optional, Tuple, List
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, Optional, Tuple, List, Callable
 from datetime import datetime
 from dataclasses import dataclass, field
 
 import sys
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from core.transport import make_auth_headers, get_cassette, HTTPTransport, CassetteMiss
+from core.tracing import tracer, traced
+from core.polling import PollSchedule, is_backtest_finished, min_poll_interval, backtests_by_id
 import config
 
 
@@ -44,12 +49,32 @@ class BacktestResult:
     runtime_errors: List[str] = field(default_factory=list)
 
 
+RATE_LIMIT_PHRASES = [
+    "too many",
+    "rate limit",
+    "slow down",
+    "throttl",
+    "429"
+]
+
+
+def is_rate_limit_error(error_msg: str) -> bool:
+    """Check if an error message indicates a rate limit"""
+    error_lower = str(error_msg).lower()
+    return any(phrase in error_lower for phrase in RATE_LIMIT_PHRASES)
+
+
 class RateLimiter:
     """
     Adaptive rate limiter for API calls.
 
     Handles QC rate limits (30 req/min) with intelligent backoff
     when rate limit errors are detected.
+
+    Thread-safe: one limiter is shared by every runner in a project pool,
+    so the combined request rate stays under the account-wide API limit.
+    Each caller reserves the next free slot under a lock, then sleeps
+    outside it.
     """
 
     def __init__(self, requests_per_minute: int = 20):
@@ -58,33 +83,46 @@ class RateLimiter:
         self.last_request_time = 0
         self.consecutive_rate_limits = 0
         self.base_wait = self.min_interval
+        self.blocked_until = 0
+        self._lock = threading.Lock()
 
     def wait(self):
         """Wait if necessary to respect rate limit"""
-        elapsed = time.time() - self.last_request_time
+        with self._lock:
+            now = time.time()
+
+            # Calculate wait time with backoff if we've hit rate limits
+            wait_time = self.base_wait * (1.5 ** self.consecutive_rate_limits)
 
-        # Calculate wait time with backoff if we've hit rate limits
-        wait_time = self.base_wait * (1.5 ** self.consecutive_rate_limits)
+            slot = max(now, self.last_request_time + wait_time, self.blocked_until)
+            self.last_request_time = slot
 
-        if elapsed < wait_time:
-            sleep_time = wait_time - elapsed
+        sleep_time = slot - now
+        tracer.observe("rate_limit.wait_seconds", max(0.0, sleep_time))
+        if sleep_time > 0:
             if sleep_time > 1:
                 print(f"    [Rate limit] Waiting {sleep_time:.1f}s...")
-            time.sleep(sleep_time)
-
-        self.last_request_time = time.time()
+            with tracer.span("rate_limit.wait"):
+                time.sleep(sleep_time)
 
     def report_rate_limit(self):
         """Called when a rate limit error is encountered"""
-        self.consecutive_rate_limits += 1
-        wait_time = 10 * (2 ** min(self.consecutive_rate_limits, 4))  # Cap at ~160s
-        print(f"    [Rate limit HIT] Backing off for {wait_time}s (attempt {self.consecutive_rate_limits})")
-        time.sleep(wait_time)
+        with self._lock:
+            self.consecutive_rate_limits += 1
+            wait_time = 10 * (2 ** min(self.consecutive_rate_limits, 4))  # Cap at ~160s
+            # Block every thread sharing this limiter, not just the caller
+            self.blocked_until = max(self.blocked_until, time.time() + wait_time)
+            attempt = self.consecutive_rate_limits
+        print(f"    [Rate limit HIT] Backing off for {wait_time}s (attempt {attempt})")
+        tracer.count("api.rate_limited")
+        with tracer.span("rate_limit.backoff", seconds=wait_time):
+            time.sleep(wait_time)
 
     def report_success(self):
         """Called when a request succeeds"""
-        if self.consecutive_rate_limits > 0:
-            self.consecutive_rate_limits = max(0, self.consecutive_rate_limits - 1)
+        with self._lock:
+            if self.consecutive_rate_limits > 0:
+                self.consecutive_rate_limits = max(0, self.consecutive_rate_limits - 1)
 
 
 class QCRunner:
@@ -104,7 +142,9 @@ class QCRunner:
             verbose: Whether to print detailed output
         """
         self.project_id = project_id or config.SANDBOX_PROJECT_ID
+        self.project_pool: List[int] = [self.project_id]
         self.verbose = verbose
+        self.log_prefix = ""
         self.rate_limiter = RateLimiter(config.QC_RATE_LIMIT - config.QC_RATE_LIMIT_BUFFER)
         self.script_path = os.path.join(
             os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
@@ -112,44 +152,26 @@ class QCRunner:
             "qc-api.sh"
         )
 
-        # Get credentials from environment
-        self.user_id = os.environ.get("QC_USER_ID")
-        self.api_token = os.environ.get("QC_API_TOKEN")
-
-        if not self.user_id or not self.api_token:
-            raise ValueError("QC_USER_ID and QC_API_TOKEN must be set")
+        # Credentials come from the environment; a replay cassette
+        # (config.QC_CASSETTE_MODE) serves recorded responses without them
+        self.transport = HTTPTransport(rate_limiter=self.rate_limiter, cassette=get_cassette())
+        self.user_id = self.transport.user_id
+        self.api_token = self.transport.api_token
 
     def _log(self, msg: str, indent: int = 2):
         """Print message if verbose mode is on"""
         if self.verbose:
-            print(" " * indent + msg)
+            print(" " * indent + self.log_prefix + msg)
 
     def _get_auth_headers(self) -> Dict[str, str]:
         """Generate authentication headers for QC API"""
-        timestamp = str(int(time.time()))
-        hash_input = f"{self.api_token}:{timestamp}"
-        hash_hex = hashlib.sha256(hash_input.encode()).hexdigest()
-        auth_string = f"{self.user_id}:{hash_hex}"
-        auth_b64 = base64.b64encode(auth_string.encode()).decode()
-
-        return {
-            "Authorization": f"Basic {auth_b64}",
-            "Timestamp": timestamp,
-            "Content-Type": "application/json"
-        }
+        return make_auth_headers(self.user_id, self.api_token)
 
     def _is_rate_limit_error(self, error_msg: str) -> bool:
         """Check if error is a rate limit error"""
-        rate_limit_phrases = [
-            "too many",
-            "rate limit",
-            "slow down",
-            "throttl",
-            "429"
-        ]
-        error_lower = str(error_msg).lower()
-        return any(phrase in error_lower for phrase in rate_limit_phrases)
+        return is_rate_limit_error(error_msg)
 
+    @traced("runner.api_call", args=("method", "endpoint"))
     def _api_call_direct(
         self,
         method: str,
@@ -169,40 +191,33 @@ class QCRunner:
         Returns:
             Parsed JSON response
         """
-        self.rate_limiter.wait()
-
-        url = f"{config.QC_API_BASE}{endpoint}"
-        headers = self._get_auth_headers()
-
         for attempt in range(retries):
             try:
-                if method == "GET":
-                    req = urllib.request.Request(url, headers=headers, method="GET")
-                else:
-                    body = json.dumps(data).encode() if data else None
-                    req = urllib.request.Request(url, data=body, headers=headers, method="POST")
-
-                with urllib.request.urlopen(req, timeout=60) as response:
-                    result = json.loads(response.read().decode())
-                    self.rate_limiter.report_success()
-                    return result
-
-            except urllib.error.HTTPError as e:
-                error_body = e.read().decode() if e.fp else str(e)
+                status, text = self.transport.request(method, endpoint, data)
 
                 # Check for rate limit
-                if self._is_rate_limit_error(error_body) or e.code == 429:
+                if status == 429 or (status >= 400 and self._is_rate_limit_error(text)):
                     self.rate_limiter.report_rate_limit()
                     continue
 
-                if attempt < retries - 1:
-                    wait = 2 ** (attempt + 1)
-                    self._log(f"HTTP error {e.code}, retrying in {wait}s...")
-                    time.sleep(wait)
-                    continue
-                raise RuntimeError(f"API call failed: {e.code} - {error_body}")
+                if status >= 400:
+                    tracer.count("api.errors")
+                    if attempt < retries - 1:
+                        wait = 2 ** (attempt + 1)
+                        self._log(f"HTTP error {status}, retrying in {wait}s...")
+                        time.sleep(wait)
+                        continue
+                    raise RuntimeError(f"API call failed: {status} - {text}")
+
+                result = json.loads(text)
+                self.rate_limiter.report_success()
+                return result
+
+            except CassetteMiss:
+                raise
 
             except urllib.error.URLError as e:
+                tracer.count("api.errors")
                 if attempt < retries - 1:
                     wait = 2 ** (attempt + 1)
                     self._log(f"Network error, retrying in {wait}s...")
@@ -264,6 +279,7 @@ class QCRunner:
                     project_id = project["projectId"]
                     print(f"Found existing sandbox project: {project_id}")
                     self.project_id = project_id
+                    self.project_pool = [project_id]
                     return project_id
 
         # Create new project
@@ -273,10 +289,70 @@ class QCRunner:
         if response.get("success") and "projects" in response:
             project_id = response["projects"][0]["projectId"]
             self.project_id = project_id
+            self.project_pool = [project_id]
             return project_id
 
         raise RuntimeError(f"Failed to create sandbox project: {response}")
 
+    def get_or_create_project_pool(
+        self,
+        size: int = None,
+        name: str = None
+    ) -> List[int]:
+        """
+        Get or create a pool of sandbox projects for concurrent backtests.
+
+        Each project holds one main.py, so backtests can only run in
+        parallel across different projects. Pool projects are named
+        "{name}", "{name} 2", ..., "{name} N"; the first is the regular
+        sandbox project.
+
+        Args:
+            size: Number of projects (default: config.SANDBOX_POOL_SIZE)
+            name: Base project name (default: config.SANDBOX_PROJECT_NAME)
+
+        Returns:
+            List of project IDs
+        """
+        size = size or config.SANDBOX_POOL_SIZE
+        name = name or config.SANDBOX_PROJECT_NAME
+        wanted = [name] + [f"{name} {i}" for i in range(2, size + 1)]
+
+        response = self.list_projects()
+        existing = {}
+        if response.get("success"):
+            for project in response.get("projects", []):
+                existing.setdefault(project.get("name"), project["projectId"])
+
+        pool = []
+        for project_name in wanted:
+            if project_name in existing:
+                pool.append(existing[project_name])
+                continue
+
+            print(f"Creating sandbox project: {project_name}")
+            created = self.create_project(project_name)
+            if not (created.get("success") and created.get("projects")):
+                raise RuntimeError(f"Failed to create sandbox project: {created}")
+            pool.append(created["projects"][0]["projectId"])
+
+        print(f"Project pool: {pool}")
+        self.project_pool = pool
+        self.project_id = pool[0]
+        return pool
+
+    def for_project(self, project_id: int) -> "QCRunner":
+        """
+        Get a runner bound to another project.
+
+        The returned runner shares this runner's credentials and rate
+        limiter, so the pool as a whole respects the API limit.
+        """
+        runner = copy.copy(self)
+        runner.project_id = project_id
+        runner.project_pool = [project_id]
+        return runner
+
     def push_code(self, code: str, filename: str = "main.py") -> Dict[str, Any]:
         """
         Push code to the project.
@@ -330,7 +406,8 @@ class QCRunner:
     def run_backtest(
         self,
         name: str,
-        compile_id: str = None
+        compile_id: str = None,
+        parameters: Dict[str, Any] = None
     ) -> Tuple[bool, Optional[str], List[str]]:
         """
         Start a backtest.
@@ -338,6 +415,8 @@ class QCRunner:
         Args:
             name: Backtest name
             compile_id: Compile ID (if None, will compile first)
+            parameters: Algorithm parameters, read in the algorithm
+                        via self.get_parameter()
 
         Returns:
             (success, backtest_id or error message, errors list)
@@ -353,11 +432,14 @@ class QCRunner:
             compile_id = result
 
         # Run backtest
-        response = self._api_call_direct("POST", "/backtests/create", {
+        payload = {
             "projectId": self.project_id,
             "backtestName": name,
             "compileId": compile_id
-        })
+        }
+        if parameters:
+            payload["parameters"] = {k: str(v) for k, v in parameters.items()}
+        response = self._api_call_direct("POST", "/backtests/create", payload)
 
         errors = response.get("errors", [])
 
@@ -385,6 +467,17 @@ class QCRunner:
             "backtestId": backtest_id
         })
 
+    def list_backtests(self) -> Dict[str, Any]:
+        """List the project's backtests (summaries only, no statistics)"""
+        if not self.project_id:
+            raise ValueError("No project ID set.")
+
+        return self._api_call_direct("POST", "/backtests/list", {
+            "projectId": self.project_id,
+            "includeStatistics": False
+        })
+
+    @traced("runner.wait_for_backtest", args=("backtest_id",))
     def wait_for_backtest(
         self,
         backtest_id: str,
@@ -394,28 +487,30 @@ class QCRunner:
         """
         Wait for backtest to complete with progress output.
 
+        Polls adaptively (see core/polling.py): the interval follows the
+        progress-based ETA and backs off while progress is stalled.
+
         Args:
             backtest_id: Backtest ID to wait for
             timeout: Max seconds to wait
-            poll_interval: Seconds between polls
+            poll_interval: Shortest seconds between polls (default: the
+                           polling budget floor for this project pool)
 
         Returns:
             Final backtest results
         """
         if timeout is None:
             timeout = config.BACKTEST_TIMEOUT
-        if poll_interval is None:
-            poll_interval = config.BACKTEST_POLL_INTERVAL
 
-        start_time = time.time()
+        schedule = PollSchedule(min_interval=poll_interval or min_poll_interval(len(self.project_pool) or 1))
         last_progress = ""
 
         while True:
-            elapsed = time.time() - start_time
-            if elapsed > timeout:
+            if schedule.elapsed > timeout:
                 raise TimeoutError(f"Backtest timed out after {timeout}s")
 
             response = self.get_backtest_status(backtest_id)
+            progress = 0
 
             # Check if complete
             if response.get("success"):
@@ -428,27 +523,44 @@ class QCRunner:
                     self._log(f"Progress: {progress_str}", indent=4)
                     last_progress = progress_str
 
-                # QuantConnect uses "completed" field or we check for statistics
-                if backtest.get("completed") or (progress == 1 and backtest.get("statistics")):
+                if is_backtest_finished(backtest):
+                    if backtest.get("error"):
+                        self._log(f"Backtest error: {backtest.get('error')}", indent=4)
+                    elif backtest.get("stacktrace"):
+                        self._log(f"Stack trace detected", indent=4)
                     return response
 
-                # Check for errors in the backtest
-                if backtest.get("error"):
-                    self._log(f"Backtest error: {backtest.get('error')}", indent=4)
-                    return response
+            # Wait before next poll
+            delay = schedule.update(progress)
+            time.sleep(min(delay, max(0.0, timeout - schedule.elapsed) + 0.1))
 
-                if backtest.get("stacktrace"):
-                    self._log(f"Stack trace detected", indent=4)
-                    return response
+    def poll_backtests(self, backtest_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Check many of this project's backtests with one request.
 
-            # Wait before next poll
-            time.sleep(poll_interval)
+        Uses /backtests/list; backtests missing from the listing are read
+        individually.
+
+        Returns:
+            Dict mapping backtest_id to its (summary) backtest dict
+        """
+        listing = self.list_backtests()
+        found = backtests_by_id(listing) if listing.get("success") else {}
+
+        summaries = {}
+        for backtest_id in backtest_ids:
+            if backtest_id in found:
+                summaries[backtest_id] = found[backtest_id]
+            else:
+                summaries[backtest_id] = self.get_backtest_status(backtest_id).get("backtest", {})
+        return summaries
 
     def run_full_backtest(
         self,
         code: str,
         strategy_id: str,
-        backtest_name: str = None
+        backtest_name: str = None,
+        on_start: Callable[[str, int, str, str], None] = None
     ) -> BacktestResult:
         """
         Run a complete backtest: push, compile, run, wait, return results.
@@ -459,6 +571,8 @@ class QCRunner:
             code: Python code to backtest
             strategy_id: Strategy ID for tracking
             backtest_name: Name for the backtest
+            on_start: Optional callback (strategy_id, project_id,
+                      backtest_id, backtest_name) once the backtest is created
 
         Returns:
             BacktestResult with all data including logs
@@ -507,19 +621,41 @@ class QCRunner:
 
         # Step 3: Start backtest (with retry for rate limits)
         self._log("Starting backtest...")
+        backtest_id, failure = self._start_backtest(backtest_name, compile_result, strategy_id)
+        if failure:
+            return failure
+        if on_start:
+            on_start(strategy_id, self.project_id, backtest_id, backtest_name)
+
+        # Step 4-5: Wait for completion and extract results
+        return self._collect_backtest(backtest_id, strategy_id, backtest_name)
+
+    def _start_backtest(
+        self,
+        backtest_name: str,
+        compile_id: str,
+        strategy_id: str,
+        parameters: Dict[str, Any] = None
+    ) -> Tuple[Optional[str], Optional[BacktestResult]]:
+        """
+        Start a backtest, retrying on rate limits.
+
+        Returns:
+            (backtest_id, None) on success, (None, failed BacktestResult) otherwise
+        """
         max_attempts = 3
         for attempt in range(max_attempts):
-            success, backtest_id, bt_errors = self.run_backtest(backtest_name, compile_result)
+            success, backtest_id, bt_errors = self.run_backtest(backtest_name, compile_id, parameters)
 
             if success:
-                break
+                return backtest_id, None
             elif self._is_rate_limit_error(str(backtest_id)):
                 if attempt < max_attempts - 1:
                     self._log(f"Rate limited, attempt {attempt + 2}/{max_attempts}...")
                     continue
             else:
                 self._log(f"Backtest start FAILED: {backtest_id}")
-                return BacktestResult(
+                return None, BacktestResult(
                     backtest_id="",
                     strategy_id=strategy_id,
                     name=backtest_name,
@@ -531,36 +667,61 @@ class QCRunner:
                     runtime_errors=bt_errors
                 )
 
-        if not success:
-            return BacktestResult(
-                backtest_id="",
-                strategy_id=strategy_id,
-                name=backtest_name,
-                status="rate_limited",
-                success=False,
-                error="Rate limited after multiple attempts",
-                statistics={},
-                raw_response={},
-                runtime_errors=["Rate limited"]
-            )
+        return None, BacktestResult(
+            backtest_id="",
+            strategy_id=strategy_id,
+            name=backtest_name,
+            status="rate_limited",
+            success=False,
+            error="Rate limited after multiple attempts",
+            statistics={},
+            raw_response={},
+            runtime_errors=["Rate limited"]
+        )
 
+    def _collect_backtest(
+        self,
+        backtest_id: str,
+        strategy_id: str,
+        backtest_name: str
+    ) -> BacktestResult:
+        """Wait for a started backtest and build its BacktestResult"""
         # Step 4: Wait for completion
         self._log(f"Waiting for completion (backtest_id: {backtest_id})...")
         try:
             response = self.wait_for_backtest(backtest_id)
         except TimeoutError as e:
-            return BacktestResult(
-                backtest_id=backtest_id,
-                strategy_id=strategy_id,
-                name=backtest_name,
-                status="timeout",
-                success=False,
-                error=str(e),
-                statistics={},
-                raw_response={}
-            )
+            return self._timeout_result(backtest_id, strategy_id, backtest_name, str(e))
 
         # Step 5: Extract results and logs
+        return self._build_result(backtest_id, strategy_id, backtest_name, response)
+
+    def _timeout_result(
+        self,
+        backtest_id: str,
+        strategy_id: str,
+        backtest_name: str,
+        error: str
+    ) -> BacktestResult:
+        return BacktestResult(
+            backtest_id=backtest_id,
+            strategy_id=strategy_id,
+            name=backtest_name,
+            status="timeout",
+            success=False,
+            error=error,
+            statistics={},
+            raw_response={}
+        )
+
+    def _build_result(
+        self,
+        backtest_id: str,
+        strategy_id: str,
+        backtest_name: str,
+        response: Dict[str, Any]
+    ) -> BacktestResult:
+        """Build a BacktestResult from a finished /backtests/read response"""
         backtest_data = response.get("backtest", {})
         statistics = backtest_data.get("statistics", {})
         logs = backtest_data.get("logs", [])
@@ -602,6 +763,295 @@ class QCRunner:
             runtime_errors=runtime_errors
         )
 
+    def run_full_backtests(
+        self,
+        jobs: List[Tuple[str, str, str]],
+        on_complete: Callable[[BacktestResult], None] = None,
+        on_start: Callable[[str, int, str, str], None] = None
+    ) -> Dict[str, BacktestResult]:
+        """
+        Run many backtests concurrently across the project pool.
+
+        Each worker checks out a free project, runs push → compile →
+        backtest → wait on it, and returns the project to the pool. All
+        workers share one rate limiter. With a pool of one project this
+        runs serially.
+
+        Args:
+            jobs: List of (code, strategy_id, backtest_name) tuples
+            on_complete: Optional callback invoked (in the calling thread)
+                         as each backtest finishes
+            on_start: Optional callback invoked (in a worker thread) as each
+                      backtest is created; see run_full_backtest
+
+        Returns:
+            Dict mapping strategy_id to BacktestResult
+        """
+        free_projects: "queue.Queue[int]" = queue.Queue()
+        for project_id in self.project_pool:
+            free_projects.put(project_id)
+
+        def run_job(code: str, strategy_id: str, backtest_name: str) -> BacktestResult:
+            project_id = free_projects.get()
+            try:
+                runner = self.for_project(project_id)
+                if len(self.project_pool) > 1:
+                    runner.log_prefix = f"[{strategy_id}] "
+                return runner.run_full_backtest(code, strategy_id, backtest_name, on_start)
+            except Exception as e:
+                return BacktestResult(
+                    backtest_id="",
+                    strategy_id=strategy_id,
+                    name=backtest_name,
+                    status="error",
+                    success=False,
+                    error=str(e),
+                    statistics={},
+                    raw_response={},
+                    runtime_errors=[str(e)]
+                )
+            finally:
+                free_projects.put(project_id)
+
+        results = {}
+        with ThreadPoolExecutor(max_workers=len(self.project_pool)) as executor:
+            futures = [executor.submit(run_job, *job) for job in jobs]
+            for future in as_completed(futures):
+                result = future.result()
+                results[result.strategy_id] = result
+                if on_complete:
+                    on_complete(result)
+
+        return results
+
+    def run_parameterized_backtests(
+        self,
+        code: str,
+        variants: List[Tuple[str, str, Dict[str, Any]]],
+        on_complete: Callable[[BacktestResult], None] = None,
+        on_start: Callable[[str, int, str, str], None] = None
+    ) -> Dict[str, BacktestResult]:
+        """
+        Backtest many parameter sets of one parameterized algorithm.
+
+        The code is pushed and compiled once per project; every variant is
+        then started against its project's compile ID with its own
+        parameters (see StrategyCompiler.compile_parameterized). With a
+        project pool, the variants are spread across the projects, which
+        run their shares concurrently. Up to config.MAX_BACKTESTS_IN_FLIGHT
+        backtests run at a time per project.
+
+        Args:
+            code: Parameterized Python code
+            variants: List of (strategy_id, backtest_name, parameters) tuples
+            on_complete: Optional callback invoked as each backtest finishes
+            on_start: Optional callback invoked as each backtest is created;
+                      see run_full_backtest
+
+        Returns:
+            Dict mapping strategy_id to BacktestResult
+        """
+        if len(self.project_pool) > 1 and len(variants) > 1:
+            return self._run_parameterized_on_pool(code, variants, on_complete, on_start)
+
+        results = {}
+
+        def finish(result: BacktestResult):
+            results[result.strategy_id] = result
+            if on_complete:
+                on_complete(result)
+
+        def fail_all(status: str, error: str, raw: Dict[str, Any], logs: List[str] = None):
+            for strategy_id, backtest_name, _ in variants:
+                finish(BacktestResult(
+                    backtest_id="",
+                    strategy_id=strategy_id,
+                    name=backtest_name,
+                    status=status,
+                    success=False,
+                    error=error,
+                    statistics={},
+                    raw_response=raw,
+                    logs=logs or [],
+                    runtime_errors=logs or [error]
+                ))
+            return results
+
+        self._log(f"Pushing parameterized code ({len(variants)} variants)...")
+        push_response = self.push_code(code)
+        if not push_response.get("success"):
+            error_msg = str(push_response.get("errors", "Push failed"))
+            self._log(f"Push FAILED: {error_msg}")
+            return fail_all("push_failed", error_msg, push_response)
+
+        self._log("Compiling...")
+        success, compile_id, compile_logs = self.compile_project()
+        if not success:
+            self._log(f"Compile FAILED: {compile_id}")
+            return fail_all("compile_failed", compile_id, {"compile_error": compile_id}, compile_logs)
+
+        # backtest_id -> (strategy_id, backtest_name, PollSchedule). All
+        # in-flight backtests share one /backtests/list request per poll.
+        in_flight: Dict[str, Tuple[str, str, PollSchedule]] = {}
+        pending = list(variants)
+        while pending or in_flight:
+            while pending and len(in_flight) < config.MAX_BACKTESTS_IN_FLIGHT:
+                strategy_id, backtest_name, parameters = pending.pop(0)
+                self._log(f"Starting {backtest_name} {parameters}")
+                backtest_id, failure = self._start_backtest(
+                    backtest_name, compile_id, strategy_id, parameters
+                )
+                if failure:
+                    finish(failure)
+                else:
+                    in_flight[backtest_id] = (strategy_id, backtest_name, PollSchedule())
+                    if on_start:
+                        on_start(strategy_id, self.project_id, backtest_id, backtest_name)
+
+            if not in_flight:
+                continue
+
+            next_poll = min(schedule.next_poll_at for _, _, schedule in in_flight.values())
+            time.sleep(max(0.0, next_poll - time.time()))
+
+            summaries = self.poll_backtests(list(in_flight))
+            for backtest_id, backtest in summaries.items():
+                strategy_id, backtest_name, schedule = in_flight[backtest_id]
+                if is_backtest_finished(backtest):
+                    del in_flight[backtest_id]
+                    response = self.get_backtest_status(backtest_id)
+                    finish(self._build_result(backtest_id, strategy_id, backtest_name, response))
+                elif schedule.elapsed > config.BACKTEST_TIMEOUT:
+                    del in_flight[backtest_id]
+                    finish(self._timeout_result(
+                        backtest_id, strategy_id, backtest_name,
+                        f"Backtest timed out after {config.BACKTEST_TIMEOUT}s"
+                    ))
+                else:
+                    schedule.update(backtest.get("progress", 0))
+
+        return results
+
+    def _run_parameterized_on_pool(
+        self,
+        code: str,
+        variants: List[Tuple[str, str, Dict[str, Any]]],
+        on_complete: Callable[[BacktestResult], None] = None,
+        on_start: Callable[[str, int, str, str], None] = None
+    ) -> Dict[str, BacktestResult]:
+        """
+        run_parameterized_backtests across the project pool: each project
+        pushes and compiles the code once and runs an equal share of the
+        variants. on_complete is invoked in the calling thread.
+        """
+        shares = [variants[i::len(self.project_pool)] for i in range(len(self.project_pool))]
+        finished: "queue.Queue[BacktestResult]" = queue.Queue()
+
+        def run_share(project_id: int, share: List[Tuple[str, str, Dict[str, Any]]]):
+            reported = set()
+
+            def report(result: BacktestResult):
+                reported.add(result.strategy_id)
+                finished.put(result)
+
+            runner = self.for_project(project_id)
+            runner.log_prefix = f"[{project_id}] "
+            try:
+                runner.run_parameterized_backtests(code, share, on_complete=report, on_start=on_start)
+            except Exception as e:
+                for strategy_id, backtest_name, _ in share:
+                    if strategy_id not in reported:
+                        finished.put(BacktestResult(
+                            backtest_id="",
+                            strategy_id=strategy_id,
+                            name=backtest_name,
+                            status="error",
+                            success=False,
+                            error=str(e),
+                            statistics={},
+                            raw_response={},
+                            runtime_errors=[str(e)]
+                        ))
+
+        results = {}
+        with ThreadPoolExecutor(max_workers=len(shares)) as executor:
+            for project_id, share in zip(self.project_pool, shares):
+                if share:
+                    executor.submit(run_share, project_id, share)
+            for _ in range(len(variants)):
+                result = finished.get()
+                results[result.strategy_id] = result
+                if on_complete:
+                    on_complete(result)
+
+        return results
+
+    def collect_backtests(
+        self,
+        started: List[Tuple[str, int, str, str]],
+        on_complete: Callable[[BacktestResult], None] = None
+    ) -> Dict[str, BacktestResult]:
+        """
+        Re-attach to backtests started earlier (e.g. by an interrupted
+        pipeline run) and wait for their results.
+
+        Backtests QuantConnect no longer knows about come back with status
+        "not_found", so the caller can start them again.
+
+        Args:
+            started: List of (strategy_id, project_id, backtest_id, backtest_name)
+            on_complete: Optional callback invoked (in the calling thread)
+                         as each backtest finishes
+
+        Returns:
+            Dict mapping strategy_id to BacktestResult
+        """
+        def collect(strategy_id: str, project_id: int, backtest_id: str, backtest_name: str) -> BacktestResult:
+            runner = self.for_project(project_id)
+            runner.log_prefix = f"[{strategy_id}] "
+            try:
+                found = runner.get_backtest_status(backtest_id).get("success")
+            except Exception:
+                found = False
+            if not found:
+                return BacktestResult(
+                    backtest_id="",
+                    strategy_id=strategy_id,
+                    name=backtest_name,
+                    status="not_found",
+                    success=False,
+                    error=f"Backtest {backtest_id} not found in project {project_id}",
+                    statistics={},
+                    raw_response={}
+                )
+            return runner._collect_backtest(backtest_id, strategy_id, backtest_name)
+
+        results = {}
+        workers = max(1, min(len(started), config.MAX_BACKTESTS_IN_FLIGHT))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(collect, *entry) for entry in started]
+            for future in as_completed(futures):
+                result = future.result()
+                results[result.strategy_id] = result
+                if on_complete:
+                    on_complete(result)
+
+        return results
+
+    def async_client(self, max_connections: int = None) -> "AsyncQCClient":
+        """
+        Get an asyncio client sharing this runner's credentials.
+
+        See core/async_client.py. Useful for keeping many backtests in
+        flight while polling without blocking.
+        """
+        from core.async_client import AsyncQCClient
+        return AsyncQCClient(
+            self.user_id, self.api_token,
+            max_connections=max_connections,
+            cassette=self.transport.cassette
+        )
+
     def validate_strategy_execution(self, result: BacktestResult) -> Dict[str, Any]:
         """
         Validate that a strategy actually executed properly.
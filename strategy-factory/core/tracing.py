@@ -0,0 +1,392 @@
+"""
+Tracing and Metrics
+
+Lightweight instrumentation shared by the runner, async client, compiler,
+parser and pipeline:
+- spans: named, timed sections with attributes (nested spans allowed)
+- counters: monotonically increasing totals (requests, rate-limit hits)
+- histograms: observed values (request latency, rate-limiter waits)
+
+Instrumentation goes through the module-level `tracer`, which is disabled
+by default; a disabled tracer's span() returns a shared no-op context
+manager, so instrumented code costs one attribute check.
+
+Recorded events export as JSON lines (one event per line) or as a Chrome
+trace (open in chrome://tracing or https://ui.perfetto.dev), where each
+thread and each asyncio task gets its own track:
+
+    tracer.enable()
+    ...
+    tracer.export("trace.json")    # Chrome trace
+    tracer.export("trace.jsonl")   # JSON lines
+    print(tracer.format_summary())
+"""
+
+import os
+import json
+import time
+import asyncio
+import inspect
+import threading
+import functools
+import contextlib
+from typing import Dict, Any, List, Optional, Tuple, Callable, Hashable
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+
+
+_NULL_SPAN = contextlib.nullcontext({})
+
+
+def _lane_key() -> Tuple[Hashable, str]:
+    """Identity and label of the current execution lane (asyncio task or thread)"""
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    if task is not None:
+        return ("task", id(task)), f"task {task.get_name()}"
+    thread = threading.current_thread()
+    return ("thread", thread.ident), thread.name
+
+
+def _percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class Tracer:
+    """
+    Thread-safe recorder of spans, counters and histograms.
+
+    Usage:
+        tracer.enable()
+        with tracer.span("api.call", endpoint="/backtests/read") as attrs:
+            ...
+            attrs["status"] = 200
+        tracer.count("api.requests")
+        tracer.observe("api.latency", 0.21)
+    """
+
+    def __init__(self, max_events: int = None):
+        """
+        Args:
+            max_events: Events kept before further events are dropped
+                        (default: config.TRACE_MAX_EVENTS)
+        """
+        self.max_events = max_events or config.TRACE_MAX_EVENTS
+        self.enabled = False
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Discard all recorded events, counters and histograms"""
+        with self._lock:
+            self.events: List[Dict[str, Any]] = []
+            self.counters: Dict[str, float] = {}
+            self.histograms: Dict[str, List[float]] = {}
+            self.dropped = 0
+            self._lanes: Dict[Hashable, Tuple[int, str]] = {}
+            self._origin = time.perf_counter()
+            self._origin_wall = time.time()
+
+    def enable(self):
+        """Start recording (clears anything recorded before)"""
+        self.reset()
+        self.enabled = True
+
+    def disable(self):
+        """Stop recording (recorded events are kept for export)"""
+        self.enabled = False
+
+    def _now(self) -> float:
+        return time.perf_counter() - self._origin
+
+    def _lane(self) -> int:
+        key, label = _lane_key()
+        lane = self._lanes.get(key)
+        if lane is None:
+            lane = (len(self._lanes) + 1, label)
+            self._lanes[key] = lane
+        return lane[0]
+
+    def _append(self, event: Dict[str, Any]):
+        if len(self.events) < self.max_events:
+            self.events.append(event)
+        else:
+            self.dropped += 1
+
+    def span(self, name: str, **attrs):
+        """
+        Context manager timing a section of code.
+
+        Yields the span's attribute dict, so attributes known only at the
+        end (status codes, result sizes) can be added inside the block.
+        Exceptions are recorded in the "error" attribute and re-raised.
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return self._span(name, attrs)
+
+    @contextlib.contextmanager
+    def _span(self, name: str, attrs: Dict[str, Any]):
+        start = self._now()
+        try:
+            yield attrs
+        except BaseException as e:
+            attrs["error"] = type(e).__name__
+            raise
+        finally:
+            end = self._now()
+            with self._lock:
+                self._append({
+                    "type": "span",
+                    "name": name,
+                    "start": start,
+                    "duration": end - start,
+                    "lane": self._lane(),
+                    "attrs": attrs,
+                })
+
+    def count(self, name: str, value: float = 1):
+        """Add to a counter"""
+        if not self.enabled:
+            return
+        with self._lock:
+            total = self.counters.get(name, 0) + value
+            self.counters[name] = total
+            self._append({"type": "counter", "name": name, "start": self._now(), "value": total})
+
+    def observe(self, name: str, value: float):
+        """Record a histogram observation"""
+        if not self.enabled:
+            return
+        with self._lock:
+            values = self.histograms.setdefault(name, [])
+            if len(values) < self.max_events:
+                values.append(value)
+            else:
+                self.dropped += 1
+
+    # -------------------------------------------------------------------------
+    # Reporting
+    # -------------------------------------------------------------------------
+
+    def summary(self) -> Dict[str, Any]:
+        """Span totals, counters and histogram statistics"""
+        with self._lock:
+            events = list(self.events)
+            counters = dict(self.counters)
+            histograms = {name: list(values) for name, values in self.histograms.items()}
+
+        spans: Dict[str, Dict[str, float]] = {}
+        for event in events:
+            if event["type"] != "span":
+                continue
+            stats = spans.setdefault(event["name"], {"count": 0, "total": 0.0, "max": 0.0, "errors": 0})
+            stats["count"] += 1
+            stats["total"] += event["duration"]
+            stats["max"] = max(stats["max"], event["duration"])
+            stats["errors"] += "error" in event["attrs"]
+        for stats in spans.values():
+            stats["mean"] = stats["total"] / stats["count"]
+
+        return {
+            "spans": spans,
+            "counters": counters,
+            "histograms": {
+                name: {
+                    "count": len(values),
+                    "sum": sum(values),
+                    "mean": sum(values) / len(values),
+                    "p50": _percentile(values, 0.50),
+                    "p95": _percentile(values, 0.95),
+                    "max": max(values),
+                }
+                for name, values in histograms.items() if values
+            },
+            "dropped_events": self.dropped,
+        }
+
+    def format_summary(self) -> str:
+        """Human-readable summary table"""
+        summary = self.summary()
+        lines = [f"{'Span':<36} {'Count':>7} {'Total s':>10} {'Mean ms':>10} {'Max ms':>10}"]
+        for name, s in sorted(summary["spans"].items(), key=lambda item: -item[1]["total"]):
+            errors = f"  ({s['errors']} errors)" if s["errors"] else ""
+            lines.append(f"{name:<36} {s['count']:>7} {s['total']:>10.2f} "
+                         f"{s['mean'] * 1000:>10.1f} {s['max'] * 1000:>10.1f}{errors}")
+        if summary["counters"]:
+            lines.append("")
+            lines.extend(f"{name:<36} {value:>7g}" for name, value in sorted(summary["counters"].items()))
+        if summary["histograms"]:
+            lines.append("")
+            lines.append(f"{'Histogram':<36} {'Count':>7} {'Mean':>10} {'p50':>10} {'p95':>10} {'Max':>10}")
+            for name, h in sorted(summary["histograms"].items()):
+                lines.append(f"{name:<36} {h['count']:>7} {h['mean']:>10.3f} {h['p50']:>10.3f} "
+                             f"{h['p95']:>10.3f} {h['max']:>10.3f}")
+        if summary["dropped_events"]:
+            lines.append(f"\n{summary['dropped_events']} events dropped (TRACE_MAX_EVENTS={self.max_events})")
+        return "\n".join(lines)
+
+    # -------------------------------------------------------------------------
+    # Export
+    # -------------------------------------------------------------------------
+
+    def export_jsonl(self, path: str) -> str:
+        """
+        Write one JSON object per event; times are seconds since enable(),
+        plus a final summary line with the wall-clock origin.
+        """
+        with self._lock:
+            events = list(self.events)
+            lanes = {lane: label for lane, label in self._lanes.values()}
+
+        with open(path, 'w') as f:
+            for event in events:
+                record = dict(event)
+                if "lane" in record:
+                    record["lane"] = lanes.get(record["lane"], record["lane"])
+                f.write(json.dumps(record, default=str) + "\n")
+            f.write(json.dumps({"type": "summary", "origin": self._origin_wall, **self.summary()},
+                               default=str) + "\n")
+        return path
+
+    def export_chrome(self, path: str) -> str:
+        """Write a Chrome trace event file (chrome://tracing, Perfetto)"""
+        pid = os.getpid()
+        with self._lock:
+            events = list(self.events)
+            lanes = list(self._lanes.values())
+
+        trace = [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": lane, "args": {"name": label}}
+            for lane, label in lanes
+        ]
+        for event in events:
+            ts = event["start"] * 1e6
+            if event["type"] == "span":
+                trace.append({
+                    "name": event["name"],
+                    "cat": event["name"].split(".")[0],
+                    "ph": "X",
+                    "ts": ts,
+                    "dur": event["duration"] * 1e6,
+                    "pid": pid,
+                    "tid": event["lane"],
+                    "args": {k: v if isinstance(v, (int, float, bool)) else str(v)
+                             for k, v in event["attrs"].items()},
+                })
+            else:
+                trace.append({"name": event["name"], "ph": "C", "ts": ts, "pid": pid,
+                              "args": {"value": event["value"]}})
+
+        with open(path, 'w') as f:
+            json.dump({"traceEvents": trace, "displayTimeUnit": "ms",
+                       "otherData": {"origin": self._origin_wall}}, f)
+        return path
+
+    def export(self, path: str) -> str:
+        """Export as JSON lines (.jsonl) or a Chrome trace (anything else)"""
+        if path.endswith(".jsonl"):
+            return self.export_jsonl(path)
+        return self.export_chrome(path)
+
+
+tracer = Tracer()
+
+
+def traced(name: str, args: Tuple[str, ...] = ()) -> Callable:
+    """
+    Decorator wrapping a function (or coroutine function) in a span.
+
+    Args:
+        name: Span name
+        args: Argument names recorded as span attributes
+    """
+    def decorator(fn: Callable) -> Callable:
+        signature = inspect.signature(fn)
+
+        def attributes(call_args, call_kwargs) -> Dict[str, Any]:
+            if not args:
+                return {}
+            bound = signature.bind_partial(*call_args, **call_kwargs).arguments
+            return {arg: bound[arg] for arg in args if arg in bound}
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*call_args, **call_kwargs):
+                if not tracer.enabled:
+                    return await fn(*call_args, **call_kwargs)
+                with tracer.span(name, **attributes(call_args, call_kwargs)):
+                    return await fn(*call_args, **call_kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*call_args, **call_kwargs):
+            if not tracer.enabled:
+                return fn(*call_args, **call_kwargs)
+            with tracer.span(name, **attributes(call_args, call_kwargs)):
+                return fn(*call_args, **call_kwargs)
+        return wrapper
+
+    return decorator
+
+
+# =============================================================================
+# TESTING
+# =============================================================================
+
+if __name__ == "__main__":
+    import tempfile
+    from concurrent.futures import ThreadPoolExecutor
+
+    print("Testing Tracing...")
+
+    @traced("demo.work", args=("n",))
+    def work(n: int) -> int:
+        with tracer.span("demo.inner"):
+            time.sleep(0.01 * n)
+        tracer.count("demo.items", n)
+        tracer.observe("demo.latency", 0.01 * n)
+        return n
+
+    @traced("demo.async_work")
+    async def async_work(n: int):
+        await asyncio.sleep(0.01 * n)
+
+    async def gather():
+        await asyncio.gather(*(async_work(n) for n in range(4)))
+
+    start = time.perf_counter()
+    for _ in range(10000):
+        with tracer.span("disabled"):
+            pass
+    print(f"  Disabled span overhead: {(time.perf_counter() - start) / 10000 * 1e6:.2f}us per span")
+
+    tracer.enable()
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        list(pool.map(work, range(1, 7)))
+    asyncio.run(gather())
+    try:
+        with tracer.span("demo.failing"):
+            raise ValueError("boom")
+    except ValueError:
+        pass
+    tracer.disable()
+
+    print()
+    print(tracer.format_summary())
+
+    with tempfile.TemporaryDirectory() as tmp:
+        chrome = tracer.export(os.path.join(tmp, "trace.json"))
+        lines = tracer.export(os.path.join(tmp, "trace.jsonl"))
+        with open(chrome) as f:
+            events = json.load(f)["traceEvents"]
+        with open(lines) as f:
+            records = [json.loads(line) for line in f]
+        print(f"\n  Chrome trace: {len(events)} events on {sum(e['ph'] == 'M' for e in events)} tracks")
+        print(f"  JSON lines: {len(records)} records")
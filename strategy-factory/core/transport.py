@@ -0,0 +1,318 @@
+"""
+QC API Transport
+
+One HTTP transport for everything that talks to the QuantConnect API
+(QCRunner, AsyncQCClient, and the P&L / project scripts in scripts/), with
+an optional record/replay cassette.
+
+A cassette stores API responses on disk, keyed by method, endpoint and
+JSON payload:
+
+    {cassette_dir}/{endpoint}/{sha256 of method+endpoint+payload}.json
+
+Each file keeps the request and the responses recorded for it, in order.
+Repeated identical requests (e.g. polling /backtests/read) replay those
+responses in sequence and then repeat the last one, so a replayed poll
+loop finishes as soon as the recorded backtest did.
+
+Modes (config.QC_CASSETTE_MODE, or the QC_CASSETTE environment variable):
+    record  always call the API and store every successful response
+    replay  serve only from the cassette; a missing response is an error
+            (no network and no credentials needed)
+    auto    serve from the cassette when possible, else call the API and
+            record the response
+"""
+
+import os
+import json
+import time
+import base64
+import hashlib
+import threading
+import urllib.request
+import urllib.error
+from typing import Dict, Any, Optional, Tuple
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.tracing import tracer
+import config
+
+
+CASSETTE_MODES = ("record", "replay", "auto")
+
+# Payload fields that vary between otherwise identical runs and are left
+# out of cassette keys (backtest names embed timestamps)
+IGNORED_PAYLOAD_FIELDS = ("backtestName",)
+
+
+def make_auth_headers(user_id: str, api_token: str) -> Dict[str, str]:
+    """Generate timestamped SHA-256 authentication headers for the QC API"""
+    timestamp = str(int(time.time()))
+    hash_input = f"{api_token}:{timestamp}"
+    hash_hex = hashlib.sha256(hash_input.encode()).hexdigest()
+    auth_string = f"{user_id}:{hash_hex}"
+    auth_b64 = base64.b64encode(auth_string.encode()).decode()
+
+    return {
+        "Authorization": f"Basic {auth_b64}",
+        "Timestamp": timestamp,
+        "Content-Type": "application/json"
+    }
+
+
+class CassetteMiss(RuntimeError):
+    """A replay-mode request has no recorded response"""
+
+
+class Cassette:
+    """
+    On-disk store of recorded API responses.
+
+    Usage:
+        cassette = Cassette(mode="auto")
+        hit = cassette.play("POST", "/backtests/read", payload)
+        if hit is None:
+            status, body = <call the API>
+            cassette.record("POST", "/backtests/read", payload, status, body)
+    """
+
+    def __init__(self, path: str = None, mode: str = "auto"):
+        """
+        Args:
+            path: Cassette directory (default: config.QC_CASSETTE_DIR)
+            mode: "record", "replay" or "auto"
+        """
+        if mode not in CASSETTE_MODES:
+            raise ValueError(f"Unknown cassette mode: {mode} (expected one of {CASSETTE_MODES})")
+        self.path = path or config.QC_CASSETTE_DIR
+        self.mode = mode
+        self._tapes: Dict[str, Dict[str, Any]] = {}   # key -> loaded file contents
+        self._positions: Dict[str, int] = {}          # key -> next response to replay
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.recorded = 0
+
+    @staticmethod
+    def key(method: str, endpoint: str, payload: Optional[Dict[str, Any]]) -> str:
+        """Cassette key of a request"""
+        payload = {k: v for k, v in (payload or {}).items() if k not in IGNORED_PAYLOAD_FIELDS}
+        canonical = json.dumps([method.upper(), endpoint, payload], sort_keys=True, default=str)
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    def _file(self, endpoint: str, key: str) -> str:
+        return os.path.join(self.path, endpoint.strip("/").replace("/", "_"), f"{key}.json")
+
+    def _tape(self, endpoint: str, key: str) -> Optional[Dict[str, Any]]:
+        if key not in self._tapes:
+            path = self._file(endpoint, key)
+            if not os.path.exists(path):
+                return None
+            with open(path, 'r') as f:
+                self._tapes[key] = json.load(f)
+        return self._tapes[key]
+
+    def play(self, method: str, endpoint: str, payload: Optional[Dict[str, Any]]) -> Optional[Tuple[int, str]]:
+        """
+        Next recorded response for a request.
+
+        Returns:
+            (status, body), or None if the request should go to the API
+
+        Raises:
+            CassetteMiss: In replay mode, when nothing was recorded
+        """
+        if self.mode == "record":
+            return None
+
+        key = self.key(method, endpoint, payload)
+        with self._lock:
+            tape = self._tape(endpoint, key)
+            if tape is None or not tape["responses"]:
+                self.misses += 1
+                if self.mode == "replay":
+                    raise CassetteMiss(f"No recorded response for {method} {endpoint} {json.dumps(payload, default=str)[:200]}")
+                return None
+
+            position = self._positions.get(key, 0)
+            response = tape["responses"][min(position, len(tape["responses"]) - 1)]
+            self._positions[key] = position + 1
+            self.hits += 1
+
+        body = response["body"]
+        return response["status"], body if isinstance(body, str) else json.dumps(body)
+
+    def record(self, method: str, endpoint: str, payload: Optional[Dict[str, Any]], status: int, body: str):
+        """Store a successful response (errors and 429s are not recorded)"""
+        if self.mode == "replay" or status >= 400:
+            return
+
+        key = self.key(method, endpoint, payload)
+        try:
+            stored: Any = json.loads(body)
+        except ValueError:
+            stored = body
+
+        with self._lock:
+            tape = self._tape(endpoint, key)
+            if tape is None or key not in self._positions:
+                # First response recorded for this key in this session
+                # replaces whatever an earlier session recorded
+                tape = {"method": method.upper(), "endpoint": endpoint, "payload": payload, "responses": []}
+                self._tapes[key] = tape
+                self._positions[key] = 0
+            tape["responses"].append({"status": status, "body": stored})
+            self._positions[key] += 1
+            self.recorded += 1
+
+            path = self._file(endpoint, key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.tmp"
+            with open(tmp, 'w') as f:
+                json.dump(tape, f, indent=2, default=str)
+            os.replace(tmp, path)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"mode": self.mode, "hits": self.hits, "misses": self.misses, "recorded": self.recorded}
+
+
+class HTTPTransport:
+    """
+    Blocking QC API transport (urllib), optionally through a cassette.
+
+    request() returns the raw (status, body) so callers keep their own
+    retry and rate-limit handling; call() is a convenience for scripts
+    that just want the JSON.
+    """
+
+    def __init__(
+        self,
+        user_id: str = None,
+        api_token: str = None,
+        api_base: str = None,
+        rate_limiter=None,
+        cassette: Cassette = None,
+        timeout: float = 60
+    ):
+        """
+        Args:
+            user_id: QC user ID (default: QC_USER_ID env var)
+            api_token: QC API token (default: QC_API_TOKEN env var)
+            api_base: API base URL (default: config.QC_API_BASE at call time)
+            rate_limiter: Object with wait(), called before each network request
+            cassette: Record/replay cassette (default: none)
+            timeout: Socket timeout in seconds
+        """
+        self.user_id = user_id or os.environ.get("QC_USER_ID")
+        self.api_token = api_token or os.environ.get("QC_API_TOKEN")
+        self.api_base = api_base
+        self.rate_limiter = rate_limiter
+        self.cassette = cassette
+        self.timeout = timeout
+
+        if not self.offline and (not self.user_id or not self.api_token):
+            raise ValueError("QC_USER_ID and QC_API_TOKEN must be set")
+
+    @property
+    def offline(self) -> bool:
+        """True when every response comes from the cassette"""
+        return self.cassette is not None and self.cassette.mode == "replay"
+
+    def request(self, method: str, endpoint: str, payload: Dict[str, Any] = None) -> Tuple[int, str]:
+        """
+        Perform one API request.
+
+        Returns:
+            (HTTP status, response body)
+
+        Raises:
+            urllib.error.URLError: On network failure
+            CassetteMiss: In replay mode, when nothing was recorded
+        """
+        if self.cassette is not None:
+            hit = self.cassette.play(method, endpoint, payload)
+            if hit is not None:
+                tracer.count("cassette.replayed")
+                return hit
+
+        if self.rate_limiter is not None:
+            self.rate_limiter.wait()
+
+        url = f"{self.api_base or config.QC_API_BASE}{endpoint}"
+        headers = make_auth_headers(self.user_id, self.api_token)
+        body = json.dumps(payload).encode() if payload and method != "GET" else None
+        req = urllib.request.Request(url, data=body, headers=headers, method=method)
+        start = time.perf_counter()
+        with tracer.span("api.request", endpoint=endpoint) as span:
+            try:
+                with urllib.request.urlopen(req, timeout=self.timeout) as response:
+                    status, text = response.status, response.read().decode()
+            except urllib.error.HTTPError as e:
+                status, text = e.code, e.read().decode() if e.fp else str(e)
+            span["status"] = status
+        tracer.count("api.requests")
+        tracer.observe("api.latency_seconds", time.perf_counter() - start)
+
+        if self.cassette is not None:
+            self.cassette.record(method, endpoint, payload, status, text)
+        return status, text
+
+    def call(self, method: str, endpoint: str, payload: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Perform a request and parse the JSON response (RuntimeError on HTTP errors)"""
+        status, text = self.request(method, endpoint, payload)
+        if status >= 400:
+            raise RuntimeError(f"API call failed: {status} - {text}")
+        return json.loads(text)
+
+
+def get_cassette(mode: str = None, path: str = None) -> Optional[Cassette]:
+    """Cassette for a mode (default: config.QC_CASSETTE_MODE); None when off"""
+    mode = mode or config.QC_CASSETTE_MODE
+    if not mode or mode == "off":
+        return None
+    return Cassette(path, mode)
+
+
+def get_transport(rate_limiter=None, mode: str = None, path: str = None) -> HTTPTransport:
+    """Transport with credentials from the environment and the configured cassette"""
+    return HTTPTransport(rate_limiter=rate_limiter, cassette=get_cassette(mode, path))
+
+
+# =============================================================================
+# TESTING
+# =============================================================================
+
+if __name__ == "__main__":
+    import tempfile
+    from core.mock_qc_server import MockQCServer
+
+    print("Testing QC API Transport...")
+
+    with tempfile.TemporaryDirectory() as tmp, MockQCServer(latency=0.05, rate_limit=0) as server:
+        os.environ.setdefault("QC_USER_ID", "0")
+        os.environ.setdefault("QC_API_TOKEN", "mock")
+        project = HTTPTransport(api_base=server.url).call("POST", "/projects/create", {"name": "Cassette Test"})
+        payload = {"projectId": project["projects"][0]["projectId"]}
+
+        recorder = HTTPTransport(api_base=server.url, cassette=Cassette(tmp, "record"))
+        start = time.time()
+        for _ in range(20):
+            recorder.call("POST", "/projects/read", payload)
+        print(f"  Record: 20 calls in {(time.time() - start) * 1000:.0f}ms, {recorder.cassette.stats()}")
+
+        server.stop()
+        player = HTTPTransport(user_id="", api_token="", cassette=Cassette(tmp, "replay"))
+        start = time.time()
+        for _ in range(20):
+            response = player.call("POST", "/projects/read", payload)
+        print(f"  Replay (server stopped, no credentials): 20 calls in {(time.time() - start) * 1000:.1f}ms, "
+              f"{player.cassette.stats()}")
+        print(f"  Replayed project: {response['projects'][0]['name']}")
+
+        try:
+            player.call("POST", "/backtests/read", {"backtestId": "missing"})
+        except CassetteMiss as e:
+            print(f"  Miss in replay mode: {str(e)[:50]}...")
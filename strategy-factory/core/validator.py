@@ -7,7 +7,7 @@ strategies are robust and not overfit.
 
 import os
 from typing import Dict, Any, List, Tuple, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 
 import sys
@@ -48,6 +48,9 @@ class ValidationResult:
     is_valid: bool
     validation_notes: List[str]
 
+    # Out-of-sample Sharpe of each anchored fold (empty if none were run)
+    fold_sharpes: List[float] = field(default_factory=list)
+
     def get_summary(self) -> str:
         """Get human-readable summary"""
         status = "VALID" if self.is_valid else "INVALID"
@@ -55,6 +58,7 @@ class ValidationResult:
             f"{self.name} - {status}\n"
             f"  Walk-Forward: Train={self.train_sharpe:.2f}, "
             f"Val={self.validate_sharpe:.2f}, Test={self.test_sharpe:.2f}\n"
+            + (f"  Folds: {', '.join(f'{s:.2f}' for s in self.fold_sharpes)}\n" if self.fold_sharpes else "") +
             f"  Consistency: {self.consistency_score:.2f}, "
             f"Regime Robustness: {self.regime_robustness:.2f}\n"
             f"  Notes: {'; '.join(self.validation_notes)}"
@@ -153,6 +157,26 @@ class StrategyValidator:
 
         return passes, consistency_score, notes
 
+    def validate_folds(self, fold_metrics: List[Optional[ParsedMetrics]]) -> Tuple[bool, List[str]]:
+        """
+        Validate anchored walk-forward folds.
+
+        Args:
+            fold_metrics: Out-of-sample results of each fold (None = failed)
+
+        Returns:
+            (passes, notes)
+        """
+        sharpes = [m.sharpe_ratio if m else 0 for m in fold_metrics]
+        profitable = sum(1 for s in sharpes if s > 0)
+        share = profitable / len(sharpes) if sharpes else 0
+
+        notes = [f"Profitable in {profitable}/{len(sharpes)} anchored folds"]
+        passes = share >= config.WALK_FORWARD_MIN_PROFITABLE_FOLDS
+        if not passes:
+            notes.append("Anchored fold validation failed")
+        return passes, notes
+
     def analyze_regime_robustness(
         self,
         metrics: ParsedMetrics,
@@ -227,7 +251,8 @@ class StrategyValidator:
         full_metrics: ParsedMetrics,
         train_metrics: ParsedMetrics = None,
         validate_metrics: ParsedMetrics = None,
-        test_metrics: ParsedMetrics = None
+        test_metrics: ParsedMetrics = None,
+        fold_metrics: List[Optional[ParsedMetrics]] = None
     ) -> ValidationResult:
         """
         Full validation of a strategy.
@@ -239,6 +264,7 @@ class StrategyValidator:
             train_metrics: Optional training period metrics
             validate_metrics: Optional validation period metrics
             test_metrics: Optional test period metrics
+            fold_metrics: Optional out-of-sample metrics of anchored folds
 
         Returns:
             ValidationResult
@@ -257,6 +283,11 @@ class StrategyValidator:
             consistency = 0.5 if passes_wf else 0
             notes.append("No walk-forward data, using full period only")
 
+        if fold_metrics:
+            passes_folds, fold_notes = self.validate_folds(fold_metrics)
+            passes_wf = passes_wf and passes_folds
+            notes.extend(fold_notes)
+
         # Regime analysis
         regime_score, regime_returns, regime_notes = self.analyze_regime_robustness(full_metrics)
         notes.extend(regime_notes)
@@ -288,7 +319,8 @@ class StrategyValidator:
             sideways_return=regime_returns.get("sideways"),
             regime_robustness=regime_score,
             is_valid=is_valid,
-            validation_notes=notes
+            validation_notes=notes,
+            fold_sharpes=[m.sharpe_ratio if m else 0 for m in fold_metrics or []]
         )
 
     def quick_validate(self, metrics: ParsedMetrics) -> Tuple[bool, List[str]]:
@@ -403,6 +435,12 @@ if __name__ == "__main__":
     result2 = validator.validate("test-overfit", "Overfit Strategy", full2, train2, validate2, test2)
     print(result2.get_summary())
 
+    # Test 2b: Anchored folds
+    print("\nTest 2b: Good Strategy with Anchored Folds")
+    folds = [create_mock_metrics(s, 0.1, 0.15, 30, "Fold") for s in (1.1, -0.2, 0.9)]
+    result3 = validator.validate("test-folds", "Good Strategy", full, train, validate, test, folds)
+    print(result3.get_summary())
+
     # Test 3: Quick validation
     print("\nTest 3: Quick Validation")
     is_valid, notes = validator.quick_validate(full)
@@ -0,0 +1,188 @@
+"""
+Walk-Forward Executor
+
+Backtests surviving strategies on the walk-forward windows of a date range
+(config.DATE_RANGES: train, validate, test) and, optionally, on anchored
+folds: the full range is split into N + 1 equal segments and segment k + 1
+is the out-of-sample window after the anchored in-sample period up to
+segment k.
+
+Every (strategy, window) pair becomes its own backtest, and all of them are
+submitted as a single batch, so they run concurrently across the runner's
+project pool or async client. With enough capacity, walk-forward
+validation costs one wall-clock backtest instead of one per window.
+"""
+
+import os
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta
+from typing import List, Dict, Tuple, Callable, Optional
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.strategy_spec import StrategySpec
+from core.parser import ParsedMetrics
+import config
+
+
+WALK_FORWARD_PERIODS = ("train", "validate", "test")
+
+
+@dataclass
+class WalkForwardMetrics:
+    """Metrics of one strategy on each walk-forward window (None = failed)"""
+    train: Optional[ParsedMetrics]
+    validate: Optional[ParsedMetrics]
+    test: Optional[ParsedMetrics]
+    folds: List[Optional[ParsedMetrics]] = field(default_factory=list)
+
+
+def anchored_folds(full: Tuple[str, str], folds: int) -> List[Tuple[str, str]]:
+    """
+    Out-of-sample windows of anchored walk-forward folds.
+
+    The full range is split into folds + 1 equal segments; fold k tests on
+    segment k + 1, after an in-sample period from the range start.
+    """
+    if folds <= 0:
+        return []
+    start = datetime.strptime(full[0], "%Y-%m-%d")
+    end = datetime.strptime(full[1], "%Y-%m-%d")
+    step = ((end - start).days + 1) / (folds + 1)
+
+    windows = []
+    for k in range(1, folds + 1):
+        fold_start = start + timedelta(days=int(k * step))
+        fold_end = start + timedelta(days=int((k + 1) * step) - 1) if k < folds else end
+        windows.append((fold_start.strftime("%Y-%m-%d"), fold_end.strftime("%Y-%m-%d")))
+    return windows
+
+
+def walk_forward_windows(date_range: str = None, folds: int = 0) -> Dict[str, Tuple[str, str]]:
+    """
+    Walk-forward windows by label: "train", "validate", "test", then
+    "fold1" ... "foldN" for anchored folds.
+    """
+    dates = config.DATE_RANGES[date_range or config.ACTIVE_DATE_RANGE]
+    windows = {period: dates[period] for period in WALK_FORWARD_PERIODS}
+    for i, window in enumerate(anchored_folds(dates["full"], folds)):
+        windows[f"fold{i + 1}"] = window
+    return windows
+
+
+def window_spec_id(spec_id: str, label: str) -> str:
+    """ID of a strategy's backtest on one walk-forward window"""
+    return f"{spec_id}_wf_{label}"
+
+
+class WalkForwardExecutor:
+    """
+    Runs every walk-forward window of every strategy as one batch.
+
+    Usage:
+        executor = WalkForwardExecutor(evaluate, "5_year", folds=3)
+        windows = executor.run(specs)
+        validator.validate(spec.id, spec.name, full,
+                           windows[spec.id].train, windows[spec.id].validate,
+                           windows[spec.id].test, windows[spec.id].folds)
+
+    where evaluate(specs, {spec_id: (start, end)}) backtests each spec on
+    its own window and returns {spec_id: ParsedMetrics} for those that
+    succeeded.
+    """
+
+    def __init__(
+        self,
+        evaluate: Callable[[List[StrategySpec], Dict[str, Tuple[str, str]]], Dict[str, ParsedMetrics]],
+        date_range: str = None,
+        folds: int = None
+    ):
+        """
+        Args:
+            evaluate: Backtests specs, each on its own date window
+            date_range: Date range config ("5_year" or "10_year")
+            folds: Anchored folds in addition to train/validate/test
+                   (default: config.WALK_FORWARD_FOLDS)
+        """
+        self.evaluate = evaluate
+        self.date_range = date_range or config.ACTIVE_DATE_RANGE
+        self.folds = config.WALK_FORWARD_FOLDS if folds is None else folds
+        self.windows = walk_forward_windows(self.date_range, self.folds)
+
+    def run(self, specs: List[StrategySpec]) -> Dict[str, WalkForwardMetrics]:
+        """
+        Backtest specs on every walk-forward window.
+
+        Each (spec, window) pair is a copy of the spec with its own ID
+        (window_spec_id), so results, cache entries and journal entries
+        stay separate per window.
+
+        Returns:
+            Dict mapping spec ID to WalkForwardMetrics
+        """
+        jobs: List[StrategySpec] = []
+        dates: Dict[str, Tuple[str, str]] = {}
+        for spec in specs:
+            for label, window in self.windows.items():
+                job = replace(spec, id=window_spec_id(spec.id, label))
+                jobs.append(job)
+                dates[job.id] = window
+
+        metrics = self.evaluate(jobs, dates) if jobs else {}
+
+        fold_labels = [label for label in self.windows if label not in WALK_FORWARD_PERIODS]
+        return {
+            spec.id: WalkForwardMetrics(
+                train=metrics.get(window_spec_id(spec.id, "train")),
+                validate=metrics.get(window_spec_id(spec.id, "validate")),
+                test=metrics.get(window_spec_id(spec.id, "test")),
+                folds=[metrics.get(window_spec_id(spec.id, label)) for label in fold_labels],
+            )
+            for spec in specs
+        }
+
+    @property
+    def backtests_per_strategy(self) -> int:
+        return len(self.windows)
+
+
+# =============================================================================
+# TESTING
+# =============================================================================
+
+if __name__ == "__main__":
+    from models.strategy_spec import create_example_momentum_strategy
+
+    print("Testing Walk-Forward Executor...")
+
+    print(f"\n  Anchored folds (3): {anchored_folds(config.DATE_RANGES['5_year']['full'], 3)}")
+
+    batches = []
+
+    def evaluate(specs, dates):
+        batches.append(len(specs))
+        results = {}
+        for s in specs:
+            window = dates[s.id]
+            # Sharpe decays in later windows
+            sharpe = 1.5 - 0.2 * (int(window[0][:4]) - 2020)
+            results[s.id] = ParsedMetrics(
+                strategy_id=s.id, backtest_id="test", name=s.name,
+                total_return=0.5, cagr=0.1 * sharpe, sharpe_ratio=sharpe, sortino_ratio=sharpe * 1.2,
+                max_drawdown=0.2, volatility=0.2, total_trades=100, win_rate=0.5, profit_factor=1.5,
+                avg_win=250, avg_loss=150, alpha=0.0, beta=1.0, information_ratio=0.5, treynor_ratio=0.1,
+                start_date=window[0], end_date=window[1], initial_capital=100000, final_equity=150000,
+                raw_statistics={}
+            )
+        return results
+
+    spec = create_example_momentum_strategy()
+    executor = WalkForwardExecutor(evaluate, "5_year", folds=3)
+    results = executor.run([spec])
+    wf = results[spec.id]
+    print(f"  Windows: {list(executor.windows)}")
+    print(f"  Batches: {batches} (one batch of {executor.backtests_per_strategy} backtests)")
+    print(f"  Sharpe train/validate/test: {wf.train.sharpe_ratio:.2f}/"
+          f"{wf.validate.sharpe_ratio:.2f}/{wf.test.sharpe_ratio:.2f}")
+    print(f"  Fold Sharpes: {[round(m.sharpe_ratio, 2) for m in wf.folds]}")
@@ -0,0 +1,360 @@
+"""
+Bayesian Parameter Optimizer
+
+Surrogate-model alternative to grid sweeping. Instead of backtesting every
+combination of ParameterRange values:
+
+1. Backtest a small Latin hypercube design of parameter sets
+2. Fit a Gaussian process (Matern 5/2 kernel, NumPy only) to the
+   objective (default: Sharpe ratio) of the completed backtests
+3. Propose the grid points with the highest expected improvement,
+   a batch at a time so they can be backtested concurrently
+4. Repeat until the evaluation budget is spent
+
+Parameters are encoded on [0, 1]: numeric values by value, others by
+their position in the ParameterRange.
+"""
+
+import os
+import math
+from typing import List, Dict, Any, Tuple, Callable, Optional
+
+import numpy as np
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.strategy_spec import StrategySpec
+from core.parser import ParsedMetrics
+from core.ranker import StrategyRanker
+from generators.param_sweeper import ParameterSweeper
+import config
+
+
+class GaussianProcess:
+    """
+    Gaussian process regressor with an isotropic Matern 5/2 kernel.
+
+    The length scale and noise level are picked from a small grid by
+    maximizing the log marginal likelihood.
+    """
+
+    LENGTH_SCALES = (0.05, 0.1, 0.2, 0.4, 0.8)
+    NOISE_LEVELS = (1e-4, 1e-2, 1e-1)
+
+    def __init__(self):
+        self.length_scale = 0.2
+        self.noise = 1e-2
+        self._x = None
+        self._alpha = None
+        self._chol = None
+        self._y_mean = 0.0
+        self._y_std = 1.0
+
+    @staticmethod
+    def kernel(a: np.ndarray, b: np.ndarray, length_scale: float) -> np.ndarray:
+        d2 = (((a[:, None, :] - b[None, :, :]) / length_scale) ** 2).sum(axis=-1)
+        r = np.sqrt(5.0 * d2)
+        return (1.0 + r + r * r / 3.0) * np.exp(-r)
+
+    def fit(self, x: np.ndarray, y: np.ndarray, optimize: bool = True) -> "GaussianProcess":
+        """
+        Fit to observations.
+
+        Args:
+            x: (n, d) encoded parameter points
+            y: (n,) objective values
+            optimize: Re-select kernel hyperparameters
+        """
+        self._y_mean = float(y.mean())
+        self._y_std = float(y.std()) or 1.0
+        yn = (y - self._y_mean) / self._y_std
+
+        if optimize:
+            best = -np.inf
+            for length_scale in self.LENGTH_SCALES:
+                for noise in self.NOISE_LEVELS:
+                    fitted = self._factor(x, yn, length_scale, noise)
+                    if fitted is None:
+                        continue
+                    chol, alpha = fitted
+                    log_likelihood = -0.5 * yn @ alpha - np.log(np.diag(chol)).sum()
+                    if log_likelihood > best:
+                        best = log_likelihood
+                        self.length_scale, self.noise = length_scale, noise
+
+        fitted = self._factor(x, yn, self.length_scale, self.noise)
+        if fitted is None:
+            self.noise = max(self.NOISE_LEVELS)
+            fitted = self._factor(x, yn, self.length_scale, self.noise)
+        self._chol, self._alpha = fitted
+        self._x = x
+        return self
+
+    def _factor(
+        self,
+        x: np.ndarray,
+        yn: np.ndarray,
+        length_scale: float,
+        noise: float
+    ) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        k = self.kernel(x, x, length_scale) + noise * np.eye(len(x))
+        try:
+            chol = np.linalg.cholesky(k)
+        except np.linalg.LinAlgError:
+            return None
+        alpha = np.linalg.solve(chol.T, np.linalg.solve(chol, yn))
+        return chol, alpha
+
+    def predict(self, x: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Posterior mean and standard deviation at points x.
+
+        Returns:
+            (mean, std), both (m,) in objective units
+        """
+        k_star = self.kernel(x, self._x, self.length_scale)
+        mean = k_star @ self._alpha
+        v = np.linalg.solve(self._chol, k_star.T)
+        var = np.clip(1.0 - (v * v).sum(axis=0), 1e-12, None)
+        return mean * self._y_std + self._y_mean, np.sqrt(var) * self._y_std
+
+
+def expected_improvement(mean: np.ndarray, std: np.ndarray, best: float, xi: float = 0.01) -> np.ndarray:
+    """Expected improvement over `best` (maximization)"""
+    improvement = mean - best - xi
+    z = improvement / std
+    cdf = 0.5 * (1.0 + np.vectorize(math.erf)(z / math.sqrt(2.0)))
+    pdf = np.exp(-0.5 * z * z) / math.sqrt(2.0 * math.pi)
+    return improvement * cdf + std * pdf
+
+
+class BayesianOptimizer:
+    """
+    Optimize a strategy's parameters with a Gaussian-process surrogate.
+
+    Usage:
+        optimizer = BayesianOptimizer(evaluate)
+        variants, metrics = optimizer.optimize(spec, ("2020-01-01", "2024-12-31"))
+
+    where evaluate(specs, (start, end)) backtests specs and returns
+    {spec_id: ParsedMetrics} for those that succeeded.
+    """
+
+    def __init__(
+        self,
+        evaluate: Callable[[List[StrategySpec], Tuple[str, str]], Dict[str, ParsedMetrics]],
+        sweeper: ParameterSweeper = None,
+        ranker: StrategyRanker = None,
+        objective: str = None,
+        n_initial: int = None,
+        max_evaluations: int = None,
+        batch_size: int = None,
+        max_candidates: int = None
+    ):
+        """
+        Args:
+            evaluate: Backtests specs on a date window
+            sweeper: Builds variants and samples the grid (default: ParameterSweeper())
+            ranker: Used when objective is "score"
+            objective: ParsedMetrics attribute to maximize, or "score" for
+                       the ranker's final score (default from config)
+            n_initial: Latin hypercube points before fitting (default from config)
+            max_evaluations: Total backtests per strategy (default from config)
+            batch_size: Points proposed per round (default from config)
+            max_candidates: Grid points scored per proposal; larger grids
+                            are Sobol-sampled (default from config)
+        """
+        self.evaluate = evaluate
+        self.sweeper = sweeper or ParameterSweeper()
+        self.ranker = ranker or StrategyRanker()
+        self.objective = objective or config.BAYES_OBJECTIVE
+        self.n_initial = n_initial or config.BAYES_INITIAL_POINTS
+        self.max_evaluations = max_evaluations or config.BAYES_MAX_EVALUATIONS
+        self.batch_size = batch_size or config.BAYES_BATCH_SIZE
+        self.max_candidates = max_candidates or config.BAYES_MAX_CANDIDATES
+
+        # (parameter set, objective value or None if the backtest failed)
+        self.history: List[Tuple[Dict[str, Any], Optional[float]]] = []
+
+    def score(self, metrics: ParsedMetrics) -> float:
+        """Objective value of a completed backtest"""
+        if self.objective == "score":
+            return self.ranker.rank_strategy(metrics.strategy_id, metrics.name, metrics).final_score
+        return float(getattr(metrics, self.objective))
+
+    def optimize(
+        self,
+        spec: StrategySpec,
+        dates: Tuple[str, str]
+    ) -> Tuple[List[StrategySpec], Dict[str, ParsedMetrics]]:
+        """
+        Search a strategy's parameter grid.
+
+        Args:
+            spec: Base strategy with parameter ranges defined
+            dates: (start, end) date range to backtest
+
+        Returns:
+            (evaluated variants, {variant id: ParsedMetrics} for successful ones)
+        """
+        self.history = []
+        if not spec.parameters:
+            return [spec], self.evaluate([spec], dates)
+
+        candidates = self._candidates(spec)
+        x_all = np.array([self._encode(spec, values) for values in candidates])
+        budget = min(self.max_evaluations, len(candidates))
+
+        # Initial Latin hypercube design over the grid
+        design = ParameterSweeper(self.n_initial, "lhs", self.sweeper.seed)
+        keys = {self._key(values): i for i, values in enumerate(candidates)}
+        initial = []
+        for values in design.iter_parameter_sets(spec):
+            key = self._key(values)
+            if key not in keys:
+                keys[key] = len(candidates)
+                candidates.append(values)
+                x_all = np.vstack([x_all, self._encode(spec, values)])
+            initial.append(keys[key])
+
+        evaluated: List[int] = []
+        y: List[float] = []
+        variants: List[StrategySpec] = []
+        all_metrics: Dict[str, ParsedMetrics] = {}
+
+        batch = initial[:budget]
+        while batch:
+            batch_variants = [self.sweeper.make_variant(spec, candidates[i]) for i in batch]
+            metrics = self.evaluate(batch_variants, dates)
+
+            for i, variant in zip(batch, batch_variants):
+                result = metrics.get(variant.id)
+                value = self.score(result) if result is not None else None
+                self.history.append((candidates[i], value))
+                evaluated.append(i)
+                y.append(value)
+                variants.append(variant)
+                if result is not None:
+                    all_metrics[variant.id] = result
+
+            ok = [v for v in y if v is not None]
+            best = max(ok) if ok else None
+            print(f"  Evaluated {len(evaluated)}/{budget}: best {self.objective} = "
+                  f"{best:.3f}" if best is not None else f"  Evaluated {len(evaluated)}/{budget}: no successes")
+
+            remaining = budget - len(evaluated)
+            if remaining <= 0:
+                break
+            batch = self._propose(x_all, evaluated, y, min(self.batch_size, remaining))
+
+        return variants, all_metrics
+
+    def _propose(
+        self,
+        x_all: np.ndarray,
+        evaluated: List[int],
+        y: List[Optional[float]],
+        n: int
+    ) -> List[int]:
+        """Pick the next n candidate indices by expected improvement"""
+        ok = [v for v in y if v is not None]
+        if not ok:
+            # Nothing to model yet: explore unevaluated points in grid order
+            seen = set(evaluated)
+            return [i for i in range(len(x_all)) if i not in seen][:n]
+
+        # Failed backtests count as the worst observed value
+        floor = min(ok)
+        x = x_all[evaluated]
+        yv = np.array([floor if v is None else v for v in y], dtype=float)
+
+        gp = GaussianProcess().fit(x, yv)
+        available = np.ones(len(x_all), dtype=bool)
+        available[evaluated] = False
+
+        batch = []
+        for _ in range(n):
+            if not available.any():
+                break
+            mean, std = gp.predict(x_all[available])
+            ei = expected_improvement(mean, std, yv.max())
+            pick = int(np.flatnonzero(available)[int(np.argmax(ei))])
+            batch.append(pick)
+            available[pick] = False
+
+            # Kriging believer: assume the pick scores its predicted mean
+            x = np.vstack([x, x_all[pick]])
+            yv = np.append(yv, gp.predict(x_all[pick:pick + 1])[0])
+            gp.fit(x, yv, optimize=False)
+
+        return batch
+
+    def _candidates(self, spec: StrategySpec) -> List[Dict[str, Any]]:
+        """Grid points to score; Sobol-sampled when the grid is large"""
+        sampler = ParameterSweeper(self.max_candidates, "sobol", self.sweeper.seed)
+        return list(sampler.iter_parameter_sets(spec))
+
+    @staticmethod
+    def _encode(spec: StrategySpec, values: Dict[str, Any]) -> List[float]:
+        """Map a parameter set onto [0, 1]^d"""
+        point = []
+        for param in spec.parameters:
+            value = values[param.path]
+            options = list(param.values)
+            numeric = all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in options)
+            if numeric:
+                lo, hi = min(options), max(options)
+                point.append((value - lo) / (hi - lo) if hi > lo else 0.0)
+            else:
+                point.append(options.index(value) / max(1, len(options) - 1))
+        return point
+
+    @staticmethod
+    def _key(values: Dict[str, Any]) -> Tuple:
+        return tuple(sorted((k, repr(v)) for k, v in values.items()))
+
+
+# =============================================================================
+# TESTING
+# =============================================================================
+
+if __name__ == "__main__":
+    from models.strategy_spec import create_example_momentum_strategy, ParameterRange
+
+    print("Testing Bayesian Optimizer...")
+
+    spec = create_example_momentum_strategy()
+    spec.parameters = [
+        ParameterRange("indicators.0.params.period", list(range(10, 210, 5))),
+        ParameterRange("indicators.1.params.period", list(range(5, 31))),
+    ]
+
+    def sharpe(values):
+        # Smooth objective peaking at SMA 120 / RSI 12
+        sma = values["indicators.0.params.period"]
+        rsi = values["indicators.1.params.period"]
+        return 1.5 - ((sma - 120) / 80) ** 2 - ((rsi - 12) / 10) ** 2
+
+    def evaluate(specs, dates):
+        sweeper = ParameterSweeper()
+        results = {}
+        for s in specs:
+            values = {p.path: sweeper.get_nested_value(s, p.path) for p in spec.parameters}
+            value = sharpe(values)
+            results[s.id] = ParsedMetrics(
+                strategy_id=s.id, backtest_id="test", name=s.name,
+                total_return=0.5, cagr=0.1, sharpe_ratio=value, sortino_ratio=value,
+                max_drawdown=0.2, volatility=0.2, total_trades=100, win_rate=0.5, profit_factor=1.5,
+                avg_win=250, avg_loss=150, alpha=0.0, beta=1.0, information_ratio=0.5, treynor_ratio=0.1,
+                start_date=dates[0], end_date=dates[1], initial_capital=100000, final_equity=150000,
+                raw_statistics={}
+            )
+        return results
+
+    optimizer = BayesianOptimizer(evaluate, n_initial=8, max_evaluations=24, batch_size=4)
+    variants, metrics = optimizer.optimize(spec, ("2020-01-01", "2024-12-31"))
+    best = max(metrics.values(), key=lambda m: m.sharpe_ratio)
+    print(f"\n  Grid size: {ParameterSweeper().count_combinations(spec)}")
+    print(f"  Backtests: {len(variants)}")
+    print(f"  Best: {best.name} (Sharpe {best.sharpe_ratio:.3f}, optimum 1.500)")
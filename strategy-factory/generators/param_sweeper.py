@@ -2,12 +2,21 @@
 Parameter Sweeper
 
 Generates parameter variations of strategies for grid search optimization.
+
+Variations are yielded lazily (iter_variants). When the full grid exceeds
+max_combinations, the grid is sampled evenly instead of truncated:
+- "grid":   a coarser grid of evenly spaced values per parameter
+- "random": uniform random grid points
+- "lhs":    Latin hypercube (each parameter's values covered evenly)
+- "sobol":  Sobol low-discrepancy sequence
 """
 
 import os
 import copy
-from typing import List, Dict, Any, Iterator
-from itertools import product
+import json
+import random
+import hashlib
+from typing import List, Dict, Any, Iterator, Tuple, Sequence
 
 import sys
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -16,21 +25,103 @@ from models.strategy_spec import StrategySpec, ParameterRange
 import config
 
 
+SAMPLING_METHODS = ("grid", "random", "lhs", "sobol")
+
+# Sobol direction numbers (Joe & Kuo) for dimensions 2-21: (s, a, m_1..m_s)
+SOBOL_DIRECTIONS = [
+    (1, 0, (1,)),
+    (2, 1, (1, 3)),
+    (3, 1, (1, 3, 1)),
+    (3, 2, (1, 1, 1)),
+    (4, 1, (1, 1, 3, 3)),
+    (4, 4, (1, 3, 5, 13)),
+    (5, 2, (1, 1, 5, 5, 17)),
+    (5, 4, (1, 1, 5, 5, 5)),
+    (5, 7, (1, 1, 7, 11, 19)),
+    (5, 11, (1, 1, 5, 1, 1)),
+    (5, 13, (1, 1, 1, 3, 11)),
+    (5, 14, (1, 3, 5, 5, 31)),
+    (6, 1, (1, 3, 3, 9, 7, 49)),
+    (6, 13, (1, 1, 1, 15, 21, 21)),
+    (6, 16, (1, 3, 1, 13, 27, 49)),
+    (6, 19, (1, 1, 1, 15, 7, 5)),
+    (6, 22, (1, 3, 1, 15, 13, 25)),
+    (6, 25, (1, 1, 5, 5, 19, 61)),
+    (7, 1, (1, 3, 7, 11, 23, 15, 103)),
+    (7, 4, (1, 3, 7, 13, 13, 15, 69)),
+]
+SOBOL_BITS = 32
+
+
+def sobol_sequence(dims: int) -> Iterator[Tuple[float, ...]]:
+    """
+    Infinite Sobol sequence in [0, 1)^dims (Gray-code construction).
+
+    The all-zero first point is skipped.
+    """
+    if dims > len(SOBOL_DIRECTIONS) + 1:
+        raise ValueError(f"Sobol sampling supports at most {len(SOBOL_DIRECTIONS) + 1} parameters")
+
+    directions = [[1 << (SOBOL_BITS - 1 - k) for k in range(SOBOL_BITS)]]
+    for s, a, m in SOBOL_DIRECTIONS[:dims - 1]:
+        v = [0] * SOBOL_BITS
+        for k in range(SOBOL_BITS):
+            if k < s:
+                v[k] = m[k] << (SOBOL_BITS - 1 - k)
+            else:
+                v[k] = v[k - s] ^ (v[k - s] >> s)
+                for j in range(1, s):
+                    if (a >> (s - 1 - j)) & 1:
+                        v[k] ^= v[k - j]
+        directions.append(v)
+
+    x = [0] * dims
+    scale = float(1 << SOBOL_BITS)
+    i = 0
+    while True:
+        # Flip the direction number of the lowest zero bit of i
+        c = (~i & (i + 1)).bit_length() - 1
+        i += 1
+        for d in range(dims):
+            x[d] ^= directions[d][c]
+        yield tuple(xd / scale for xd in x)
+
+
+def latin_hypercube(dims: int, n: int, rng: random.Random) -> Iterator[Tuple[float, ...]]:
+    """Infinite stream of successive n-point Latin hypercube designs"""
+    while True:
+        strata = []
+        for _ in range(dims):
+            perm = list(range(n))
+            rng.shuffle(perm)
+            strata.append(perm)
+        for j in range(n):
+            yield tuple((strata[d][j] + rng.random()) / n for d in range(dims))
+
+
 class ParameterSweeper:
     """
     Generate parameter variations of a strategy.
 
-    Takes a StrategySpec with ParameterRange definitions and generates
-    all combinations for grid search.
+    Takes a StrategySpec with ParameterRange definitions and yields grid
+    combinations, sampling the grid when it exceeds max_combinations.
     """
 
-    def __init__(self, max_combinations: int = None):
+    def __init__(self, max_combinations: int = None, sampling: str = None, seed: int = None):
         """
         Args:
             max_combinations: Maximum number of combinations to generate.
-                             If exceeded, samples uniformly.
+                             If exceeded, the grid is sampled.
+            sampling: "grid", "random", "lhs" or "sobol" (default:
+                      config.SWEEP_SAMPLING). Only used when the grid is
+                      larger than max_combinations.
+            seed: Random seed for random/lhs sampling
         """
         self.max_combinations = max_combinations or config.MAX_PARAMETER_COMBINATIONS
+        self.sampling = sampling or config.SWEEP_SAMPLING
+        self.seed = config.SWEEP_SEED if seed is None else seed
+        if self.sampling not in SAMPLING_METHODS:
+            raise ValueError(f"Unknown sampling method: {self.sampling} (expected one of {SAMPLING_METHODS})")
 
     def sweep(self, spec: StrategySpec) -> List[StrategySpec]:
         """
@@ -45,40 +136,193 @@ class ParameterSweeper:
         if not spec.parameters:
             return [spec]
 
-        # Get all parameter paths and their values
-        param_paths = [p.path for p in spec.parameters]
-        param_values = [p.values for p in spec.parameters]
+        total_combinations = self.count_combinations(spec)
+        print(f"  Total possible combinations: {total_combinations}")
+        if total_combinations > self.max_combinations:
+            print(f"  Sampling {self.max_combinations} combinations ({self.sampling})")
 
-        # Calculate total combinations
-        total_combinations = 1
-        for values in param_values:
-            total_combinations *= len(values)
+        return list(self.iter_variants(spec))
 
-        print(f"  Total possible combinations: {total_combinations}")
+    def count_combinations(self, spec: StrategySpec) -> int:
+        """Size of the full parameter grid"""
+        return self._product([len(p.values) for p in spec.parameters])
+
+    def iter_variants(self, spec: StrategySpec) -> Iterator[StrategySpec]:
+        """
+        Lazily yield parameter variations of a strategy.
+
+        Each variation is built only when requested, so large sweeps can
+        be streamed (e.g. into local screening) without holding every
+        variant in memory.
+        """
+        if not spec.parameters:
+            yield spec
+            return
+
+        base = self._copy_spec(spec)
+        base.parameters = []  # variants need no ranges; skip copying them
+        for values in self.iter_parameter_sets(spec):
+            yield self.make_variant(spec, values, base)
+
+    def make_variant(
+        self,
+        spec: StrategySpec,
+        values: Dict[str, Any],
+        base: StrategySpec = None
+    ) -> StrategySpec:
+        """
+        Build the variation of a strategy for one parameter set.
+
+        Args:
+            spec: Base strategy
+            values: Map of dot-notation path -> value
+            base: Optional pre-made copy of spec (with parameters cleared)
+                  to deep-copy from, avoiding a to_dict/from_dict round-trip
+
+        Returns:
+            New StrategySpec with a deterministic ID and descriptive name
+        """
+        if base is None:
+            base = self._copy_spec(spec)
+            base.parameters = []
+        new_spec = copy.deepcopy(base)
+        new_spec.parameters = spec.parameters
+        new_spec.id = self.variant_id(spec.id, values)
+        new_spec.parent_id = spec.id
 
-        # Generate combinations
-        variations = []
-        for combo in product(*param_values):
-            # Create a copy of the spec
-            new_spec = self._copy_spec(spec)
-            new_spec.parent_id = spec.id
+        # Apply parameter values
+        for path, value in values.items():
+            self._set_nested_value(new_spec, path, value)
 
-            # Apply parameter values
-            for path, value in zip(param_paths, combo):
-                self._set_nested_value(new_spec, path, value)
+        # Update name to reflect parameters
+        param_str = "_".join(f"{p.split('.')[-1]}={v}" for p, v in values.items())
+        new_spec.name = f"{spec.name} ({param_str})"
 
-            # Update name to reflect parameters
-            param_str = "_".join(f"{p.split('.')[-1]}={v}" for p, v in zip(param_paths, combo))
-            new_spec.name = f"{spec.name} ({param_str})"
+        return new_spec
 
-            variations.append(new_spec)
+    def iter_parameter_sets(self, spec: StrategySpec) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily yield {path: value} parameter sets for a strategy.
 
-            # Check max combinations
-            if len(variations) >= self.max_combinations:
-                print(f"  Limiting to {self.max_combinations} combinations")
+        The full grid is enumerated when it fits in max_combinations;
+        otherwise max_combinations distinct points are sampled.
+        """
+        paths = [p.path for p in spec.parameters]
+        grid = [list(p.values) for p in spec.parameters]
+        for indices in self._iter_grid_indices([len(v) for v in grid]):
+            yield {path: values[i] for path, values, i in zip(paths, grid, indices)}
+
+    def _iter_grid_indices(self, sizes: Sequence[int]) -> Iterator[Tuple[int, ...]]:
+        """Yield distinct grid index tuples per the sampling method"""
+        total = self._product(sizes)
+        if total == 0:
+            return
+
+        n = min(total, self.max_combinations)
+        if n == total:
+            for flat in range(total):
+                yield self._decode_index(flat, sizes)
+            return
+
+        if self.sampling == "grid":
+            # Coarser grid of evenly spaced values in every dimension
+            levels = list(sizes)
+            while self._product(levels) > n:
+                d = max(range(len(levels)), key=lambda i: levels[i])
+                levels[d] -= 1
+            axes = [
+                sorted({round(j * (size - 1) / max(1, count - 1)) for j in range(count)})
+                for size, count in zip(sizes, levels)
+            ]
+            for flat in range(self._product([len(a) for a in axes])):
+                yield tuple(axis[i] for axis, i in zip(axes, self._decode_index(flat, [len(a) for a in axes])))
+            return
+
+        rng = random.Random(self.seed)
+        if self.sampling == "random":
+            for flat in rng.sample(range(total), n):
+                yield self._decode_index(flat, sizes)
+            return
+
+        points = sobol_sequence(len(sizes)) if self.sampling == "sobol" else latin_hypercube(len(sizes), n, rng)
+
+        # Coarse grids map several points to one cell; skip repeats
+        seen = set()
+        for attempt, point in enumerate(points):
+            if len(seen) >= n or attempt >= n * 50:
                 break
+            indices = tuple(min(int(u * size), size - 1) for u, size in zip(point, sizes))
+            if indices not in seen:
+                seen.add(indices)
+                yield indices
+
+        # Top up with random unseen cells so exactly n points come back
+        if len(seen) < n:
+            for flat in rng.sample(range(total), min(total, n + len(seen))):
+                if len(seen) >= n:
+                    break
+                indices = self._decode_index(flat, sizes)
+                if indices not in seen:
+                    seen.add(indices)
+                    yield indices
+
+    @staticmethod
+    def _product(sizes: Sequence[int]) -> int:
+        total = 1
+        for size in sizes:
+            total *= size
+        return total
+
+    @staticmethod
+    def _decode_index(flat: int, sizes: Sequence[int]) -> Tuple[int, ...]:
+        """Flat index -> grid indices (itertools.product order)"""
+        indices = []
+        for size in reversed(sizes):
+            flat, i = divmod(flat, size)
+            indices.append(i)
+        return tuple(reversed(indices))
+
+    @staticmethod
+    def variant_id(parent_id: str, values: Dict[str, Any]) -> str:
+        """Deterministic ID for a parameter variation of a strategy"""
+        key = json.dumps([parent_id, sorted(values.items())], default=str)
+        return hashlib.sha1(key.encode()).hexdigest()[:8]
+
+    def apply_parameters(self, spec: StrategySpec, values: Dict[str, Any]) -> StrategySpec:
+        """
+        Return a copy of a spec with parameter values applied.
+
+        Args:
+            spec: Base strategy
+            values: Map of dot-notation path -> value
+
+        Returns:
+            New StrategySpec (the base spec is not modified)
+        """
+        new_spec = self._copy_spec(spec)
+        for path, value in values.items():
+            self._set_nested_value(new_spec, path, value)
+        return new_spec
+
+    def get_nested_value(self, spec: StrategySpec, path: str) -> Any:
+        """
+        Get a nested value from the spec using dot notation.
 
-        return variations
+        Accepts the same paths as _set_nested_value.
+        """
+        obj = spec
+        for part in path.split("."):
+            if isinstance(obj, list):
+                obj = obj[int(part)]
+            elif isinstance(obj, dict):
+                obj = obj[part]
+            elif hasattr(obj, part):
+                obj = getattr(obj, part)
+            elif hasattr(obj, 'params') and isinstance(obj.params, dict) and part in obj.params:
+                obj = obj.params[part]
+            else:
+                raise ValueError(f"Cannot navigate path: {path} at {part}")
+        return obj
 
     def _copy_spec(self, spec: StrategySpec) -> StrategySpec:
         """Create a deep copy of a strategy spec"""
@@ -130,18 +374,23 @@ class ParameterSweeper:
                 raise ValueError(f"Cannot set value at path: {path}")
 
 
-def sweep_parameters(spec: StrategySpec, max_combinations: int = None) -> List[StrategySpec]:
+def sweep_parameters(
+    spec: StrategySpec,
+    max_combinations: int = None,
+    sampling: str = None
+) -> List[StrategySpec]:
     """
     Convenience function to sweep parameters.
 
     Args:
         spec: Strategy spec with parameter ranges
         max_combinations: Max variations to generate
+        sampling: Sampling method when the grid exceeds max_combinations
 
     Returns:
         List of strategy variations
     """
-    sweeper = ParameterSweeper(max_combinations)
+    sweeper = ParameterSweeper(max_combinations, sampling)
     return sweeper.sweep(spec)
 
 
@@ -200,3 +449,17 @@ if __name__ == "__main__":
 
     if len(variations) > 10:
         print(f"  ... and {len(variations) - 10} more")
+
+    # Sampling a grid larger than max_combinations
+    from collections import Counter
+    big = create_example_momentum_strategy()
+    big.parameters = [
+        ParameterRange("indicators.0.params.period", list(range(10, 210, 10))),
+        ParameterRange("indicators.1.params.period", list(range(5, 30))),
+    ]
+    print(f"\nSampling 20 of {sweeper.count_combinations(big)} combinations:")
+    for method in SAMPLING_METHODS:
+        sets = list(ParameterSweeper(20, method).iter_parameter_sets(big))
+        sma = Counter(s["indicators.0.params.period"] for s in sets)
+        rsi = Counter(s["indicators.1.params.period"] for s in sets)
+        print(f"  {method:>6}: {len(sets)} sets, {len(sma)} distinct SMA / {len(rsi)} RSI periods")
@@ -0,0 +1,212 @@
+"""
+Successive Halving Sweep Scheduler
+
+Early-stopping alternative to backtesting every sweep variant over the
+full date range:
+
+1. Backtest all variants on a short window at the start of the range
+2. Rank them (StrategyRanker score) and keep the top 1/eta of each
+   strategy's variants
+3. Re-run the survivors on an eta-times longer window, and repeat until
+   the last rung covers the full range
+
+Only final-rung survivors get full-range metrics, so most variants cost
+a fraction of a full backtest.
+"""
+
+import os
+import math
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import List, Dict, Tuple, Callable
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.strategy_spec import StrategySpec
+from core.parser import ParsedMetrics
+from core.ranker import StrategyRanker
+import config
+
+
+@dataclass
+class HalvingRung:
+    """One round of successive halving"""
+    window: Tuple[str, str]
+    evaluated: int
+    kept: int
+
+    @property
+    def years(self) -> float:
+        return window_years(self.window)
+
+
+def window_years(window: Tuple[str, str]) -> float:
+    """Length of a (start, end) date window in years"""
+    start = datetime.strptime(window[0], "%Y-%m-%d")
+    end = datetime.strptime(window[1], "%Y-%m-%d")
+    return ((end - start).days + 1) / 365.25
+
+
+class SuccessiveHalving:
+    """
+    Successive-halving scheduler for parameter sweeps.
+
+    Usage:
+        halving = SuccessiveHalving(evaluate)
+        survivors, metrics = halving.run(variants, ("2020-01-01", "2024-12-31"))
+
+    where evaluate(specs, (start, end)) backtests specs on a window and
+    returns {spec_id: ParsedMetrics} for those that succeeded.
+    """
+
+    def __init__(
+        self,
+        evaluate: Callable[[List[StrategySpec], Tuple[str, str]], Dict[str, ParsedMetrics]],
+        ranker: StrategyRanker = None,
+        eta: int = None,
+        min_window_days: int = None,
+        min_survivors: int = None
+    ):
+        """
+        Args:
+            evaluate: Backtests specs on a date window
+            ranker: Scores variants within a rung (default: StrategyRanker())
+            eta: Window growth factor and 1/keep fraction per rung (default from config)
+            min_window_days: Shortest rung window (default from config)
+            min_survivors: Variants kept per strategy in every rung (default from config)
+        """
+        self.evaluate = evaluate
+        self.ranker = ranker or StrategyRanker()
+        self.eta = eta or config.HALVING_ETA
+        self.min_window_days = min_window_days or config.HALVING_MIN_WINDOW_DAYS
+        self.min_survivors = min_survivors or config.HALVING_MIN_SURVIVORS
+        self.rungs: List[HalvingRung] = []
+
+    def windows(self, full: Tuple[str, str]) -> List[Tuple[str, str]]:
+        """
+        Rung windows: all start at the full range's start, each eta times
+        longer than the previous, the last one being the full range.
+        """
+        start = datetime.strptime(full[0], "%Y-%m-%d")
+        end = datetime.strptime(full[1], "%Y-%m-%d")
+        total_days = (end - start).days
+
+        windows = [full]
+        days = total_days / self.eta
+        while days >= self.min_window_days:
+            windows.insert(0, (full[0], (start + timedelta(days=int(days))).strftime("%Y-%m-%d")))
+            days /= self.eta
+        return windows
+
+    def run(
+        self,
+        variants: List[StrategySpec],
+        full: Tuple[str, str]
+    ) -> Tuple[List[StrategySpec], Dict[str, ParsedMetrics]]:
+        """
+        Run successive halving over sweep variants.
+
+        Variants are grouped by parent strategy, and each group is pruned
+        separately so one strong strategy cannot eliminate another's
+        variants. Each rung is evaluated as a single batch.
+
+        Args:
+            variants: Variations to evaluate
+            full: Full (start, end) date range
+
+        Returns:
+            (final survivors, {survivor id: full-range ParsedMetrics})
+        """
+        self.rungs = []
+        alive = list(variants)
+        metrics: Dict[str, ParsedMetrics] = {}
+        windows = self.windows(full)
+
+        for i, window in enumerate(windows):
+            if not alive:
+                break
+
+            print(f"\n  Rung {i + 1}/{len(windows)}: {len(alive)} variants on {window[0]} to {window[1]}")
+            metrics = self.evaluate(alive, window)
+            evaluated = [spec for spec in alive if spec.id in metrics]
+
+            if i == len(windows) - 1:
+                kept = evaluated
+            else:
+                kept = self._select(evaluated, metrics)
+
+            self.rungs.append(HalvingRung(window, len(alive), len(kept)))
+            print(f"  Kept {len(kept)}/{len(alive)}")
+            alive = kept
+
+        return alive, {spec.id: metrics[spec.id] for spec in alive}
+
+    def _select(self, specs: List[StrategySpec], metrics: Dict[str, ParsedMetrics]) -> List[StrategySpec]:
+        """Keep the top 1/eta (at least min_survivors) of each parent's variants"""
+        groups: Dict[str, List[StrategySpec]] = {}
+        for spec in specs:
+            groups.setdefault(spec.parent_id or spec.id, []).append(spec)
+
+        keep_ids = set()
+        for group in groups.values():
+            ranked = self.ranker.rank_strategies(
+                [(spec.id, spec.name, metrics[spec.id], None) for spec in group]
+            )
+            n_keep = max(self.min_survivors, math.ceil(len(group) / self.eta))
+            keep_ids.update(r.strategy_id for r in ranked[:n_keep])
+
+        return [spec for spec in specs if spec.id in keep_ids]
+
+    @property
+    def backtest_years(self) -> float:
+        """Backtest-years consumed by the last run"""
+        return sum(rung.evaluated * rung.years for rung in self.rungs)
+
+    @property
+    def full_sweep_years(self) -> float:
+        """Backtest-years a full-range sweep of the same variants would use"""
+        if not self.rungs:
+            return 0.0
+        return self.rungs[0].evaluated * window_years(self.rungs[-1].window)
+
+
+# =============================================================================
+# TESTING
+# =============================================================================
+
+if __name__ == "__main__":
+    import random
+    from models.strategy_spec import create_example_momentum_strategy
+    from generators.param_sweeper import ParameterSweeper
+
+    print("Testing Successive Halving...")
+    random.seed(7)
+
+    base = create_example_momentum_strategy()
+    variants = ParameterSweeper().sweep(base)
+    quality = {v.id: random.Random(v.id).random() for v in variants}
+
+    def evaluate(specs, window):
+        # Noisier scores on shorter windows
+        noise = 0.1 / window_years(window)
+        results = {}
+        for s in specs:
+            sharpe = 2 * quality[s.id] + random.gauss(0, noise)
+            results[s.id] = ParsedMetrics(
+                strategy_id=s.id, backtest_id="test", name=s.name,
+                total_return=0.5, cagr=0.1 * sharpe, sharpe_ratio=sharpe, sortino_ratio=sharpe * 1.2,
+                max_drawdown=0.2, volatility=0.2, total_trades=100, win_rate=0.5, profit_factor=1.5,
+                avg_win=250, avg_loss=150, alpha=0.0, beta=1.0, information_ratio=0.5, treynor_ratio=0.1,
+                start_date=window[0], end_date=window[1], initial_capital=100000, final_equity=150000,
+                raw_statistics={}
+            )
+        return results
+
+    halving = SuccessiveHalving(evaluate, eta=3, min_survivors=1)
+    survivors, metrics = halving.run(variants, ("2020-01-01", "2024-12-31"))
+    best = max(variants, key=lambda v: quality[v.id])
+    print(f"\n  Windows: {halving.windows(('2020-01-01', '2024-12-31'))}")
+    print(f"  Survivors: {[s.name for s in survivors]}")
+    print(f"  True best kept: {best.id in metrics}")
+    print(f"  Backtest-years: {halving.backtest_years:.1f} vs {halving.full_sweep_years:.1f} full sweep")
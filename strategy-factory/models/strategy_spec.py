@@ -49,6 +49,7 @@ class UniverseFilters:
     sector: Optional[str] = None
     index: Optional[str] = None  # "SP500", "NASDAQ100"
     max_symbols: int = 50
+    refresh: str = "monthly"  # how often the selection is redone: "daily", "weekly", "monthly"
 
     def to_dict(self) -> Dict[str, Any]:
         return {k: v for k, v in asdict(self).items() if v is not None}
@@ -21,12 +21,17 @@ Usage:
 
     # Other options
     python run_pipeline.py --date-range 10_year --skip-sweep
+
+    # Screen locally first, only send survivors to the cloud
+    python run_pipeline.py --local-data data/ohlcv.npz
 """
 
 import argparse
-import json
+import asyncio
 import os
 import sys
+import time
+from dataclasses import replace
 from datetime import datetime
 from typing import List, Dict, Any, Tuple, Optional
 
@@ -37,11 +42,20 @@ import config
 from models.strategy_spec import StrategySpec
 from generators.ai_generator import StrategySpecManager, load_specs
 from generators.param_sweeper import ParameterSweeper
+from generators.successive_halving import SuccessiveHalving
+from generators.bayes_optimizer import BayesianOptimizer
 from core.compiler import StrategyCompiler, save_compiled_strategy
 from core.runner import QCRunner, BacktestResult
 from core.parser import ResultsParser, ParsedMetrics
 from core.validator import StrategyValidator, ValidationResult
+from core.walk_forward import WalkForwardExecutor
 from core.ranker import StrategyRanker, RankedStrategy
+from core.local_engine import LocalEngine, load_ohlcv
+from core.result_cache import ResultCache, make_cache_key
+from core.journal import RunJournal
+from core.mock_qc_server import MockQCServer
+from core.registry import StrategyRegistry
+from core.tracing import tracer
 
 
 class Pipeline:
@@ -53,7 +67,21 @@ class Pipeline:
         skip_sweep: bool = False,
         dry_run: bool = False,
         specs_dir: str = None,
-        spec_ids: List[str] = None
+        spec_ids: List[str] = None,
+        local_data: str = None,
+        local_only: bool = False,
+        workers: int = 1,
+        use_async: bool = False,
+        use_cache: bool = True,
+        parameterized: bool = False,
+        sampling: str = None,
+        sweep_mode: str = "full",
+        mock_qc: bool = False,
+        cassette: str = None,
+        trace: str = None,
+        resume: bool = False,
+        walk_forward: bool = None,
+        walk_forward_folds: int = None
     ):
         """
         Initialize the pipeline.
@@ -64,78 +92,393 @@ class Pipeline:
             dry_run: Load specs but don't run backtests
             specs_dir: Custom directory to load specs from
             spec_ids: Specific spec IDs to backtest (None = all)
+            local_data: OHLCV data file for local screening (None = cloud only)
+            local_only: Use local results as final (no cloud backtests)
+            workers: Number of sandbox projects to backtest on concurrently
+            use_async: Use the asyncio API client (many backtests in flight)
+            use_cache: Reuse stored results for identical compiled code
+            parameterized: Compile each swept strategy once and pass variant
+                           values as backtest parameters
+            sampling: How sweeps larger than MAX_PARAMETER_COMBINATIONS are
+                      sampled (grid, random, lhs, sobol)
+            sweep_mode: "full" backtests every variant over the full range;
+                        "halving" prunes variants on shorter windows first;
+                        "bayes" backtests only surrogate-model proposals
+            mock_qc: Backtest against a local mock QC API server (no
+                     credentials or network; results are not cached)
+            cassette: Record/replay QC API responses ("record", "replay"
+                      or "auto"; default: config.QC_CASSETTE_MODE)
+            trace: Write spans, counters and histograms to this file
+                   (.jsonl: JSON lines, otherwise Chrome trace format)
+            resume: Continue the previous run from its journal: reuse its
+                    collected backtests and re-attach to ones still running
+            walk_forward: Backtest strategies that pass quick validation on
+                          the train/validate/test windows before validating
+                          (default: config.WALK_FORWARD_ENABLED)
+            walk_forward_folds: Anchored walk-forward folds to add to those
+                                windows (default: config.WALK_FORWARD_FOLDS)
         """
         self.date_range = date_range or config.ACTIVE_DATE_RANGE
         self.skip_sweep = skip_sweep
         self.dry_run = dry_run
         self.specs_dir = specs_dir or config.SPECS_DIR
         self.spec_ids = spec_ids
+        self.local_data = local_data
+        self.local_only = local_only
+        self.workers = max(1, workers)
+        self.use_async = use_async
+        self.use_cache = use_cache
+        self.parameterized = parameterized
+        self.sweep_mode = sweep_mode
+        self.mock_qc = mock_qc
+        self.trace = trace
+        self.resume = resume
+        self.walk_forward = config.WALK_FORWARD_ENABLED if walk_forward is None else walk_forward
+        self.walk_forward_folds = config.WALK_FORWARD_FOLDS if walk_forward_folds is None else walk_forward_folds
 
         # Update config
         config.ACTIVE_DATE_RANGE = self.date_range
+        if cassette:
+            config.QC_CASSETTE_MODE = cassette
 
         # Components
         self.spec_manager = StrategySpecManager(self.specs_dir)
-        self.sweeper = ParameterSweeper()
+        self.sweeper = ParameterSweeper(sampling=sampling)
         self.compiler = StrategyCompiler()
         self.parser = ResultsParser()
         self.validator = StrategyValidator(self.date_range)
         self.ranker = StrategyRanker()
         self.runner = None  # Initialized lazily
+        self.local_engine = None  # Initialized lazily
+        self.cache = ResultCache() if use_cache and not mock_qc else None
+        self.mock_server = self._start_mock_server() if mock_qc else None
+        self.journal = self._open_journal() if not (dry_run or local_only) else None
 
         # Results storage
         self.specs: List[StrategySpec] = []
         self.backtest_results: Dict[str, BacktestResult] = {}
         self.parsed_metrics: Dict[str, ParsedMetrics] = {}
+        self.local_metrics: Dict[str, ParsedMetrics] = {}
+        # Backtests run by the local engine and the (cloud or mock) API, by outcome
+        self.backtest_counts: Dict[str, int] = {"local": 0, "local_failed": 0, "cloud": 0, "cloud_failed": 0}
         self.validation_results: Dict[str, ValidationResult] = {}
         self.ranked_strategies: List[RankedStrategy] = []
+        self.phase_times: Dict[str, float] = {}  # phase method name -> wall seconds
 
         # Registry
-        self.registry = self._load_registry()
-
-    def _load_registry(self) -> Dict[str, Any]:
-        """Load the strategy registry"""
-        if os.path.exists(config.REGISTRY_PATH):
-            with open(config.REGISTRY_PATH, 'r') as f:
-                return json.load(f)
-        return {"strategies": [], "metadata": {}}
-
-    def _save_registry(self):
-        """Save the strategy registry"""
-        self.registry["updated_at"] = datetime.utcnow().isoformat()
-        os.makedirs(os.path.dirname(config.REGISTRY_PATH), exist_ok=True)
-        with open(config.REGISTRY_PATH, 'w') as f:
-            json.dump(self.registry, f, indent=2)
-
-    def _update_registry(self, spec: StrategySpec, status: str, metrics: ParsedMetrics = None):
-        """Update registry with strategy info"""
-        entry = {
-            "id": spec.id,
-            "name": spec.name,
-            "created_at": spec.created_at,
-            "status": status,
-            "parent_id": spec.parent_id,
-        }
-        if metrics:
-            entry["sharpe_ratio"] = metrics.sharpe_ratio
-            entry["cagr"] = metrics.cagr
-            entry["max_drawdown"] = metrics.max_drawdown
-
-        # Check if exists
-        existing = next((s for s in self.registry["strategies"] if s["id"] == spec.id), None)
-        if existing:
-            existing.update(entry)
+        self.registry = StrategyRegistry(import_from=config.REGISTRY_PATH)
+
+    def _start_mock_server(self) -> MockQCServer:
+        """Start the mock QC API and point the runner and async client at it"""
+        data = load_ohlcv(self.local_data) if self.local_data else None
+        server = MockQCServer(data=data)
+        config.QC_API_BASE = server.start()
+        os.environ.setdefault("QC_USER_ID", "0")
+        os.environ.setdefault("QC_API_TOKEN", "mock")
+        print(f"Mock QC API: {config.QC_API_BASE}")
+        return server
+
+    def _open_journal(self) -> RunJournal:
+        """Open the run journal; a new run (no --resume) starts it empty"""
+        path = config.RUN_JOURNAL_PATH
+        if self.mock_qc:
+            # Mock backtests must never be resumed into a real run
+            path = path.replace(".sqlite", "_mock.sqlite")
+        journal = RunJournal(path)
+        if self.resume:
+            stats = journal.stats()
+            print(f"Resuming: {stats['completed']} backtests collected, {stats['in_flight']} in flight")
         else:
-            self.registry["strategies"].append(entry)
+            journal.reset()
+        return journal
 
     def _get_runner(self) -> QCRunner:
         """Get or create QC runner with sandbox project"""
         if self.runner is None:
             self.runner = QCRunner()
             if not self.dry_run:
-                self.runner.get_or_create_sandbox_project()
+                if self.workers > 1:
+                    self.runner.get_or_create_project_pool(self.workers)
+                else:
+                    self.runner.get_or_create_sandbox_project()
         return self.runner
 
+    def _run_backtests(
+        self,
+        specs: List[StrategySpec],
+        dates: Tuple[str, str],
+        save_code: bool = False,
+        bases: Dict[str, StrategySpec] = None,
+        spec_dates: Dict[str, Tuple[str, str]] = None,
+        metrics: Dict[str, ParsedMetrics] = None
+    ) -> Dict[str, BacktestResult]:
+        """
+        Compile and cloud-backtest specs, concurrently across the project pool.
+
+        Specs whose compiled code was backtested before (or duplicates another
+        spec in this batch) reuse that result instead of a new backtest.
+        Every backtest is checkpointed in the run journal; on --resume,
+        journaled results are reused and backtests that were started but
+        not collected are re-attached rather than started again.
+
+        In parameterized mode, sweep variations whose parent is in `bases`
+        are run against one compile of the parent's parameterized code.
+
+        Args:
+            specs: Specs to backtest
+            dates: (start, end) date range
+            save_code: Also save compiled code to strategies/compiled/
+            bases: Parent specs of sweep variations, by ID
+            spec_dates: Per-spec (start, end) overriding `dates`, by ID
+            metrics: If given, filled with the ParsedMetrics of every
+                     successful result (each result is parsed once)
+
+        Returns:
+            Dict mapping spec ID to BacktestResult (specs that fail to
+            compile locally are omitted)
+        """
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        names = {spec.id: spec.name for spec in specs}
+        parsed = {} if metrics is None else metrics
+
+        def parse(result: BacktestResult) -> ParsedMetrics:
+            if result.strategy_id not in parsed:
+                parsed[result.strategy_id] = self.parser.parse(
+                    result.raw_response, result.strategy_id, result.backtest_id, names[result.strategy_id]
+                )
+            return parsed[result.strategy_id]
+
+        def finish() -> Dict[str, BacktestResult]:
+            # Resumed, cached and duplicate results bypass report()
+            for result in results.values():
+                if result.success:
+                    parse(result)
+            return results
+
+        if self.mock_server:
+            self.mock_server.register(list(specs) + list((bases or {}).values()))
+
+        results: Dict[str, BacktestResult] = {}
+        jobs = []
+        reattach = []  # (strategy_id, project_id, backtest_id, backtest_name) from the journal
+        codes: Dict[str, str] = {}  # spec_id -> code, for re-attached backtests that are gone
+        keys: Dict[str, str] = {}  # spec_id -> cache key
+        duplicates: Dict[str, List[str]] = {}  # cache key -> spec_ids sharing it
+        groups: Dict[str, List[Tuple[StrategySpec, str]]] = {}  # parent_id -> (variation, code)
+        for spec in specs:
+            start, end = (spec_dates or {}).get(spec.id, dates)
+            try:
+                code = self.compiler.compile(spec, start, end)
+            except Exception as e:
+                print(f"   ERROR compiling {spec.name[:50]}: {e}")
+                continue
+            if save_code:
+                save_compiled_strategy(spec, code)
+
+            if self.cache is not None or self.journal is not None:
+                keys[spec.id] = make_cache_key(code, start, end)
+
+            if self.journal is not None:
+                resumed = self.journal.completed(keys[spec.id], spec.id)
+                if resumed is not None:
+                    print(f"   RESUMED: {spec.name[:50]}")
+                    results[spec.id] = resumed
+                    continue
+                started = self.journal.started(keys[spec.id])
+                if started is not None:
+                    reattach.append((spec.id,) + tuple(started))
+                    codes[spec.id] = code
+                    continue
+
+            if self.cache is not None:
+                key = keys[spec.id]
+                cached = self.cache.get(key, spec.id)
+                if cached is not None:
+                    print(f"   CACHED: {spec.name[:50]}")
+                    results[spec.id] = cached
+                    continue
+                if key in duplicates:
+                    duplicates[key].append(spec.id)
+                    continue
+                duplicates[key] = [spec.id]
+
+            if self.parameterized and bases and spec.parent_id in bases:
+                groups.setdefault(spec.parent_id, []).append((spec, code))
+                continue
+
+            jobs.append((code, spec.id, f"{spec.id}_{timestamp}"))
+
+        # Parameterized groups that fail to compile run as ordinary jobs
+        param_runs = []
+        for parent_id, variants in groups.items():
+            base = bases[parent_id]
+            try:
+                code, param_names = self.compiler.compile_parameterized(base, dates[0], dates[1])
+            except ValueError as e:
+                print(f"   Cannot parameterize {base.name[:50]}: {e}")
+                jobs.extend((var_code, var.id, f"{var.id}_{timestamp}") for var, var_code in variants)
+                continue
+
+            param_runs.append((code, [
+                (var.id, f"{var.id}_{timestamp}", {
+                    name: self.sweeper.get_nested_value(var, path)
+                    for path, name in param_names.items()
+                })
+                for var, _ in variants
+            ]))
+
+        total = len(jobs) + len(reattach) + sum(len(variants) for _, variants in param_runs)
+        if not total:
+            return finish()
+
+        runner = self._get_runner()
+        done = [0]
+
+        def started(strategy_id: str, project_id: int, backtest_id: str, backtest_name: str):
+            if self.journal is not None:
+                self.journal.record_started(keys[strategy_id], strategy_id, project_id, backtest_id, backtest_name)
+
+        def report(result: BacktestResult):
+            if result.status == "not_found":
+                # Re-attached backtest is gone; start it again below
+                print(f"   RESTARTING: {names[result.strategy_id][:50]} ({result.error})")
+                jobs.append((codes[result.strategy_id], result.strategy_id, f"{result.strategy_id}_{timestamp}"))
+                return
+
+            done[0] += 1
+            self.backtest_counts["cloud" if result.success else "cloud_failed"] += 1
+            status = "done" if result.success else f"FAILED: {result.error}"
+            print(f"\n[{done[0]}/{total}] {names[result.strategy_id][:50]}: {status}")
+
+            if self.journal is not None:
+                journaled = parse(result).to_dict() if result.success else None
+                self.journal.record_completed(keys[result.strategy_id], result, journaled)
+
+            if self.cache is not None:
+                key = keys[result.strategy_id]
+                self.cache.put(key, result)
+                for spec_id in duplicates.get(key, [])[1:]:
+                    results[spec_id] = replace(result, strategy_id=spec_id)
+
+        if reattach:
+            print(f"\nRe-attaching to {len(reattach)} backtests from the interrupted run...")
+            results.update({
+                spec_id: result
+                for spec_id, result in runner.collect_backtests(reattach, on_complete=report).items()
+                if result.status != "not_found"
+            })
+
+        for code, variants in param_runs:
+            results.update(runner.run_parameterized_backtests(code, variants, on_complete=report, on_start=started))
+
+        if not jobs:
+            return finish()
+
+        if self.use_async:
+            client = runner.async_client()
+            try:
+                results.update(asyncio.run(
+                    client.run_many(jobs, runner.project_pool, on_complete=report, on_start=started)
+                ))
+            finally:
+                client.close()
+        else:
+            results.update(runner.run_full_backtests(jobs, on_complete=report, on_start=started))
+
+        return finish()
+
+    def _backtest_metrics(
+        self,
+        specs: List[StrategySpec],
+        dates: Tuple[str, str],
+        bases: Dict[str, StrategySpec] = None,
+        spec_dates: Dict[str, Tuple[str, str]] = None
+    ) -> Dict[str, ParsedMetrics]:
+        """
+        Cloud-backtest specs and parse the successful results.
+
+        Returns:
+            Dict mapping spec ID to ParsedMetrics
+        """
+        metrics: Dict[str, ParsedMetrics] = {}
+        self._run_backtests(specs, dates, bases=bases, spec_dates=spec_dates, metrics=metrics)
+        return {spec.id: metrics[spec.id] for spec in specs if spec.id in metrics}
+
+    def _get_local_engine(self) -> Optional[LocalEngine]:
+        """Get or create the local engine (None if no local data configured)"""
+        if self.local_engine is None and self.local_data:
+            print(f"Loading local data: {self.local_data}")
+            self.local_engine = LocalEngine(load_ohlcv(self.local_data))
+        return self.local_engine
+
+    def _local_metrics(self, specs: List[StrategySpec], dates: Tuple[str, str]) -> Dict[str, ParsedMetrics]:
+        """
+        Backtest specs with the local engine.
+
+        Returns:
+            Dict mapping spec ID to ParsedMetrics for successful runs
+        """
+        results = self._get_local_engine().run_many(specs, dates[0], dates[1])
+        metrics = {}
+        for spec in specs:
+            result = results[spec.id]
+            self.backtest_counts["local" if result.success else "local_failed"] += 1
+            if not result.success:
+                print(f"  FAILED: {spec.name[:50]} ({result.error})")
+                continue
+            metrics[spec.id] = self.parser.parse(result.raw_response, spec.id, result.backtest_id, spec.name)
+        return metrics
+
+    def _window_metrics(self, specs: List[StrategySpec], spec_dates: Dict[str, Tuple[str, str]]) -> Dict[str, ParsedMetrics]:
+        """
+        Backtest each spec on its own date window (walk-forward evaluate).
+
+        Cloud backtests for all windows go out as one batch; in local-only
+        mode the local engine runs each window in turn.
+
+        Returns:
+            Dict mapping spec ID to ParsedMetrics for successful runs
+        """
+        if not self.local_only:
+            return self._backtest_metrics(specs, config.DATE_RANGES[self.date_range]["full"], spec_dates=spec_dates)
+
+        metrics = {}
+        for window in sorted(set(spec_dates.values())):
+            metrics.update(self._local_metrics([spec for spec in specs if spec_dates[spec.id] == window], window))
+        return metrics
+
+    def _local_screen(self, specs: List[StrategySpec], dates: Tuple[str, str]) -> List[StrategySpec]:
+        """
+        Backtest specs with the local engine and keep those passing thresholds.
+
+        In local-only mode the local metrics become the pipeline's metrics.
+
+        Returns:
+            Specs that should go on to cloud backtesting
+        """
+        if self._get_local_engine() is None:
+            return specs
+
+        print(f"\nLocal screening {len(specs)} strategies...")
+        survivors = []
+        local = self._local_metrics(specs, dates)
+        for spec in specs:
+            metrics = local.get(spec.id)
+            if metrics is None:
+                continue
+
+            self.local_metrics[spec.id] = metrics
+            if self.local_only:
+                self.parsed_metrics[spec.id] = metrics
+
+            if metrics.passes_thresholds() and not metrics.is_disqualified():
+                survivors.append(spec)
+
+        print(f"  {len(survivors)}/{len(specs)} passed local screening")
+        cache = self.local_engine.indicator_cache.stats()
+        print(f"  Indicators: {cache['misses']} computed, {cache['hits']} reused")
+        return survivors
+
     def phase1_load_specs(self) -> List[StrategySpec]:
         """
         Phase 1: Load strategy specs from files.
@@ -168,11 +511,11 @@ class Pipeline:
             return []
 
         print(f"\nLoaded {len(self.specs)} strategies:")
-        for spec in self.specs:
-            print(f"  - {spec.name} ({spec.id[:8]})")
-            self._update_registry(spec, "loaded")
+        with self.registry.transaction():
+            for spec in self.specs:
+                print(f"  - {spec.name} ({spec.id[:8]})")
+                self.registry.update(spec, "loaded")
 
-        self._save_registry()
         return self.specs
 
     def phase2_initial_backtest(self) -> Dict[str, ParsedMetrics]:
@@ -197,47 +540,38 @@ class Pipeline:
             print("\n[DRY RUN] Skipping actual backtests")
             return {}
 
-        runner = self._get_runner()
-
-        for i, spec in enumerate(self.specs, 1):
-            print(f"\n[{i}/{len(self.specs)}] Backtesting: {spec.name}")
-
-            try:
-                # Compile
-                code = self.compiler.compile(spec, dates[0], dates[1])
-                save_compiled_strategy(spec, code)
-
-                # Run backtest
-                result = runner.run_full_backtest(
-                    code=code,
-                    strategy_id=spec.id,
-                    backtest_name=f"{spec.id}_{datetime.now().strftime('%Y%m%d_%H%M')}"
-                )
+        to_backtest = self._local_screen(self.specs, dates)
+        if self.local_only:
+            with self.registry.transaction():
+                for spec in self.specs:
+                    metrics = self.parsed_metrics.get(spec.id)
+                    self.registry.update(spec, "backtested" if metrics else "failed", metrics)
+            return self.parsed_metrics
+
+        print(f"\nBacktesting {len(to_backtest)} strategies ({self.workers} worker(s))...")
+        parsed: Dict[str, ParsedMetrics] = {}
+        results = self._run_backtests(to_backtest, dates, save_code=True, metrics=parsed)
+
+        with self.registry.transaction():
+            for spec in to_backtest:
+                result = results.get(spec.id)
+                if result is None:
+                    self.registry.update(spec, "error")
+                    continue
 
                 self.backtest_results[spec.id] = result
 
                 if result.success:
-                    # Parse metrics
-                    metrics = self.parser.parse(
-                        result.raw_response,
-                        spec.id,
-                        result.backtest_id,
-                        spec.name
-                    )
+                    metrics = parsed[spec.id]
                     self.parsed_metrics[spec.id] = metrics
                     self.parser.save_metrics(metrics, spec.id)
-                    self._update_registry(spec, "backtested", metrics)
+                    self.registry.update(spec, "backtested", metrics)
 
                     print(f"   {metrics.get_summary()}")
                 else:
-                    print(f"   FAILED: {result.error}")
-                    self._update_registry(spec, "failed")
+                    print(f"   FAILED: {spec.name}: {result.error}")
+                    self.registry.update(spec, "failed")
 
-            except Exception as e:
-                print(f"   ERROR: {e}")
-                self._update_registry(spec, "error")
-
-        self._save_registry()
         return self.parsed_metrics
 
     def phase3_filter(self) -> List[StrategySpec]:
@@ -284,6 +618,9 @@ class Pipeline:
         print("PHASE 4: PARAMETER SWEEP")
         print("="*60)
 
+        if self.sweep_mode == "bayes":
+            return self._bayes_sweep()
+
         all_variations = []
 
         for spec in self.specs:
@@ -300,42 +637,85 @@ class Pipeline:
 
         # Backtest variations
         if not self.dry_run and all_variations:
-            print("\nBacktesting variations...")
             dates = config.DATE_RANGES[self.date_range]["full"]
-            runner = self._get_runner()
-
-            for i, var in enumerate(all_variations, 1):
-                if var.id in self.parsed_metrics:
-                    continue  # Already tested
-
-                print(f"\n[{i}/{len(all_variations)}] {var.name[:50]}...")
-
-                try:
-                    code = self.compiler.compile(var, dates[0], dates[1])
-                    result = runner.run_full_backtest(
-                        code=code,
-                        strategy_id=var.id,
-                        backtest_name=f"{var.id}_{datetime.now().strftime('%H%M%S')}"
-                    )
-
-                    if result.success:
-                        metrics = self.parser.parse(
-                            result.raw_response,
-                            var.id,
-                            result.backtest_id,
-                            var.name
-                        )
-                        self.parsed_metrics[var.id] = metrics
-                        print(f"   Sharpe: {metrics.sharpe_ratio:.2f}, CAGR: {metrics.cagr*100:.1f}%")
-                    else:
-                        print(f"   FAILED")
-
-                except Exception as e:
-                    print(f"   ERROR: {e}")
+            to_backtest = self._local_screen(
+                [v for v in all_variations if v.id not in self.parsed_metrics], dates
+            )
+            if not self.local_only and to_backtest:
+                print(f"\nBacktesting {len(to_backtest)} variations ({self.workers} worker(s))...")
+                bases = {spec.id: spec for spec in self.specs if spec.parameters}
+
+                def evaluate(specs: List[StrategySpec], window: Tuple[str, str]) -> Dict[str, ParsedMetrics]:
+                    return self._backtest_metrics(specs, window, bases)
+
+                candidates = to_backtest
+                if self.sweep_mode == "halving":
+                    halving = SuccessiveHalving(evaluate, self.ranker)
+                    to_backtest, variant_metrics = halving.run(to_backtest, dates)
+                    print(f"\nSuccessive halving used {halving.backtest_years:.1f} backtest-years "
+                          f"(full sweep: {halving.full_sweep_years:.1f})")
+                else:
+                    variant_metrics = evaluate(to_backtest, dates)
+
+                for var in to_backtest:
+                    metrics = variant_metrics.get(var.id)
+                    if metrics is None:
+                        continue
+                    self.parsed_metrics[var.id] = metrics
+                    print(f"   {var.name[:50]}: Sharpe: {metrics.sharpe_ratio:.2f}, CAGR: {metrics.cagr*100:.1f}%")
+
+                survivors = {var.id for var in to_backtest}
+                with self.registry.transaction():
+                    for var in candidates:
+                        if var.id not in survivors:
+                            self.registry.update(var, "pruned")
+                        else:
+                            metrics = variant_metrics.get(var.id)
+                            self.registry.update(var, "backtested" if metrics else "failed", metrics)
 
         self.specs = all_variations
         return all_variations
 
+    def _bayes_sweep(self) -> List[StrategySpec]:
+        """
+        Phase 4 with the Bayesian optimizer: per strategy, backtest only
+        the parameter sets proposed by the surrogate model.
+
+        Returns:
+            Strategies without parameters plus all evaluated variations
+        """
+        all_variations = [spec for spec in self.specs if not spec.parameters]
+        searched = [spec for spec in self.specs if spec.parameters]
+
+        if self.dry_run:
+            print(f"\n[DRY RUN] Would optimize {len(searched)} strategies")
+            return self.specs
+
+        dates = config.DATE_RANGES[self.date_range]["full"]
+        bases = {spec.id: spec for spec in searched}
+
+        def evaluate(specs: List[StrategySpec], window: Tuple[str, str]) -> Dict[str, ParsedMetrics]:
+            if self.local_only:
+                return self._local_metrics(specs, window)
+            return self._backtest_metrics(specs, window, bases)
+
+        optimizer = BayesianOptimizer(evaluate, self.sweeper, self.ranker)
+        for spec in searched:
+            print(f"\nOptimizing: {spec.name} ({self.sweeper.count_combinations(spec)} combinations, "
+                  f"budget {optimizer.max_evaluations})")
+            variants, variant_metrics = optimizer.optimize(spec, dates)
+            all_variations.extend(variants)
+            self.parsed_metrics.update(variant_metrics)
+
+            with self.registry.transaction():
+                for var in variants:
+                    metrics = variant_metrics.get(var.id)
+                    self.registry.update(var, "backtested" if metrics else "failed", metrics)
+
+        print(f"\nTotal variations evaluated: {len(all_variations)}")
+        self.specs = all_variations
+        return all_variations
+
     def phase5_validate(self) -> Dict[str, ValidationResult]:
         """
         Phase 5: Validate strategies.
@@ -347,20 +727,41 @@ class Pipeline:
         print("PHASE 5: VALIDATION")
         print("="*60)
 
-        for spec in self.specs:
-            if spec.id not in self.parsed_metrics:
-                continue
-
+        candidates = [spec for spec in self.specs if spec.id in self.parsed_metrics]
+
+        # Walk-forward windows for strategies that pass quick validation,
+        # all backtested as one concurrent batch
+        walk_forward = {}
+        if self.walk_forward:
+            survivors = [spec for spec in candidates if self.validator.quick_validate(self.parsed_metrics[spec.id])[0]]
+            if survivors:
+                executor = WalkForwardExecutor(self._window_metrics, self.date_range, self.walk_forward_folds)
+                print(f"\nWalk-forward: {len(survivors)} strategies x {executor.backtests_per_strategy} windows")
+                for label, window in executor.windows.items():
+                    print(f"  {label}: {window[0]} to {window[1]}")
+                walk_forward = executor.run(survivors)
+                print()
+
+        for spec in candidates:
             metrics = self.parsed_metrics[spec.id]
-
-            # Quick validation (full walk-forward would require additional backtests)
-            is_valid, notes = self.validator.quick_validate(metrics)
-
-            result = self.validator.validate(
-                spec.id,
-                spec.name,
-                metrics
-            )
+            windows = walk_forward.get(spec.id)
+
+            if windows is not None:
+                result = self.validator.validate(
+                    spec.id,
+                    spec.name,
+                    metrics,
+                    windows.train,
+                    windows.validate,
+                    windows.test,
+                    windows.folds
+                )
+            else:
+                result = self.validator.validate(
+                    spec.id,
+                    spec.name,
+                    metrics
+                )
 
             self.validation_results[spec.id] = result
 
@@ -478,6 +879,15 @@ class Pipeline:
 
         return report
 
+    def _run_phase(self, phase):
+        """Run one phase method, recording its wall time in self.phase_times"""
+        start = time.perf_counter()
+        try:
+            with tracer.span(f"pipeline.{phase.__name__}"):
+                return phase()
+        finally:
+            self.phase_times[phase.__name__] = time.perf_counter() - start
+
     def run(self) -> List[RankedStrategy]:
         """
         Run the complete pipeline.
@@ -486,6 +896,8 @@ class Pipeline:
             List of top ranked strategies
         """
         start_time = datetime.now()
+        if self.trace:
+            tracer.enable()
 
         print("\n" + "="*70)
         print("STRATEGY FACTORY PIPELINE")
@@ -495,10 +907,22 @@ class Pipeline:
         print(f"Spec IDs: {self.spec_ids or 'all'}")
         print(f"Skip Sweep: {self.skip_sweep}")
         print(f"Dry Run: {self.dry_run}")
+        print(f"Workers: {self.workers}{' (async client)' if self.use_async else ''}")
+        print(f"Result Cache: {'on' if self.cache is not None else 'off'}")
+        print(f"QC API: {'mock (' + config.QC_API_BASE + ')' if self.mock_qc else config.QC_API_BASE}")
+        print(f"Cassette: {config.QC_CASSETTE_MODE or 'off'}")
+        print(f"Parameterized Sweep: {self.parameterized}")
+        print(f"Sweep Sampling: {self.sweeper.sampling} (max {self.sweeper.max_combinations} per strategy)")
+        print(f"Sweep Mode: {self.sweep_mode}")
+        print(f"Local Data: {self.local_data or 'none'}{' (local only)' if self.local_only else ''}")
+        print(f"Trace: {self.trace or 'off'}")
+        print(f"Resume: {self.resume}")
+        print(f"Walk-Forward: {self.walk_forward}"
+              f"{f' (+{self.walk_forward_folds} anchored folds)' if self.walk_forward and self.walk_forward_folds else ''}")
         print("="*70)
 
         # Run phases
-        self.phase1_load_specs()
+        self._run_phase(self.phase1_load_specs)
 
         if not self.specs:
             print("\n" + "="*70)
@@ -506,22 +930,49 @@ class Pipeline:
             print("="*70)
             return []
 
-        self.phase2_initial_backtest()
-        self.phase3_filter()
-        self.phase4_parameter_sweep()
-        self.phase5_validate()
-        self.phase6_rank()
-        self.phase7_report()
+        for phase in (self.phase2_initial_backtest, self.phase3_filter, self.phase4_parameter_sweep,
+                      self.phase5_validate, self.phase6_rank, self.phase7_report):
+            self._run_phase(phase)
+
+        print("\nPhase times: " + ", ".join(
+            f"{name.split('_')[0]} {seconds:.1f}s" for name, seconds in self.phase_times.items()
+        ))
+
+        if self.cache is not None:
+            stats = self.cache.stats()
+            print(f"\nResult cache: {stats['hits']} hits, {stats['misses']} misses, "
+                  f"{stats['entries']} entries stored")
+
+        if self.mock_server:
+            stats = self.mock_server.stats()
+            print(f"\nMock QC API: {stats['requests']} requests, {stats['rate_limited']} rate-limited, "
+                  f"{stats['backtests']} backtests (max {stats['max_running']} running)")
+
+        if self.journal is not None and self.resume:
+            stats = self.journal.stats()
+            print(f"\nRun journal: {stats['resumed']} backtests reused, {stats['reattached']} re-attached")
+
+        if self.runner is not None and self.runner.transport.cassette is not None:
+            stats = self.runner.transport.cassette.stats()
+            print(f"\nCassette ({stats['mode']}): {stats['hits']} replayed, {stats['misses']} missed, "
+                  f"{stats['recorded']} recorded")
 
         # Save final metrics summary
         if self.parsed_metrics:
             self.parser.save_summary_csv(list(self.parsed_metrics.values()))
 
-        # Update registry metadata
-        self.registry["metadata"]["last_pipeline_run"] = datetime.utcnow().isoformat()
-        self.registry["metadata"]["total_loaded"] = len(self.specs) if self.specs else 0
-        self.registry["metadata"]["total_backtested"] = len(self.parsed_metrics)
-        self._save_registry()
+        # Update registry metadata and the human-readable snapshot
+        self.registry.set_metadata(
+            last_pipeline_run=datetime.utcnow().isoformat(),
+            total_loaded=len(self.specs) if self.specs else 0,
+            total_backtested=len(self.parsed_metrics),
+        )
+        self.registry.export_json()
+
+        if self.trace:
+            tracer.disable()
+            print(f"\n{tracer.format_summary()}")
+            print(f"\nTrace saved to: {tracer.export(self.trace)}")
 
         end_time = datetime.now()
         duration = end_time - start_time
@@ -562,6 +1013,53 @@ Examples:
     # Dry run (load specs but don't run backtests)
     python run_pipeline.py --dry-run
 
+    # Screen with the local engine; only survivors are cloud-backtested
+    python run_pipeline.py --local-data data/ohlcv.npz
+
+    # Local engine only (no QC credentials needed)
+    python run_pipeline.py --local-data data/ohlcv.npz --local-only
+
+    # Use the local columnar data store (import LEAN data first)
+    python core/data_store.py ~/lean/Data SPY QQQ AAPL
+    python run_pipeline.py --local-data data/ohlcv --local-only
+
+    # Backtest on 4 sandbox projects concurrently
+    python run_pipeline.py --workers 4
+
+    # Keep many backtests in flight with the asyncio client
+    python run_pipeline.py --workers 2 --async-client
+
+    # Force fresh backtests even if identical code was run before
+    python run_pipeline.py --no-cache
+
+    # Compile each swept strategy once; variants differ only by parameters
+    python run_pipeline.py --parameterized
+
+    # Sample large sweep grids with a Sobol sequence
+    python run_pipeline.py --sampling sobol
+
+    # Prune sweep variants on short windows before full-range backtests
+    python run_pipeline.py --sweep-mode halving
+
+    # Search parameters with a Gaussian-process surrogate (tens of backtests)
+    python run_pipeline.py --sweep-mode bayes
+
+    # End to end against a local mock QC API (no credentials or network)
+    python run_pipeline.py --mock-qc --skip-sweep
+
+    # Add 4 anchored out-of-sample folds to walk-forward validation
+    python run_pipeline.py --walk-forward-folds 4
+
+    # Continue an interrupted run without re-running finished backtests
+    python run_pipeline.py --resume
+
+    # Trace where time and rate-limit budget go (open in chrome://tracing)
+    python run_pipeline.py --mock-qc --skip-sweep --trace trace.json
+
+    # Record API responses once, then replay the run offline
+    python run_pipeline.py --spec-ids abc12345 --cassette record
+    python run_pipeline.py --spec-ids abc12345 --cassette replay
+
 Workflow:
     1. Ask Claude Code to generate strategies (see GENERATE.md)
     2. Claude Code writes specs to strategy-factory/strategies/specs/
@@ -604,8 +1102,106 @@ Workflow:
         help="Load specs but don't run backtests"
     )
 
+    parser.add_argument(
+        "--local-data",
+        type=str,
+        default=None,
+        help="OHLCV .npz file or data store directory (core/data_store.py) for local screening"
+    )
+
+    parser.add_argument(
+        "--local-only",
+        action="store_true",
+        help="Use local engine results only (requires --local-data)"
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of sandbox projects to backtest on concurrently (default: 1)"
+    )
+
+    parser.add_argument(
+        "--async-client",
+        action="store_true",
+        help="Use the asyncio API client to keep many backtests in flight"
+    )
+
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore cached results and always run fresh backtests"
+    )
+
+    parser.add_argument(
+        "--parameterized",
+        action="store_true",
+        help="Compile each swept strategy once and run variants via backtest parameters"
+    )
+
+    parser.add_argument(
+        "--sampling",
+        choices=["grid", "random", "lhs", "sobol"],
+        default=None,
+        help=f"How sweep grids larger than the max combinations are sampled (default: {config.SWEEP_SAMPLING})"
+    )
+
+    parser.add_argument(
+        "--sweep-mode",
+        choices=["full", "halving", "bayes"],
+        default="full",
+        help="full: every variant on the full range; halving: successive halving over "
+             "growing windows; bayes: Bayesian optimization"
+    )
+
+    parser.add_argument(
+        "--mock-qc",
+        action="store_true",
+        help="Backtest against a local mock QC API server (core/mock_qc_server.py)"
+    )
+
+    parser.add_argument(
+        "--cassette",
+        choices=["record", "replay", "auto"],
+        default=None,
+        help="Record QC API responses to strategy-factory/cassettes/, replay them offline, "
+             "or replay when recorded and record otherwise (core/transport.py)"
+    )
+
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Resume the previous run from its journal (core/journal.py): reuse collected "
+             "backtests and re-attach to ones still running"
+    )
+
+    parser.add_argument(
+        "--no-walk-forward",
+        action="store_true",
+        help="Validate on full-range metrics only (no train/validate/test backtests)"
+    )
+
+    parser.add_argument(
+        "--walk-forward-folds",
+        type=int,
+        default=None,
+        help=f"Anchored walk-forward folds added to the train/validate/test windows "
+             f"(default: {config.WALK_FORWARD_FOLDS})"
+    )
+
+    parser.add_argument(
+        "--trace",
+        metavar="PATH",
+        help="Record spans and metrics (core/tracing.py) to PATH: .jsonl for JSON lines, "
+             "otherwise Chrome trace format"
+    )
+
     args = parser.parse_args()
 
+    if args.local_only and not args.local_data:
+        parser.error("--local-only requires --local-data")
+
     # Parse spec IDs
     spec_ids = None
     if args.spec_ids:
@@ -617,7 +1213,21 @@ Workflow:
         skip_sweep=args.skip_sweep,
         dry_run=args.dry_run,
         specs_dir=args.specs_dir,
-        spec_ids=spec_ids
+        spec_ids=spec_ids,
+        local_data=args.local_data,
+        local_only=args.local_only,
+        workers=args.workers,
+        use_async=args.async_client,
+        use_cache=not args.no_cache,
+        parameterized=args.parameterized,
+        sampling=args.sampling,
+        sweep_mode=args.sweep_mode,
+        mock_qc=args.mock_qc,
+        cassette=args.cassette,
+        trace=args.trace,
+        resume=args.resume,
+        walk_forward=False if args.no_walk_forward else None,
+        walk_forward_folds=args.walk_forward_folds
     )
 
     pipeline.run()
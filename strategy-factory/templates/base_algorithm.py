@@ -8,7 +8,7 @@ SAFETY GUARDS IMPLEMENTED:
 1. Trade on next-day open (no look-ahead bias)
 2. Slippage model (0.1%)
 3. Commission model (IBKR: $0.005/share, $1 min)
-4. Liquidity filter (min dollar volume)
+4. Liquidity filter (min 5-day average dollar volume, from rolling windows)
 5. Price filter (min $5)
 6. Indicator warmup period
 7. Data existence checks
@@ -19,6 +19,8 @@ SAFETY GUARDS IMPLEMENTED:
 ALGORITHM_TEMPLATE = '''
 from AlgorithmImports import *
 from datetime import timedelta
+from collections import deque
+import numpy as np
 
 
 class {class_name}(QCAlgorithm):
@@ -68,7 +70,8 @@ class {class_name}(QCAlgorithm):
         # =================================================================
         self.indicators = {{}}
         self.prev_indicator_values = {{}}  # For crossover detection
-        {indicator_code}
+        for symbol in self.symbols:
+            self._add_indicators(symbol)
 
         # =================================================================
         # POSITION TRACKING
@@ -79,6 +82,12 @@ class {class_name}(QCAlgorithm):
         self.pending_entries = set()  # Signals generated, waiting for next open
         self.pending_exits = set()    # Exit signals, waiting for next open
 
+        # Last 5 daily (close, volume) per symbol for the liquidity filter,
+        # with running sums, fed from the daily bars in on_data
+        self.liquidity_window = 5
+        self.liquidity_bars = {{}}
+        self.liquidity_sums = {{}}
+
         # =================================================================
         # RISK MANAGEMENT
         # =================================================================
@@ -208,14 +217,13 @@ class {class_name}(QCAlgorithm):
             return False
 
         # Volume filter: check if we have volume data
-        history = self.history(symbol, 5, Resolution.DAILY)
-        if history.empty:
+        bars = self.liquidity_bars.get(symbol)
+        if not bars:
             return False
 
-        # Calculate average dollar volume
-        avg_volume = history['volume'].mean()
-        avg_price = history['close'].mean()
-        avg_dollar_volume = avg_volume * avg_price
+        # Calculate average dollar volume over the rolling window
+        close_sum, volume_sum = self.liquidity_sums[symbol]
+        avg_dollar_volume = (volume_sum / len(bars)) * (close_sum / len(bars))
 
         if avg_dollar_volume < {min_dollar_volume}:
             return False
@@ -280,6 +288,14 @@ class {class_name}(QCAlgorithm):
         """
         {exit_conditions_code}
 
+    def _add_indicators(self, symbol):
+        """
+        Create the strategy's indicators for a symbol.
+        GENERATED CODE - DO NOT EDIT
+        """
+        self.indicators[symbol] = {{}}
+        {indicator_code}
+
     def _update_prev_values(self):
         """Store previous indicator values for crossover detection"""
         for symbol in self.symbols:
@@ -354,16 +370,150 @@ class {class_name}(QCAlgorithm):
                 return False
 
         return left_prev >= right_prev and left_curr < right_curr
+{universe_methods}
+    def _update_liquidity(self, symbol, bar):
+        """Add a daily bar to the symbol's rolling (close, volume) window"""
+        bars = self.liquidity_bars.get(symbol)
+        if bars is None:
+            bars = self.liquidity_bars[symbol] = deque()
+            self.liquidity_sums[symbol] = (0.0, 0.0)
+        close_sum, volume_sum = self.liquidity_sums[symbol]
+        close, volume = float(bar.close), float(bar.volume)
+        bars.append((close, volume))
+        close_sum += close
+        volume_sum += volume
+        if len(bars) > self.liquidity_window:
+            old_close, old_volume = bars.popleft()
+            close_sum -= old_close
+            volume_sum -= old_volume
+        self.liquidity_sums[symbol] = (close_sum, volume_sum)
 
     def on_data(self, data):
         """
-        Required method - but we use scheduled events for trading.
-        This ensures consistent timing regardless of data arrival.
+        Trading runs on scheduled events, for consistent timing regardless
+        of data arrival. Daily bars (also during warm-up) only feed the
+        liquidity filter's rolling windows.
+        """
+        for symbol, bar in data.bars.items():
+            self._update_liquidity(symbol, bar)
+'''
+
+
+# Methods added to the algorithm for UniverseType.DYNAMIC. The compiler sets
+# the universe_* attributes in initialize() and registers the selections.
+DYNAMIC_UNIVERSE_METHODS = '''
+    def _universe_period(self):
+        """Current refresh period; the selection runs once per period"""
+        if self.universe_refresh == "daily":
+            return self.time.date()
+        if self.universe_refresh == "weekly":
+            return tuple(self.time.isocalendar()[:2])
+        return (self.time.year, self.time.month)
+
+    def select_index_members(self, constituents):
+        """Record the index ETF's constituents (adds no securities itself)"""
+        self.index_members = {c.symbol for c in constituents}
+        return []
+
+    def select_coarse(self, coarse):
+        """
+        Coarse selection on refresh days only; the previous selection is
+        kept (Universe.UNCHANGED) the rest of the period.
+
+        Price, dollar volume and index membership are filtered over the
+        whole coarse collection as arrays, and the most liquid candidates
+        are taken with a partial sort.
         """
-        pass
+        period = self._universe_period()
+        if period == self.universe_refresh_key:
+            return Universe.UNCHANGED
+        if self.universe_index and self.index_members is None:
+            return Universe.UNCHANGED  # Constituents not loaded yet
+
+        coarse = list(coarse)
+        if not coarse:
+            return Universe.UNCHANGED
+
+        price = np.array([c.price for c in coarse], dtype=float)
+        dollar_volume = np.array([c.dollar_volume for c in coarse], dtype=float)
+        eligible = np.array([c.has_fundamental_data for c in coarse], dtype=bool)
+        eligible &= (price >= self.universe_min_price) & (dollar_volume >= self.universe_min_dollar_volume)
+        if self.universe_index:
+            members = self.index_members
+            eligible &= np.array([c.symbol in members for c in coarse], dtype=bool)
+
+        candidates = np.flatnonzero(eligible)
+        limit = self.universe_coarse_limit
+        if len(candidates) > limit:
+            candidates = candidates[np.argpartition(-dollar_volume[candidates], limit - 1)[:limit]]
+        candidates = candidates[np.argsort(-dollar_volume[candidates], kind="stable")]
+
+        self.universe_refresh_key = period
+        selected = [coarse[i].symbol for i in candidates]
+        self.coarse_rank = {symbol: rank for rank, symbol in enumerate(selected)}
+        return selected
+
+    def select_fine(self, fine):
+        """Fine selection: sector filter, most liquid (coarse order) first"""
+        selected = [
+            f.symbol for f in fine
+            if f.asset_classification.morningstar_sector_code == self.universe_sector_code
+        ]
+        selected.sort(key=lambda symbol: self.coarse_rank.get(symbol, len(self.coarse_rank)))
+        return selected[:self.universe_max_symbols]
+
+    def on_securities_changed(self, changes):
+        """Track the dynamic universe: indicators for added symbols, cleanup of removed ones"""
+        for security in changes.added_securities:
+            symbol = security.symbol
+            # Selected again before a deferred removal happened
+            self.universe_deferred_removals.discard(symbol)
+            if symbol == self.universe_anchor or symbol in self.indicators:
+                continue
+            self.symbols.append(symbol)
+            self._add_indicators(symbol)
+            # Symbols added after warm-up start from history, not from scratch
+            if not self.is_warming_up:
+                for ind in self.indicators[symbol].values():
+                    self.warm_up_indicator(symbol, ind, Resolution.DAILY)
+
+        for security in changes.removed_securities:
+            symbol = security.symbol
+            if symbol not in self.indicators:
+                continue
+            if self.portfolio[symbol].invested:
+                # Keep generating exit signals; removed once the position closes
+                self.universe_deferred_removals.add(symbol)
+                continue
+            self._remove_universe_symbol(symbol)
+
+    def on_order_event(self, order_event):
+        """Complete deferred universe removals once their position is closed"""
+        symbol = order_event.symbol
+        if (order_event.status == OrderStatus.FILLED
+                and symbol in self.universe_deferred_removals
+                and not self.portfolio[symbol].invested):
+            self.universe_deferred_removals.discard(symbol)
+            self._remove_universe_symbol(symbol)
+
+    def _remove_universe_symbol(self, symbol):
+        """Stop tracking a symbol that left the universe"""
+        self.symbols.remove(symbol)
+        for ind in self.indicators.pop(symbol).values():
+            self.deregister_indicator(ind)
+        self.prev_indicator_values.pop(symbol, None)
+        self.liquidity_bars.pop(symbol, None)
+        self.liquidity_sums.pop(symbol, None)
+        self.pending_entries.discard(symbol)
+        self.pending_exits.discard(symbol)
 '''
 
 
 def get_template() -> str:
     """Return the algorithm template string"""
     return ALGORITHM_TEMPLATE
+
+
+def get_dynamic_universe_methods() -> str:
+    """Return the dynamic-universe methods inserted into the template"""
+    return DYNAMIC_UNIVERSE_METHODS